@@ -0,0 +1,217 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from typing import Iterable
+
+from flight_constants import ADD_PLANE, REMOVE_PLANE, REMOVE_ROUTE, \
+    RESET, RESET_PLANES, RouteChange, RouteDict
+from flight_functions import RoutesVersion, get_routes_version, \
+    mark_routes_changed, track_routes
+from flight_shared_aircraft import add_plane_to_route, \
+    remove_plane_from_route
+
+import flight_example_data
+
+
+class AircraftIndex:
+    """An inverted index from each airplane to the routes that use it, kept
+    in sync with a RouteDict so that an airplane can be decommissioned by
+    visiting only the routes that use it.
+
+    Routes must be added and removed through the index for it to stay in
+    sync.  If routes is changed by another function that calls
+    flight_functions.mark_routes_changed, such as decomission_plane, the
+    index is rebuilt the next time it is used.
+
+    Instance Attributes:
+        - routes: the routes that are indexed
+    """
+    routes: RouteDict
+    _routes_by_plane: dict[str, set[tuple[str, str]]]
+    _tracked: RoutesVersion
+    _version: int
+
+    def __init__(self, routes: RouteDict) -> None:
+        """Initialize a new index of the airplanes used in routes.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.get_routes_using('DH4')
+        [('TRO', 'SYD')]
+        """
+        self.routes = routes
+        self._tracked = track_routes(routes)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Index every route in routes from scratch."""
+        self._routes_by_plane = {}
+        for source, destinations in self.routes.items():
+            for destination, airplanes in destinations.items():
+                for plane in airplanes:
+                    self._index_route(plane, source, destination)
+        self._version = get_routes_version(self.routes)
+
+    def _index_route(self, plane: str, source: str, destination: str) -> None:
+        """Record that the route from source to destination uses plane."""
+        if plane not in self._routes_by_plane:
+            self._routes_by_plane[plane] = set()
+        self._routes_by_plane[plane].add((source, destination))
+
+    def _check_version(self) -> None:
+        """Rebuild the index if routes was changed outside of it."""
+        if get_routes_version(self.routes) != self._version:
+            self._rebuild()
+
+    def _mark_changed(self, planes_only: bool) -> None:
+        """Record that this index has changed routes, and whether it only
+        changed the airplanes of existing routes.
+        """
+        mark_routes_changed(self.routes, planes_only)
+        self._version = get_routes_version(self.routes)
+
+    def get_routes_using(self, plane: str) -> list[tuple[str, str]]:
+        """Return the sorted list of (source, destination) routes that use
+        plane.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.get_routes_using('SF3')[:2]
+        [('GFN', 'TRO'), ('JCK', 'RCM')]
+        >>> index.get_routes_using('747')
+        []
+        """
+        self._check_version()
+        return sorted(self._routes_by_plane.get(plane, ()))
+
+    def add_plane(self, source: str, destination: str, plane: str) -> None:
+        """Add plane to the route from source to destination, creating the
+        route if it does not exist.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.add_plane('SYD', 'TRO', 'DH4')
+        >>> index.routes['SYD']
+        {'TRO': ['DH4']}
+        >>> index.get_routes_using('DH4')
+        [('SYD', 'TRO'), ('TRO', 'SYD')]
+        """
+        self._check_version()
+        planes_only = destination in self.routes.get(source, {})
+        if source not in self.routes:
+            self.routes[source] = {}
+        if destination not in self.routes[source]:
+            self.routes[source][destination] = []
+        add_plane_to_route(self.routes[source], destination, plane)
+        self._index_route(plane, source, destination)
+        self._mark_changed(planes_only)
+
+    def remove_route(self, source: str, destination: str) -> None:
+        """Remove the route from source to destination, if there is one.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.remove_route('TRO', 'SYD')
+        >>> 'SYD' in index.routes['TRO']
+        False
+        >>> index.get_routes_using('DH4')
+        []
+        """
+        self._check_version()
+        if destination not in self.routes.get(source, {}):
+            return
+        for plane in self.routes[source].pop(destination):
+            routes_using = self._routes_by_plane.get(plane, set())
+            routes_using.discard((source, destination))
+            if not routes_using:
+                self._routes_by_plane.pop(plane, None)
+        self._mark_changed(False)
+
+    def decommission(self, plane: str) -> list[tuple[str, str]]:
+        """Remove plane from every route that uses it and return the sorted
+        list of routes left with no planes, exactly like
+        flight_functions.decomission_plane, but only visiting the routes that
+        use plane.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.decommission('SF3')
+        [('GFN', 'TRO'), ('JCK', 'RCM'), ('RCM', 'JCK'), ('TRO', 'GFN')]
+        >>> index.routes['TRO']['SYD']
+        ['DH4']
+        >>> index.get_routes_using('SF3')
+        []
+        """
+        self._check_version()
+        routes_with_no_planes = []
+        routes_using = self._routes_by_plane.pop(plane, set())
+        for source, destination in routes_using:
+            airplanes = remove_plane_from_route(self.routes[source],
+                                                destination, plane)
+
+            # decomission_plane removes one copy of plane from each route, so
+            # a route that listed it twice still uses it
+            if plane in airplanes:
+                self._index_route(plane, source, destination)
+            elif not airplanes:
+                routes_with_no_planes.append((source, destination))
+
+        if routes_using:
+            self._mark_changed(True)
+        routes_with_no_planes.sort()
+        return routes_with_no_planes
+
+    def apply_changes(self, changes: Iterable[RouteChange]) -> None:
+        """Update this index for changes, which were made to routes in
+        order, and are every change made to routes since this index was last
+        in sync with it.
+
+        >>> routes = flight_example_data.create_example_routes()
+        >>> index = AircraftIndex(routes)
+        >>> routes['SYD'] = {'TRO': ['DH4']}
+        >>> index.apply_changes([RouteChange(1, 'add_plane', 'SYD', 'TRO',
+        ...                                  ('DH4',))])
+        >>> index.get_routes_using('DH4')
+        [('SYD', 'TRO'), ('TRO', 'SYD')]
+        """
+        for change in changes:
+            if change.kind in (RESET, RESET_PLANES):
+                self._rebuild()
+                return
+            route = (change.source, change.destination)
+            if change.kind == ADD_PLANE:
+                for plane in change.planes:
+                    self._index_route(plane, *route)
+            elif change.kind in (REMOVE_PLANE, REMOVE_ROUTE):
+                airplanes = self.routes.get(change.source, {}).get(
+                    change.destination, ())
+                for plane in change.planes:
+                    # A route that listed a plane twice still uses it
+                    if plane in airplanes:
+                        continue
+                    routes_using = self._routes_by_plane.get(plane, set())
+                    routes_using.discard(route)
+                    if not routes_using:
+                        self._routes_by_plane.pop(plane, None)
+        self._version = get_routes_version(self.routes)
+
+    def decommission_all(self, planes: Iterable[str]) -> \
+            list[list[tuple[str, str]]]:
+        """Decommission each plane in planes in turn and return the list of
+        results of decommission, in the same order as planes.
+
+        >>> index = AircraftIndex(flight_example_data.create_example_routes())
+        >>> index.decommission_all(['DH4', 'SF3'])[1][-1]
+        ('TRO', 'SYD')
+        """
+        return [self.decommission(plane) for plane in planes]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
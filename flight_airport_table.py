@@ -0,0 +1,176 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from array import array
+from collections import Counter
+
+from flight_constants import AirportDict, OPENFLIGHTS_NULL_VALUE
+
+import flight_example_data
+
+
+################################################################################
+# Constants: the text columns of an AirportTable
+################################################################################
+CATEGORICAL_COLUMNS = ('Name', 'City', 'Country', 'Tz')
+
+
+################################################################################
+# An AirportTable stores an AirportDict column by column.  Each text column is
+# dictionary-encoded: its distinct values are stored once, in order of first
+# appearance, and each row stores the position of its value as an integer.
+# Grouping rows by a column then only needs to count small integers.
+################################################################################
+
+class CategoricalColumn:
+    """A dictionary-encoded column of strings.
+
+    Instance Attributes:
+        - categories: the distinct values in the column, in order of first
+          appearance
+        - codes: the position in categories of the value in each row
+        - null_code: the position in categories of OPENFLIGHTS_NULL_VALUE, or
+          -1 if no row has that value
+    """
+    categories: list[str]
+    codes: array
+    null_code: int
+
+    def __init__(self, values: list[str]) -> None:
+        """Initialize a new column containing values.
+
+        >>> column = CategoricalColumn(['a', 'b', 'a', '\\\\N'])
+        >>> column.categories, list(column.codes), column.null_code
+        (['a', 'b', '\\\\N'], [0, 1, 0, 2], 2)
+        """
+        positions = {}
+        self.codes = array('I')
+        for value in values:
+            if value not in positions:
+                positions[value] = len(positions)
+            self.codes.append(positions[value])
+        self.categories = list(positions)
+        self.null_code = positions.get(OPENFLIGHTS_NULL_VALUE, -1)
+
+    def __len__(self) -> int:
+        """Return the number of rows in this column."""
+        return len(self.codes)
+
+
+class AirportTable:
+    """The airports of an AirportDict, stored as columns.
+
+    Instance Attributes:
+        - codes: the IATA airport code of each row
+        - columns: the dictionary-encoded column for each of
+          CATEGORICAL_COLUMNS
+        - latitudes: the latitude of each row
+        - longitudes: the longitude of each row
+    """
+    codes: list[str]
+    columns: dict[str, CategoricalColumn]
+    latitudes: array
+    longitudes: array
+
+    def __init__(self, airports: AirportDict) -> None:
+        """Initialize a new table with the airports in airports.  A text
+        column missing from an airport is stored as OPENFLIGHTS_NULL_VALUE.
+
+        >>> table = AirportTable(flight_example_data.create_example_airports())
+        >>> table.codes
+        ['RCM', 'JCK', 'TRO', 'SYD', 'GFN']
+        >>> table.columns['Country'].categories
+        ['Australia']
+        """
+        self.codes = list(airports)
+        details = list(airports.values())
+        self.columns = {}
+        for name in CATEGORICAL_COLUMNS:
+            self.columns[name] = CategoricalColumn(
+                [info.get(name, OPENFLIGHTS_NULL_VALUE) for info in details])
+        self.latitudes = array('d', [float(info['Latitude'])
+                                     for info in details])
+        self.longitudes = array('d', [float(info['Longitude'])
+                                      for info in details])
+
+    def __len__(self) -> int:
+        """Return the number of airports in this table."""
+        return len(self.codes)
+
+    def group_count(self, keys: str | tuple[str, ...],
+                    skip_null: bool = True) -> dict:
+        """Return a dictionary that maps each value of the column named keys
+        to the number of airports with that value.  If keys is a tuple of
+        column names, the dictionary maps each tuple of values that appears
+        together to the number of airports with those values.
+
+        If skip_null is True, airports with OPENFLIGHTS_NULL_VALUE in any of
+        the key columns are not counted.  The values appear in the order they
+        first appear in the table.
+
+        Preconditions:
+            - keys is in CATEGORICAL_COLUMNS, or is a non-empty tuple of
+              names in CATEGORICAL_COLUMNS
+
+        >>> table = AirportTable(flight_example_data.create_example_airports())
+        >>> table.group_count('Tz')
+        {'Australia/Brisbane': 1, 'Australia/Sydney': 3}
+        >>> table.group_count(('Country', 'Tz'), skip_null=False)[
+        ...     ('Australia', '\\\\N')]
+        1
+        """
+        if isinstance(keys, str):
+            column = self.columns[keys]
+            counts = Counter(column.codes)
+            return {column.categories[code]: count
+                    for code, count in counts.items()
+                    if not (skip_null and code == column.null_code)}
+
+        # Combine the codes of every key column into one integer per row, as
+        # the digits of a number whose base changes from column to column
+        key_columns = [self.columns[name] for name in keys]
+        combined = list(key_columns[0].codes)
+        for column in key_columns[1:]:
+            base = len(column.categories)
+            combined = [key * base + code
+                        for key, code in zip(combined, column.codes)]
+
+        groups = {}
+        for key, count in Counter(combined).items():
+            values = []
+            is_null = False
+            for column in reversed(key_columns):
+                key, code = divmod(key, len(column.categories))
+                values.append(column.categories[code])
+                is_null = is_null or code == column.null_code
+            if not (skip_null and is_null):
+                values.reverse()
+                groups[tuple(values)] = count
+        return groups
+
+
+def summarize_by(airports: AirportDict, keys: str | tuple[str, ...]) -> \
+        dict:
+    """Return AirportTable(airports).group_count(keys), skipping airports
+    with a null value in a key column.  summarize_by(airports, 'Tz') has the
+    same items as flight_functions.summarize_by_timezone(airports).
+
+    >>> summarize_by(flight_example_data.create_example_airports(), 'Tz')
+    {'Australia/Brisbane': 1, 'Australia/Sydney': 3}
+    """
+    return AirportTable(airports).group_count(keys)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,393 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple
+
+from flight_constants import RouteDict
+from flight_functions import RoutesVersion, get_routes_version, track_routes
+from flight_graph import CompiledGraph
+
+import flight_example_data
+
+
+################################################################################
+# Connectivity of the route network.  Every search here runs on the integer
+# ids and arrays of a CompiledGraph and keeps its own stack, so it takes time
+# linear in the number of airports and routes and is not limited by Python's
+# recursion limit.
+#
+# Routes can be left out of a search with a mask: a bytearray with one entry
+# for each position in graph.targets, which is 1 for the routes to leave out.
+################################################################################
+
+def find_components(graph: CompiledGraph,
+                    removed: bytearray | None = None) -> tuple[list[int], int]:
+    """Return the strongly connected component of each airport id in graph,
+    numbered from 0, and the number of components.  Two airports are in the
+    same component if each can be reached from the other.  The routes marked
+    in removed are left out.
+
+    This is Tarjan's algorithm, which numbers the components in reverse
+    topological order: no route leads from a component to one with a
+    larger number.
+
+    >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+    >>> graph.codes
+    ['GFN', 'JCK', 'RCM', 'SYD', 'TRO']
+    >>> find_components(graph)
+    ([1, 2, 2, 0, 1], 3)
+    """
+    num_airports = len(graph.codes)
+    offsets = graph.offsets
+    targets = graph.targets
+    if removed is None:
+        removed = bytearray(len(targets))
+
+    # order is the position of each airport in the depth-first search, and
+    # low is the smallest order reachable from its subtree through airports
+    # still on the stack
+    order = [-1] * num_airports
+    low = [0] * num_airports
+    on_stack = bytearray(num_airports)
+    components = [-1] * num_airports
+    stack = []
+    num_visited = 0
+    num_components = 0
+
+    for root in range(num_airports):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = num_visited
+        num_visited += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        # Each entry is an airport and the position of the next route of it
+        # to follow
+        work = [(root, offsets[root])]
+        while work:
+            airport, position = work[-1]
+            end = offsets[airport + 1]
+            while position < end:
+                neighbor = targets[position]
+                position += 1
+                if removed[position - 1]:
+                    continue
+                if order[neighbor] == -1:
+                    work[-1] = (airport, position)
+                    order[neighbor] = low[neighbor] = num_visited
+                    num_visited += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = 1
+                    work.append((neighbor, offsets[neighbor]))
+                    break
+                if on_stack[neighbor] and order[neighbor] < low[airport]:
+                    low[airport] = order[neighbor]
+            else:
+                # Every route of airport has been followed
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[airport] < low[parent]:
+                        low[parent] = low[airport]
+                if low[airport] == order[airport]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        components[member] = num_components
+                        if member == airport:
+                            break
+                    num_components += 1
+
+    return components, num_components
+
+
+def find_articulation_ids(graph: CompiledGraph) -> list[int]:
+    """Return the sorted list of airport ids in graph whose removal would
+    split the airports connected to them into more than one group, when the
+    direction of routes is ignored.
+
+    >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+    >>> [graph.codes[i] for i in find_articulation_ids(graph)]
+    ['TRO']
+    """
+    num_airports = len(graph.codes)
+    offsets = graph.offsets
+    targets = graph.targets
+
+    # Ignore the direction of routes, and the second of a pair of routes in
+    # opposite directions
+    neighbors = [set() for _ in range(num_airports)]
+    for source in range(num_airports):
+        for destination in targets[offsets[source]:offsets[source + 1]]:
+            if destination != source:
+                neighbors[source].add(destination)
+                neighbors[destination].add(source)
+
+    order = [-1] * num_airports
+    low = [0] * num_airports
+    is_articulation = bytearray(num_airports)
+    num_visited = 0
+
+    for root in range(num_airports):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = num_visited
+        num_visited += 1
+        num_root_children = 0
+
+        # Each entry is an airport, the airport it was reached from, and the
+        # neighbors of it that are left to visit
+        work = [(root, -1, iter(neighbors[root]))]
+        while work:
+            airport, parent, remaining = work[-1]
+            for neighbor in remaining:
+                if order[neighbor] == -1:
+                    order[neighbor] = low[neighbor] = num_visited
+                    num_visited += 1
+                    work.append((neighbor, airport, iter(neighbors[neighbor])))
+                    break
+                if neighbor != parent and order[neighbor] < low[airport]:
+                    low[airport] = order[neighbor]
+            else:
+                work.pop()
+                if parent == -1:
+                    continue
+                if low[airport] < low[parent]:
+                    low[parent] = low[airport]
+
+                # Nothing below airport reaches above parent without it
+                if parent == root:
+                    num_root_children += 1
+                elif low[airport] >= order[parent]:
+                    is_articulation[parent] = 1
+        if num_root_children > 1:
+            is_articulation[root] = 1
+
+    return [i for i in range(num_airports) if is_articulation[i]]
+
+
+def _find_source(graph: CompiledGraph, position: int) -> int:
+    """Return the id of the source airport of the route at position in
+    graph.targets.
+
+    >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+    >>> graph.codes[_find_source(graph, 4)]
+    'TRO'
+    """
+    return bisect_right(graph.offsets, position) - 1
+
+
+class DecommissionImpact(NamedTuple):
+    """What decommissioning an airplane would do to the route network.
+
+    Instance Attributes:
+        - plane: the airplane that would be decommissioned
+        - routes_with_no_planes: the sorted list of (source, destination)
+          routes that would be left with no planes, as decomission_plane
+          would return
+        - num_components: the number of strongly connected components once
+          those routes can no longer be flown
+        - disconnected: the sorted IATA airport codes of the first of the
+          largest strongly connected components, as ordered by
+          NetworkAnalytics.get_components, that would no longer be strongly
+          connected to most of it, or to the first of its airports in
+          lexicographical order if no part of it is largest
+    """
+    plane: str
+    routes_with_no_planes: list[tuple[str, str]]
+    num_components: int
+    disconnected: list[str]
+
+
+class NetworkAnalytics:
+    """Connectivity reports about a RouteDict, computed from one
+    CompiledGraph of it.  Everything is rebuilt when routes is changed by a
+    function that calls flight_functions.mark_routes_changed.
+
+    Instance Attributes:
+        - routes: the routes that are analysed
+        - graph: a CompiledGraph of routes
+        - components: the strongly connected component of each airport id
+        - num_components: the number of strongly connected components
+        - in_degrees: the number of routes into each airport id
+        - out_degrees: the number of routes out of each airport id
+    """
+    routes: RouteDict
+    graph: CompiledGraph
+    components: list[int]
+    num_components: int
+    in_degrees: array
+    out_degrees: array
+    _routes_by_plane: dict[str, list[int]]
+    _articulation_ids: list[int] | None
+    _tracked: RoutesVersion
+    _version: int
+
+    def __init__(self, routes: RouteDict) -> None:
+        """Initialize the analytics of routes.
+
+        >>> analytics = NetworkAnalytics(
+        ...     flight_example_data.create_example_routes())
+        >>> analytics.num_components
+        3
+        >>> list(analytics.in_degrees), list(analytics.out_degrees)
+        ([1, 1, 1, 1, 1], [1, 1, 1, 0, 2])
+        """
+        self.routes = routes
+        self._tracked = track_routes(routes)
+        self._build()
+
+    def _build(self) -> None:
+        """Compute everything from routes from scratch."""
+        self.graph = graph = CompiledGraph(self.routes)
+        self.components, self.num_components = find_components(graph)
+
+        offsets = graph.offsets
+        self.out_degrees = array('I', [offsets[i + 1] - offsets[i]
+                                       for i in range(len(graph.codes))])
+        self.in_degrees = array('I', bytes(4 * len(graph.codes)))
+        for destination in graph.targets:
+            self.in_degrees[destination] += 1
+
+        # Index the routes of each airplane by their positions in targets
+        self._routes_by_plane = {}
+        aircraft = graph.aircraft
+        aircraft_offsets = graph.aircraft_offsets
+        for position in range(len(graph.targets)):
+            for i in aircraft[aircraft_offsets[position]:
+                              aircraft_offsets[position + 1]]:
+                plane = graph.aircraft_codes[i]
+                if plane not in self._routes_by_plane:
+                    self._routes_by_plane[plane] = []
+                self._routes_by_plane[plane].append(position)
+
+        self._articulation_ids = None
+        self._version = get_routes_version(self.routes)
+
+    def _check_version(self) -> None:
+        """Rebuild everything if routes has changed."""
+        if get_routes_version(self.routes) != self._version:
+            self._build()
+
+    def get_components(self) -> list[list[str]]:
+        """Return the strongly connected components of routes as sorted
+        lists of IATA airport codes, largest first, and in lexicographical
+        order among components of the same size.
+
+        >>> analytics = NetworkAnalytics(
+        ...     flight_example_data.create_example_routes())
+        >>> analytics.get_components()
+        [['GFN', 'TRO'], ['JCK', 'RCM'], ['SYD']]
+        """
+        self._check_version()
+        members = [[] for _ in range(self.num_components)]
+        for i, component in enumerate(self.components):
+            members[component].append(self.graph.codes[i])
+        members.sort(key=lambda codes: (-len(codes), codes))
+        return members
+
+    def find_hubs(self, k: int) -> list[tuple[str, int]]:
+        """Return the k airports with the most routes in or out, as
+        (IATA code, number of routes) in decreasing order of routes, and in
+        lexicographical order among airports with as many routes.
+
+        >>> analytics = NetworkAnalytics(
+        ...     flight_example_data.create_example_routes())
+        >>> analytics.find_hubs(2)
+        [('TRO', 3), ('GFN', 2)]
+        """
+        self._check_version()
+        degrees = [(-(in_degree + out_degree), code) for code, in_degree,
+                   out_degree in zip(self.graph.codes, self.in_degrees,
+                                     self.out_degrees)]
+        degrees.sort()
+        return [(code, -degree) for degree, code in degrees[:k]]
+
+    def find_articulation_airports(self) -> list[str]:
+        """Return the sorted list of IATA codes of the airports whose
+        closure would split the airports connected to them into more than
+        one group, when the direction of routes is ignored.
+
+        >>> analytics = NetworkAnalytics(
+        ...     flight_example_data.create_example_routes())
+        >>> analytics.find_articulation_airports()
+        ['TRO']
+        """
+        self._check_version()
+        if self._articulation_ids is None:
+            self._articulation_ids = find_articulation_ids(self.graph)
+        return [self.graph.codes[i] for i in self._articulation_ids]
+
+    def decommission_impact(self, plane: str) -> DecommissionImpact:
+        """Return what decommissioning plane with decomission_plane would do
+        to routes, without changing routes.  Only the routes that use plane
+        are visited to find the routes left with no planes, and the
+        components are found again with those routes left out.
+
+        >>> routes = flight_example_data.create_example_routes()
+        >>> impact = NetworkAnalytics(routes).decommission_impact('SF3')
+        >>> impact.routes_with_no_planes
+        [('GFN', 'TRO'), ('JCK', 'RCM'), ('RCM', 'JCK'), ('TRO', 'GFN')]
+        >>> impact.num_components, impact.disconnected
+        (5, ['TRO'])
+        >>> routes['TRO']['SYD']
+        ['SF3', 'DH4']
+        """
+        self._check_version()
+        graph = self.graph
+        removed = bytearray(len(graph.targets))
+        routes_with_no_planes = []
+        aircraft_offsets = graph.aircraft_offsets
+        for position in self._routes_by_plane.get(plane, ()):
+            # decomission_plane removes one copy of plane, so only a route
+            # with no other planes is left with none
+            if aircraft_offsets[position + 1] - aircraft_offsets[position] \
+                    == 1:
+                removed[position] = 1
+                source = _find_source(graph, position)
+                routes_with_no_planes.append(
+                    (graph.codes[source], graph.codes[graph.targets[position]]))
+        routes_with_no_planes.sort()
+
+        if not routes_with_no_planes:
+            return DecommissionImpact(plane, [], self.num_components, [])
+        components, num_components = find_components(graph, removed)
+
+        # The largest component before is matched with the component after
+        # that holds most of its airports; ties go to the first airport, as
+        # ids are in lexicographical order
+        sizes = [0] * self.num_components
+        for component in self.components:
+            sizes[component] += 1
+        largest = self.components[0]
+        for component in self.components:
+            if sizes[component] > sizes[largest]:
+                largest = component
+        members = [i for i, component in enumerate(self.components)
+                   if component == largest]
+        counts = {}
+        for i in members:
+            counts[components[i]] = counts.get(components[i], 0) + 1
+        core = max(counts, key=counts.__getitem__)
+        disconnected = [graph.codes[i] for i in members
+                        if components[i] != core]
+        return DecommissionImpact(plane, routes_with_no_planes,
+                                  num_components, disconnected)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
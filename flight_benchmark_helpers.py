@@ -0,0 +1,110 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, TextIO
+
+from flight_constants import RouteDict
+
+
+################################################################################
+# Helpers shared by flight_benchmarks and flight_benchmark_suite
+################################################################################
+
+def time_call(function: Callable, *args: object, repeat: int = 3) -> float:
+    """Return the smallest number of seconds taken by function(*args) over
+    repeat calls.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, seconds: float, baseline: float | None = None) -> None:
+    """Print the time taken by the benchmark called name, and how many times
+    faster it was than baseline if baseline is given.
+    """
+    line = f'{name:<40} {seconds * 1000:10.3f} ms'
+    if baseline is not None and seconds > 0:
+        line += f'  ({baseline / seconds:.1f}x)'
+    print(line)
+
+
+def measure_memory(function: Callable, *args: object) -> tuple[object, int]:
+    """Return the result of function(*args) and the number of bytes that were
+    still allocated by the call when it returned.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
+
+def measure_peak_memory(function: Callable, *args: object) -> int:
+    """Return the largest number of bytes allocated at once while calling
+    function(*args).
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def create_temporary_file(write: Callable[[TextIO], None]) -> str:
+    """Return the path of a new temporary file whose contents are written by
+    calling write with the open file.  The caller must remove the file.
+    """
+    descriptor, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(descriptor, 'w', encoding='utf8') as new_file:
+        write(new_file)
+    return path
+
+
+def create_itineraries(routes: RouteDict, num_itineraries: int,
+                       seed: int = 0) -> list[list[str]]:
+    """Return num_itineraries flight sequences of 2 to 5 airports.  Most
+    follow the routes, as real itineraries do; every fourth one ends at a
+    random airport.
+    """
+    rng = random.Random(seed)
+    sources = list(routes)
+    itineraries = []
+    for i in range(num_itineraries):
+        itinerary = [rng.choice(sources)]
+        for _ in range(rng.randint(1, 4)):
+            destinations = routes.get(itinerary[-1])
+            if not destinations:
+                break
+            itinerary.append(rng.choice(list(destinations)))
+        if i % 4 == 0 or len(itinerary) < 2:
+            itinerary.append(rng.choice(sources))
+        itineraries.append(itinerary)
+    return itineraries
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
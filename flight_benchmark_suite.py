@@ -0,0 +1,258 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from flight_benchmark_helpers import create_itineraries
+from flight_constants import AirportDict, RouteDict
+import flight_functions
+import flight_reader
+import flight_synthetic_data
+
+
+################################################################################
+# A regression suite that times the public functions of flight_reader and
+# flight_functions on synthetic data at several scales.  Every run generates
+# the same data from fixed seeds, so results from different runs on the same
+# machine can be compared.  Each case is timed a few times and the fastest
+# time is kept, which is the least disturbed by other work on the machine.
+#
+#     python flight_benchmark_suite.py --save       record a baseline
+#     python flight_benchmark_suite.py              compare with the baseline
+#
+# The comparison exits with status 1 if any case is slower than the baseline
+# by more than the threshold.  Baselines are only meaningful on the machine
+# that recorded them, so they are not kept in the repository.
+################################################################################
+
+# Maps the name of each scale to its number of airports and routes
+SCALES = {
+    'small': (700, 6700),
+    'medium': (2800, 26800),
+    'openflights': (flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS,
+                    flight_synthetic_data.OPENFLIGHTS_NUM_ROUTES),
+}
+
+DEFAULT_BASELINE_PATH = 'benchmark_baseline.json'
+
+# A case regresses if it takes more than 1 + DEFAULT_THRESHOLD times as long
+# as its baseline
+DEFAULT_THRESHOLD = 0.25
+
+DEFAULT_REPEAT = 3
+
+# The number of queries made by each case that times a single query
+NUM_LOOKUPS = 20000
+NUM_ITINERARIES = 5000
+NUM_SOURCES = 200
+NUM_DECOMMISSIONED = 5
+NUM_SUMMARIES = 50
+
+
+def _time_once(function: Callable, *args: object) -> float:
+    """Return the number of seconds taken by function(*args)."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def create_cases(airports_path: str, routes_path: str,
+                 airports: AirportDict, routes: RouteDict) -> \
+        dict[str, Callable[[], float]]:
+    """Return a dictionary that maps the name of each public function to a
+    case: a function that calls it on the data in airports_path and
+    routes_path, parsed as airports and routes, and returns the number of
+    seconds the calls took.  Setting up the calls is not timed.
+    """
+    rng = random.Random(0)
+    codes = list(airports)
+    sources = list(routes)
+    pairs = [(rng.choice(sources), rng.choice(codes))
+             for _ in range(NUM_LOOKUPS)]
+    itineraries = create_itineraries(routes, NUM_ITINERARIES)
+    reach_sources = rng.sample(sources, min(NUM_SOURCES, len(sources)))
+    planes = flight_synthetic_data.DEFAULT_AIRCRAFT[:NUM_DECOMMISSIONED]
+
+    def read_airports() -> float:
+        with open(airports_path, encoding='utf8') as airports_file:
+            return _time_once(flight_reader.read_airports, airports_file)
+
+    def read_routes() -> float:
+        with open(routes_path, encoding='utf8') as routes_file:
+            return _time_once(flight_reader.read_routes, routes_file,
+                              airports)
+
+    def is_direct_flight() -> float:
+        function = flight_functions.is_direct_flight
+        return _time_once(lambda: [function(routes, source, destination)
+                                   for source, destination in pairs])
+
+    def is_valid_flight_sequence() -> float:
+        function = flight_functions.is_valid_flight_sequence
+        return _time_once(lambda: [function(routes, itinerary)
+                                   for itinerary in itineraries])
+
+    def are_valid_flight_sequences() -> float:
+        return _time_once(flight_functions.are_valid_flight_sequences, routes,
+                          itineraries)
+
+    def find_first_invalid_legs() -> float:
+        return _time_once(flight_functions.find_first_invalid_legs, routes,
+                          itineraries)
+
+    def summarize_by_timezone() -> float:
+        # One call is too quick to time reliably
+        function = flight_functions.summarize_by_timezone
+        return _time_once(lambda: [function(airports)
+                                   for _ in range(NUM_SUMMARIES)])
+
+    def find_reachable_destinations() -> float:
+        function = flight_functions.find_reachable_destinations
+        return _time_once(lambda: [function(routes, source, 2)
+                                   for source in reach_sources])
+
+    def decomission_plane() -> float:
+        copied = copy.deepcopy(routes)
+        function = flight_functions.decomission_plane
+        return _time_once(lambda: [function(copied, plane)
+                                   for plane in planes])
+
+    return {case.__name__: case for case in [
+        read_airports, read_routes, is_direct_flight, is_valid_flight_sequence,
+        are_valid_flight_sequences, find_first_invalid_legs,
+        summarize_by_timezone, find_reachable_destinations,
+        decomission_plane]}
+
+
+def run_suite(scales: list[str], repeat: int = DEFAULT_REPEAT) -> \
+        dict[str, float]:
+    """Return a dictionary that maps scale/case, for each case at each of
+    scales, to the fewest seconds the case took over repeat runs.
+
+    Preconditions:
+        - every scale in scales is in SCALES
+        - repeat >= 1
+    """
+    results = {}
+    for scale in scales:
+        num_airports, num_routes = SCALES[scale]
+        with tempfile.TemporaryDirectory() as directory:
+            airports_path, routes_path = \
+                flight_synthetic_data.write_synthetic_data(
+                    directory, num_airports, num_routes)
+            with open(airports_path, encoding='utf8') as airports_file:
+                airports = flight_reader.read_airports(airports_file)
+            with open(routes_path, encoding='utf8') as routes_file:
+                routes = flight_reader.read_routes(routes_file, airports)
+            cases = create_cases(airports_path, routes_path, airports, routes)
+            for name, case in cases.items():
+                results[f'{scale}/{name}'] = min(case()
+                                                 for _ in range(repeat))
+    return results
+
+
+def find_regressions(results: dict[str, float], baseline: dict[str, float],
+                     threshold: float = DEFAULT_THRESHOLD) -> \
+        list[tuple[str, float, float]]:
+    """Return (name, baseline seconds, seconds) for each case in results that
+    took more than 1 + threshold times as long as in baseline, in the order
+    of results.  Cases that are not in baseline are never regressions.
+
+    >>> find_regressions({'small/a': 1.3, 'small/b': 1.1, 'small/c': 9.0},
+    ...                  {'small/a': 1.0, 'small/b': 1.0})
+    [('small/a', 1.0, 1.3)]
+    """
+    return [(name, baseline[name], seconds)
+            for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * (1 + threshold)]
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    """Return the baseline results saved in the file at path."""
+    with open(path, encoding='utf8') as baseline_file:
+        return json.load(baseline_file)['results']
+
+
+def save_baseline(path: str, results: dict[str, float]) -> None:
+    """Save results as the baseline in the file at path."""
+    with open(path, 'w', encoding='utf8') as baseline_file:
+        json.dump({'python': sys.version.split()[0], 'results': results},
+                  baseline_file, indent=2, sort_keys=True)
+
+
+def print_results(results: dict[str, float],
+                  baseline: dict[str, float]) -> None:
+    """Print the time of each case in results, and its change from
+    baseline if it has a baseline.
+    """
+    for name, seconds in results.items():
+        line = f'{name:<45} {seconds * 1000:10.3f} ms'
+        if name in baseline and baseline[name] > 0:
+            line += f'  {(seconds / baseline[name] - 1) * 100:+7.1f}%'
+        print(line)
+
+
+def main(argv: list[str]) -> int:
+    """Run the suite as the command line argv asks and return the exit
+    status: 1 if a case regressed, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description='Time the flight functions and compare with a baseline.')
+    parser.add_argument('--scales', default=','.join(SCALES),
+                        help='comma-separated scales from: '
+                             + ', '.join(SCALES))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help='the baseline JSON file')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='the largest allowed slowdown, as a fraction')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    arguments = parser.parse_args(argv)
+
+    scales = arguments.scales.split(',')
+    for scale in scales:
+        if scale not in SCALES:
+            parser.error(f'unknown scale: {scale}')
+    results = run_suite(scales, arguments.repeat)
+
+    if arguments.save:
+        print_results(results, {})
+        save_baseline(arguments.baseline, results)
+        print(f'saved baseline to {arguments.baseline}')
+        return 0
+
+    try:
+        baseline = load_baseline(arguments.baseline)
+    except FileNotFoundError:
+        print_results(results, {})
+        print(f'no baseline at {arguments.baseline}; run with --save')
+        return 0
+
+    print_results(results, baseline)
+    regressions = find_regressions(results, baseline, arguments.threshold)
+    for name, before, after in regressions:
+        print(f'REGRESSION {name}: {before * 1000:.3f} ms -> '
+              f'{after * 1000:.3f} ms')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
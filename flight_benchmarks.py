@@ -0,0 +1,1149 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import copy
+import datetime
+import os
+import random
+import subprocess
+import sys
+import time
+from io import StringIO
+from typing import Callable, TextIO
+
+
+from flight_benchmark_helpers import create_itineraries, \
+    create_temporary_file, measure_memory, measure_peak_memory, report, \
+    time_call
+from flight_constants import AirportDict, RouteDict
+import flight_aircraft_index
+import flight_analytics
+import flight_airport_table
+import flight_cache
+import flight_closure
+import flight_distances
+import flight_functions
+import flight_graph
+import flight_inbound
+import flight_instrumentation
+import flight_parallel
+import flight_reachability_index
+import flight_reader
+import flight_route_store
+import flight_routing
+import flight_schedule
+import flight_shared_aircraft
+import flight_spatial
+import flight_synthetic_data
+
+
+################################################################################
+# Reference implementations that the benchmarks compare against
+################################################################################
+
+def list_queue_reachable_destinations(routes: RouteDict, source: str,
+                                      n: int) -> list[str]:
+    """Return the same list as flight_functions.find_reachable_destinations
+    using the original list-based BFS, which pops from the front of a list
+    and checks membership in a list of visited airports.
+    """
+    visited = []
+    queue = [(source, 0)]
+    while queue:
+        airport, hops = queue.pop(0)
+        if airport in visited or hops > n:
+            continue
+        visited.append(airport)
+        if airport in routes:
+            for neighbor in routes[airport]:
+                queue.append((neighbor, hops + 1))
+    visited.sort()
+    return visited
+
+
+def split_line_read_airports(airports_data: TextIO) -> AirportDict:
+    """Return the same dictionary as flight_reader.read_airports using the
+    original parser, which removes every quote and splits each line on
+    commas.
+    """
+    airports = {}
+    for line in airports_data:
+        fields = line.replace('"', '').strip().split(',')
+        airports[fields[0]] = {'Name': fields[1],
+                               'City': fields[2],
+                               'Country': fields[3],
+                               'Latitude': float(fields[4]),
+                               'Longitude': float(fields[5]),
+                               'Tz': fields[6]}
+    return airports
+
+
+def line_by_line_read_routes(routes_data: TextIO,
+                             airports: AirportDict) -> RouteDict:
+    """Return the same dictionary as flight_reader.read_routes by iterating
+    over the lines of routes_data, stripping each one and comparing it with
+    every kind of line in turn.
+    """
+    routes = {}
+    source_airport = None
+    for line in routes_data:
+        line = line.strip()
+        if line.startswith('SOURCE:'):
+            source_airport = line.split()[1]
+            if source_airport in airports:
+                if source_airport not in routes:
+                    routes[source_airport] = {}
+            else:
+                source_airport = None
+        elif line == 'DESTINATIONS BEGIN' or line == 'DESTINATIONS END':
+            continue
+        elif source_airport:
+            destination, *airplanes = line.split()
+            if destination in airports:
+                if destination not in routes[source_airport]:
+                    routes[source_airport][destination] = []
+                routes[source_airport][destination].extend(airplanes)
+    return routes
+
+
+################################################################################
+# Benchmarks
+################################################################################
+
+def benchmark_reachability(num_sources: int = 5) -> None:
+    """Compare find_reachable_destinations with the list-based BFS on a
+    synthetic graph the size of OpenFlights, for the num_sources busiest
+    airports and n = 1, 2 and 3.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    sources = flight_synthetic_data.create_synthetic_codes(num_sources)
+    for n in (1, 2, 3):
+        for source in sources:
+            expected = list_queue_reachable_destinations(routes, source, n)
+            actual = flight_functions.find_reachable_destinations(
+                routes, source, n)
+            assert actual == expected, (source, n)
+
+        baseline = sum(time_call(list_queue_reachable_destinations, routes,
+                                 source, n, repeat=1) for source in sources)
+        current = sum(time_call(flight_functions.find_reachable_destinations,
+                                routes, source, n) for source in sources)
+        report(f'list queue BFS, n={n}', baseline)
+        report(f'find_reachable_destinations, n={n}', current, baseline)
+
+
+def benchmark_compiled_graph(num_queries: int = 20000) -> None:
+    """Compare the memory used by a RouteDict and a CompiledGraph of the same
+    synthetic routes, and the throughput of their is_direct_flight and
+    find_reachable_destinations queries.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+
+    # Copying routes allocates every dict and list, but shares the strings
+    # with the original, just like compiling it does
+    _, dict_bytes = measure_memory(copy.deepcopy, routes)
+    graph, graph_bytes = measure_memory(flight_graph.CompiledGraph, routes)
+    print(f'RouteDict memory     {dict_bytes / 2 ** 20:10.2f} MiB')
+    print(f'CompiledGraph memory {graph_bytes / 2 ** 20:10.2f} MiB')
+
+    codes = graph.codes
+    pairs = [(codes[i % len(codes)], codes[(i * 7919) % len(codes)])
+             for i in range(num_queries)]
+
+    def dict_direct() -> None:
+        for source, destination in pairs:
+            flight_functions.is_direct_flight(routes, source, destination)
+
+    def graph_direct() -> None:
+        for source, destination in pairs:
+            graph.is_direct_flight(source, destination)
+
+    baseline = time_call(dict_direct)
+    report(f'RouteDict is_direct_flight x{num_queries}', baseline)
+    report(f'CompiledGraph is_direct_flight x{num_queries}',
+           time_call(graph_direct), baseline)
+
+    sources = codes[:20]
+    for n in (2, 3):
+        for source in sources:
+            assert graph.find_reachable_destinations(source, n) == \
+                flight_functions.find_reachable_destinations(routes, source, n)
+        baseline = sum(time_call(flight_functions.find_reachable_destinations,
+                                 routes, source, n) for source in sources)
+        current = sum(time_call(graph.find_reachable_destinations, source, n)
+                      for source in sources)
+        report(f'RouteDict reachable, n={n}', baseline)
+        report(f'CompiledGraph reachable, n={n}', current, baseline)
+
+
+def benchmark_airport_reader(num_airports: int = 100000) -> None:
+    """Compare the parse time and peak memory of the original airport parser
+    with the streaming csv-based readers on a synthetic airports file with
+    num_airports lines.  The csv-based readers parse quoted commas
+    correctly; read_airports takes about as long as the original parser,
+    and only streaming saves time and memory.
+    """
+    path = create_temporary_file(
+        lambda airports_file: flight_synthetic_data.write_synthetic_airports(
+            airports_file, num_airports))
+
+    def parse_with(reader: Callable) -> Callable[[], object]:
+        def parse() -> object:
+            with open(path, encoding='utf8') as airports_file:
+                return reader(airports_file)
+        return parse
+
+    def consume(airports_data: TextIO) -> None:
+        for _ in flight_reader.iter_airports(airports_data):
+            pass
+
+    readers = [('original read_airports', split_line_read_airports),
+               ('read_airports', flight_reader.read_airports),
+               ('list(iter_airports)',
+                lambda airports_file: list(
+                    flight_reader.iter_airports(airports_file))),
+               ('streaming iter_airports', consume)]
+    try:
+        assert parse_with(flight_reader.read_airports)() == \
+            parse_with(split_line_read_airports)()
+        baseline = None
+        for name, reader in readers:
+            seconds = time_call(parse_with(reader))
+            peak = measure_peak_memory(parse_with(reader))
+            report(f'{name}, peak {peak / 2 ** 20:.1f} MiB', seconds, baseline)
+            if baseline is None:
+                baseline = seconds
+    finally:
+        os.remove(path)
+
+
+def benchmark_snapshot_cache() -> None:
+    """Compare the time taken to start up by parsing synthetic OpenFlights
+    sized airports and routes files with the time taken to load them from a
+    warm snapshot cache.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    airports_path = create_temporary_file(
+        lambda airports_file: flight_synthetic_data.write_synthetic_airports(
+            airports_file, flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS))
+    routes_path = create_temporary_file(
+        lambda routes_file: flight_synthetic_data.write_routes(routes_file,
+                                                               routes))
+    cache_path = routes_path + '.snapshot'
+
+    def cold_start() -> None:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        flight_cache.load_flight_data(airports_path, routes_path, cache_path)
+
+    def warm_start() -> None:
+        flight_cache.load_flight_data(airports_path, routes_path, cache_path)
+
+    def open_snapshot() -> None:
+        flight_cache.Snapshot(cache_path).close()
+
+    try:
+        baseline = time_call(cold_start)
+        print(f'snapshot size {os.path.getsize(cache_path) / 2 ** 20:.2f} MiB')
+        report('cold start (parse and write snapshot)', baseline)
+        report('warm start (load snapshot)', time_call(warm_start), baseline)
+        report('open snapshot only', time_call(open_snapshot), baseline)
+    finally:
+        for path in (airports_path, routes_path, cache_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def benchmark_reachability_index(num_queries: int = 2000) -> None:
+    """Compare num_queries calls of find_reachable_destinations with the same
+    queries answered by a ReachabilityIndex, when a few hundred sources are
+    queried over and over with different n.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    sources = flight_synthetic_data.create_synthetic_codes(300)
+    queries = [(sources[(i * 37) % len(sources)], 1 + i % 3)
+               for i in range(num_queries)]
+    index = flight_reachability_index.ReachabilityIndex(routes)
+
+    def without_index() -> None:
+        for source, n in queries:
+            flight_functions.find_reachable_destinations(routes, source, n)
+
+    def with_index() -> None:
+        for source, n in queries:
+            index.find_reachable_destinations(source, n)
+
+    for source, n in queries[:50]:
+        assert index.find_reachable_destinations(source, n) == \
+            flight_functions.find_reachable_destinations(routes, source, n)
+    index.invalidate()
+
+    baseline = time_call(without_index, repeat=1)
+    report(f'find_reachable_destinations x{num_queries}', baseline)
+    report(f'ReachabilityIndex x{num_queries}', time_call(with_index),
+           baseline)
+    print(f'index hits {index.hits}, misses {index.misses}, '
+          f'{index.memory_used() / 2 ** 20:.2f} MiB cached')
+
+
+def benchmark_decommission(num_planes: int = 50) -> None:
+    """Compare decommissioning num_planes airplane types in a row with
+    decomission_plane and with an AircraftIndex, on synthetic routes that use
+    200 airplane types.
+    """
+    aircraft = [f'A{i:03}' for i in range(200)]
+    routes = flight_synthetic_data.create_synthetic_routes(aircraft=aircraft)
+    planes = aircraft[:num_planes]
+
+    def with_scan() -> list:
+        copied = copy.deepcopy(routes)
+        start = time.perf_counter()
+        results = [flight_functions.decomission_plane(copied, plane)
+                   for plane in planes]
+        return [time.perf_counter() - start, results]
+
+    def with_index() -> list:
+        copied = copy.deepcopy(routes)
+        index = flight_aircraft_index.AircraftIndex(copied)
+        start = time.perf_counter()
+        results = index.decommission_all(planes)
+        return [time.perf_counter() - start, results]
+
+    baseline, expected = with_scan()
+    current, actual = with_index()
+    assert actual == expected
+    copied = copy.deepcopy(routes)
+    build = time_call(flight_aircraft_index.AircraftIndex, copied)
+    report(f'decomission_plane x{num_planes}', baseline)
+    report(f'AircraftIndex.decommission x{num_planes}', current, baseline)
+    report('building the AircraftIndex', build)
+
+
+def benchmark_sequence_batch(num_itineraries: int = 30000) -> None:
+    """Compare validating num_itineraries itineraries by calling
+    is_valid_flight_sequence in a loop with are_valid_flight_sequences.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    itineraries = create_itineraries(routes, num_itineraries)
+
+    def loop() -> list[bool]:
+        return [flight_functions.is_valid_flight_sequence(routes, itinerary)
+                for itinerary in itineraries]
+
+    assert loop() == flight_functions.are_valid_flight_sequences(routes,
+                                                                 itineraries)
+    baseline = time_call(loop)
+    report(f'is_valid_flight_sequence x{num_itineraries}', baseline)
+    report('are_valid_flight_sequences',
+           time_call(flight_functions.are_valid_flight_sequences, routes,
+                     itineraries), baseline)
+    report('find_first_invalid_legs',
+           time_call(flight_functions.find_first_invalid_legs, routes,
+                     itineraries), baseline)
+
+
+def read_synthetic_airports(num_airports: int) -> AirportDict:
+    """Return the airports read from a synthetic airports file with
+    num_airports lines.
+    """
+    path = create_temporary_file(
+        lambda airports_file: flight_synthetic_data.write_synthetic_airports(
+            airports_file, num_airports))
+    try:
+        with open(path, encoding='utf8') as airports_file:
+            return flight_reader.read_airports(airports_file)
+    finally:
+        os.remove(path)
+
+
+def benchmark_airport_table(num_airports: int = 100000) -> None:
+    """Compare summarize_by_timezone with group counts on an AirportTable of
+    num_airports synthetic airports.
+    """
+    airports = read_synthetic_airports(num_airports)
+    table = flight_airport_table.AirportTable(airports)
+    assert table.group_count('Tz') == \
+        flight_functions.summarize_by_timezone(airports)
+
+    baseline = time_call(flight_functions.summarize_by_timezone, airports)
+    report('summarize_by_timezone', baseline)
+    report('building the AirportTable',
+           time_call(flight_airport_table.AirportTable, airports), baseline)
+    report('group_count Tz', time_call(table.group_count, 'Tz'), baseline)
+    report('group_count City', time_call(table.group_count, 'City'),
+           baseline)
+    report('group_count (Country, Tz)',
+           time_call(table.group_count, ('Country', 'Tz')), baseline)
+
+
+def benchmark_spatial_index(num_queries: int = 1000) -> None:
+    """Compare nearest-airport and radius queries on an AirportSpatialIndex
+    with a brute-force scan over an AirportDict of OpenFlights size.
+    """
+    airports = read_synthetic_airports(
+        flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS)
+    rng = random.Random(0)
+    points = [(rng.uniform(-60, 70), rng.uniform(-180, 180))
+              for _ in range(num_queries)]
+    index = flight_spatial.AirportSpatialIndex(airports)
+
+    def brute_force_radius(radius_km: float) -> None:
+        for latitude, longitude in points:
+            [code for code, details in airports.items()
+             if flight_spatial.haversine_km(latitude, longitude,
+                                            details['Latitude'],
+                                            details['Longitude']) <= radius_km]
+
+    def brute_force_nearest(k: int) -> None:
+        for latitude, longitude in points:
+            flight_spatial.find_nearest_brute_force(airports, latitude,
+                                                    longitude, k)
+
+    def index_radius(radius_km: float) -> None:
+        for latitude, longitude in points:
+            index.find_within_radius(latitude, longitude, radius_km)
+
+    def index_nearest(k: int) -> None:
+        for latitude, longitude in points:
+            index.find_nearest(latitude, longitude, k)
+
+    report('building the AirportSpatialIndex',
+           time_call(flight_spatial.AirportSpatialIndex, airports))
+    baseline = time_call(brute_force_nearest, 5, repeat=1)
+    report(f'brute force 5 nearest x{num_queries}', baseline)
+    report(f'index 5 nearest x{num_queries}', time_call(index_nearest, 5),
+           baseline)
+    baseline = time_call(brute_force_radius, 250.0, repeat=1)
+    report(f'brute force 250 km radius x{num_queries}', baseline)
+    report(f'index 250 km radius x{num_queries}',
+           time_call(index_radius, 250.0), baseline)
+
+
+def benchmark_routing(num_queries: int = 50) -> None:
+    """Compare how many labels Dijkstra's algorithm and A* expand, and how
+    long they take, finding num_queries shortest routes on a geographic
+    synthetic network of OpenFlights size.
+    """
+    airports, routes = flight_synthetic_data.create_synthetic_network()
+    rng = random.Random(0)
+    codes = list(airports)
+    pairs = [tuple(rng.sample(codes, 2)) for _ in range(num_queries)]
+
+    for name, use_heuristic, max_hops in [('Dijkstra', False, None),
+                                          ('A*', True, None),
+                                          ('Dijkstra, max 4 hops', False, 4),
+                                          ('A*, max 4 hops', True, 4)]:
+        expanded = 0
+        start = time.perf_counter()
+        for source, destination in pairs:
+            _, count = flight_routing.search_route(
+                routes, airports, source, destination, use_heuristic,
+                max_hops)
+            expanded += count
+        seconds = time.perf_counter() - start
+        report(f'{name}, {expanded // num_queries} expanded per query',
+               seconds)
+
+    for source, destination in pairs[:10]:
+        dijkstra = flight_routing.find_shortest_route_dijkstra(
+            routes, airports, source, destination)
+        astar = flight_routing.find_shortest_route(routes, airports, source,
+                                                   destination)
+        assert abs(dijkstra.distance - astar.distance) < 1e-6
+
+
+def benchmark_route_parser(size_mb: int = 64) -> None:
+    """Report the throughput in MB/s of parsing a synthetic routes file of
+    about size_mb megabytes with the original line-by-line parser, with
+    read_routes, and with a RouteParser fed 64 KiB chunks.  The file repeats
+    OpenFlights-sized routes; call with size_mb=1024 for a 1 GB file.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    airports = dict.fromkeys(flight_synthetic_data.create_synthetic_codes(
+        flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS))
+
+    def write(routes_file: TextIO) -> None:
+        block = StringIO()
+        flight_synthetic_data.write_routes(block, routes)
+        text = block.getvalue()
+        for _ in range(max(1, size_mb * 2 ** 20 // len(text))):
+            routes_file.write(text)
+
+    path = create_temporary_file(write)
+    size = os.path.getsize(path) / 2 ** 20
+
+    def parse_with(reader: Callable) -> Callable[[], RouteDict]:
+        def parse() -> RouteDict:
+            with open(path, encoding='utf8') as routes_file:
+                return reader(routes_file, airports)
+        return parse
+
+    def feed_chunks(routes_file: TextIO, airports: AirportDict) -> RouteDict:
+        parser = flight_reader.RouteParser(airports)
+        for chunk in iter(lambda: routes_file.read(1 << 16), ''):
+            parser.feed(chunk)
+        return parser.close()
+
+    try:
+        print(f'routes file {size:.0f} MiB')
+        baseline = None
+        for name, reader in [('line by line', line_by_line_read_routes),
+                             ('read_routes', flight_reader.read_routes),
+                             ('RouteParser, 64 KiB chunks', feed_chunks)]:
+            seconds = time_call(parse_with(reader), repeat=1)
+            report(f'{name}, {size / seconds:.1f} MiB/s', seconds, baseline)
+            if baseline is None:
+                baseline = seconds
+        assert parse_with(feed_chunks)() == \
+            parse_with(line_by_line_read_routes)()
+    finally:
+        os.remove(path)
+
+
+def benchmark_parallel_routes(size_mb: int = 256) -> None:
+    """Report the time to read a synthetic routes file of about size_mb
+    megabytes with read_routes and with read_routes_parallel on 1, 2, 4 and
+    8 worker processes.  The results depend on the number of CPUs, which is
+    printed with them.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    airports = dict.fromkeys(flight_synthetic_data.create_synthetic_codes(
+        flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS))
+
+    def write(routes_file: TextIO) -> None:
+        block = StringIO()
+        flight_synthetic_data.write_routes(block, routes)
+        text = block.getvalue()
+        for _ in range(max(1, size_mb * 2 ** 20 // len(text))):
+            routes_file.write(text)
+
+    path = create_temporary_file(write)
+    size = os.path.getsize(path) / 2 ** 20
+
+    def read_serial() -> RouteDict:
+        with open(path, encoding='utf8') as routes_file:
+            return flight_reader.read_routes(routes_file, airports)
+
+    try:
+        print(f'routes file {size:.0f} MiB, {os.cpu_count()} CPUs')
+        expected = read_serial()
+        baseline = time_call(read_serial, repeat=1)
+        report('read_routes', baseline)
+        for workers in (1, 2, 4, 8):
+            seconds = time_call(flight_parallel.read_routes_parallel, path,
+                                airports, workers, repeat=1)
+            report(f'{workers} workers, {size / seconds:.1f} MiB/s', seconds,
+                   baseline)
+        assert flight_parallel.read_routes_parallel(path, airports, 4) == \
+            expected
+    finally:
+        os.remove(path)
+
+
+def benchmark_parallel_reachability(n: int = 2) -> None:
+    """Report the time to find the airports reachable in at most n flights
+    from every airport of OpenFlights-sized synthetic routes, one source at
+    a time and with find_all_reachable_destinations on 1, 2, 4 and 8 worker
+    processes.  The results depend on the number of CPUs, which is printed
+    with them.
+    """
+    graph = flight_graph.CompiledGraph(
+        flight_synthetic_data.create_synthetic_routes())
+    print(f'{len(graph)} sources, n={n}, {os.cpu_count()} CPUs')
+
+    def serial() -> dict[str, list[str]]:
+        return {source: graph.find_reachable_destinations(source, n)
+                for source in graph.codes}
+
+    expected = serial()
+    baseline = time_call(serial, repeat=1)
+    report('find_reachable_destinations per source', baseline)
+    for workers in (1, 2, 4, 8):
+        seconds = time_call(flight_parallel.find_all_reachable_destinations,
+                            graph, n, None, workers, repeat=1)
+        report(f'{workers} workers', seconds, baseline)
+    assert flight_parallel.find_all_reachable_destinations(graph, n, None,
+                                                           4) == expected
+
+
+def benchmark_closure(max_n: int = 6) -> None:
+    """Report the time and memory to find the airports reachable from every
+    airport of OpenFlights-sized synthetic routes within 1 to max_n flights,
+    with a breadth-first search per source and with a ReachabilityClosure.
+    """
+    graph = flight_graph.CompiledGraph(
+        flight_synthetic_data.create_synthetic_routes())
+    print(f'{len(graph)} airports, {graph.num_routes()} routes')
+
+    def search_all(n: int) -> list[int]:
+        return [len(graph.reachable_ids(i, n)) for i in range(len(graph))]
+
+    def closure_counts(n: int) -> list[int]:
+        closure = flight_closure.ReachabilityClosure(graph, n)
+        return [closure.count_reachable(code) for code in graph.codes]
+
+    for n in range(1, max_n + 1):
+        baseline = time_call(search_all, n, repeat=1)
+        report(f'n={n} BFS per source', baseline)
+        closure, allocated = measure_memory(
+            flight_closure.ReachabilityClosure, graph, n)
+        seconds = time_call(closure_counts, n, repeat=1)
+        report(f'n={n} closure, {closure.steps} steps, '
+               f'{allocated / 2 ** 20:.1f} MiB', seconds, baseline)
+        assert closure_counts(n) == search_all(n)
+
+
+def benchmark_route_store(num_operations: int = 5000,
+                          write_fraction: float = 0.1) -> None:
+    """Report the latency of a mixed workload on synthetic routes that use
+    200 airplane types: mostly direct-flight lookups, some queries for the
+    routes using an airplane, and write_fraction of adding and removing
+    airplanes.  The routes are changed once in place, with the
+    AircraftIndex rebuilt after every change, and once through a
+    RouteStore, which updates its index from the journal.
+    """
+    aircraft = [f'A{i:03}' for i in range(200)]
+    routes = flight_synthetic_data.create_synthetic_routes(aircraft=aircraft)
+    codes = list(routes)
+    rng = random.Random(0)
+    operations = []
+    for _ in range(num_operations):
+        source = rng.choice(codes)
+        destination = rng.choice(list(routes[source]) or codes)
+        roll = rng.random()
+        if roll < write_fraction / 2:
+            kind = 'add'
+        elif roll < write_fraction:
+            kind = 'remove'
+        elif roll < write_fraction + 0.05:
+            kind = 'using'
+        else:
+            kind = 'read'
+        operations.append((kind, source, destination, rng.choice(aircraft)))
+
+    def percentile(times: list[float], fraction: float) -> float:
+        return sorted(times)[min(len(times) - 1, int(len(times) * fraction))]
+
+    def run_in_place() -> tuple[float, list[float], RouteDict]:
+        copied = copy.deepcopy(routes)
+        index = flight_aircraft_index.AircraftIndex(copied)
+        write_times = []
+        start = time.perf_counter()
+        for kind, source, destination, plane in operations:
+            if kind == 'read':
+                flight_functions.is_direct_flight(copied, source, destination)
+            elif kind == 'using':
+                index.get_routes_using(plane)
+            else:
+                began = time.perf_counter()
+                if kind == 'add':
+                    copied[source].setdefault(destination, []).append(plane)
+                elif plane in copied[source].get(destination, ()):
+                    copied[source][destination].remove(plane)
+                flight_functions.mark_routes_changed(copied)
+                write_times.append(time.perf_counter() - began)
+        return time.perf_counter() - start, write_times, copied
+
+    def run_store() -> tuple[float, list[float], RouteDict]:
+        store = flight_route_store.RouteStore(copy.deepcopy(routes))
+        write_times = []
+        start = time.perf_counter()
+        for kind, source, destination, plane in operations:
+            if kind == 'read':
+                store.is_direct_flight(source, destination)
+            elif kind == 'using':
+                store.aircraft_index.get_routes_using(plane)
+            else:
+                began = time.perf_counter()
+                if kind == 'add':
+                    store.add_plane(source, destination, plane)
+                else:
+                    store.remove_plane(source, destination, plane)
+                write_times.append(time.perf_counter() - began)
+        return time.perf_counter() - start, write_times, store.routes
+
+    print(f'{num_operations} operations, {write_fraction:.0%} writes')
+    baseline, in_place_writes, expected = run_in_place()
+    seconds, store_writes, actual = run_store()
+    assert actual == expected
+    report('in place, index rebuilt', baseline)
+    report('RouteStore, index updated', seconds, baseline)
+    for name, times in [('in place', in_place_writes),
+                        ('RouteStore', store_writes)]:
+        print(f'{name} write latency: p50 '
+              f'{percentile(times, 0.5) * 1e6:.1f} us, p99 '
+              f'{percentile(times, 0.99) * 1e6:.1f} us')
+
+
+def benchmark_instrumentation(num_sources: int = 2000) -> None:
+    """Report the cost of instrumentation on find_reachable_destinations
+    with n=2 from num_sources airports of OpenFlights-sized synthetic routes:
+    the function without its wrapper, with instrumentation disabled, and
+    with instrumentation enabled.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    sources = random.Random(0).sample(list(routes), num_sources)
+    unwrapped = flight_functions.find_reachable_destinations.__wrapped__
+
+    def run(function: Callable) -> None:
+        for source in sources:
+            function(routes, source, 2)
+
+    was_enabled = flight_instrumentation.ENABLED
+    try:
+        flight_instrumentation.disable()
+        baseline = time_call(run, unwrapped)
+        report('not instrumented', baseline)
+        report('instrumentation disabled',
+               time_call(run, flight_functions.find_reachable_destinations),
+               baseline)
+        flight_instrumentation.enable()
+        report('instrumentation enabled',
+               time_call(run, flight_functions.find_reachable_destinations),
+               baseline)
+    finally:
+        if not was_enabled:
+            flight_instrumentation.disable()
+
+
+def measure_in_subprocess(script: str, setup: str = '',
+                          peak: bool = True) -> tuple[float, int]:
+    """Return the seconds taken by script, and the growth in resident memory
+    in bytes of a new Python process while running it: of its peak resident
+    memory if peak is True, and otherwise of the memory still resident when
+    script finishes.  script may use flight_reader, which is imported before
+    timing starts, and anything set up by setup, which is run before
+    measuring starts.
+    """
+    if peak:
+        # Linux reports ru_maxrss in KiB
+        rss = 'resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024'
+    else:
+        rss = ('int(open("/proc/self/statm").read().split()[1]) * '
+               'resource.getpagesize()')
+    program = (
+        'import resource, sys, time\n'
+        'import flight_reader\n'
+        f'{setup}\n'
+        f'before = {rss}\n'
+        'start = time.perf_counter()\n'
+        f'{script}\n'
+        'seconds = time.perf_counter() - start\n'
+        f'after = {rss}\n'
+        'print(seconds, after - before)\n')
+    output = subprocess.run([sys.executable, '-c', program], check=True,
+                            capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    seconds, growth = output.stdout.split()
+    return float(seconds), int(growth)
+
+
+def benchmark_lazy_airports(num_airports: int = 100000) -> None:
+    """Compare the load time and resident memory growth of read_airports and
+    read_airports_lazy on a synthetic airports file with num_airports lines,
+    when only the IATA codes are used, and when every airport is looked up.
+    Each load runs in a new process so that memory is measured from scratch.
+    """
+    path = create_temporary_file(
+        lambda airports_file: flight_synthetic_data.write_synthetic_airports(
+            airports_file, num_airports))
+    open_file = f'airports_file = open({path!r}, encoding="utf8")'
+    touch_keys = 'codes = [code for code in airports if code in airports]'
+    touch_all = 'details = [airports[code]["Tz"] for code in airports]'
+    try:
+        baseline = None
+        for name, reader in [('read_airports', 'read_airports'),
+                             ('read_airports_lazy', 'read_airports_lazy')]:
+            for use, touch in [('keys only', touch_keys),
+                               ('every airport', touch_all)]:
+                seconds, rss = measure_in_subprocess(
+                    f'{open_file}\n'
+                    f'airports = flight_reader.{reader}(airports_file)\n'
+                    f'{touch}')
+                report(f'{name}, {use}, +{rss / 2 ** 20:.0f} MiB RSS',
+                       seconds, baseline)
+                if baseline is None:
+                    baseline = seconds
+    finally:
+        os.remove(path)
+
+
+def benchmark_min_hops(num_queries: int = 200,
+                       hub_exponent: float = 1.2) -> None:
+    """Compare finding the fewest hops between num_queries random pairs of
+    airports by calling find_reachable_destinations with n = 1, 2, ...
+    until the destination is reached, with a bidirectional search, on
+    OpenFlights-sized synthetic routes with busy hubs.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes(
+        hub_exponent=hub_exponent)
+    rng = random.Random(0)
+    sources = list(routes)
+    pairs = [tuple(rng.sample(sources, 2)) for _ in range(num_queries)]
+
+    def increasing_n() -> tuple[list[int | None], int]:
+        # Each call expands the airports that are sources and fewer than n
+        # hops away, which are the sources the previous call reached
+        hops = []
+        expanded = 0
+        for source, destination in pairs:
+            n = 1
+            previous = [source]
+            reachable = flight_functions.find_reachable_destinations(
+                routes, source, n)
+            expanded += 1
+            while destination not in reachable and \
+                    len(reachable) > len(previous):
+                n += 1
+                expanded += sum(code in routes for code in reachable)
+                previous = reachable
+                reachable = flight_functions.find_reachable_destinations(
+                    routes, source, n)
+            hops.append(n if destination in reachable else None)
+        return hops, expanded
+
+    def bidirectional(router: flight_routing.MinHopRouter) -> \
+            tuple[list[int | None], int]:
+        hops = []
+        expanded = 0
+        for source, destination in pairs:
+            path, count = router.search(source, destination)
+            hops.append(None if path is None else path.hops)
+            expanded += count
+        return hops, expanded
+
+    start = time.perf_counter()
+    baseline_hops, baseline_expanded = increasing_n()
+    baseline = time.perf_counter() - start
+    report(f'increasing n, {baseline_expanded // num_queries} expanded '
+           f'per query', baseline)
+
+    router = flight_routing.MinHopRouter(routes)
+    report('building the reverse routes',
+           time_call(flight_routing.MinHopRouter, routes))
+    start = time.perf_counter()
+    hops, expanded = bidirectional(router)
+    report(f'bidirectional, {expanded // num_queries} expanded per query',
+           time.perf_counter() - start, baseline)
+    assert hops == baseline_hops
+
+
+def benchmark_distances(num_matrix_airports: int = 2000) -> None:
+    """Compare measuring every route of a geographic synthetic network of
+    OpenFlights size one pair at a time with haversine_km, as pricing code
+    does today, with RouteDistances, and compare a per-pair loop with
+    iter_distance_blocks over the distance matrix of num_matrix_airports
+    airports, including the peak memory of each.
+    """
+    airports, routes = flight_synthetic_data.create_synthetic_network()
+    graph = flight_graph.CompiledGraph(routes)
+
+    def per_route() -> list[float]:
+        distances = []
+        for source, destinations in routes.items():
+            for destination in destinations:
+                distances.append(flight_spatial.haversine_km(
+                    float(airports[source]['Latitude']),
+                    float(airports[source]['Longitude']),
+                    float(airports[destination]['Latitude']),
+                    float(airports[destination]['Longitude'])))
+        return distances
+
+    num_routes = graph.num_routes()
+    baseline = time_call(per_route)
+    report(f'haversine_km per route x{num_routes}', baseline)
+    seconds = time_call(flight_distances.RouteDistances, graph, airports)
+    report(f'RouteDistances x{num_routes}, {num_routes / seconds / 1e6:.1f} '
+           f'M/s', seconds, baseline)
+
+    codes = list(airports)[:num_matrix_airports]
+    coordinates = [(float(airports[code]['Latitude']),
+                    float(airports[code]['Longitude'])) for code in codes]
+
+    def per_pair_matrix() -> list[list[float]]:
+        return [[flight_spatial.haversine_km(*a, *b) for b in coordinates]
+                for a in coordinates]
+
+    def blockwise_total() -> float:
+        total = 0.0
+        for _, _, block in flight_distances.iter_distance_blocks(airports,
+                                                                 codes):
+            total += sum(sum(row) for row in block)
+        return total
+
+    num_pairs = len(codes) ** 2
+    baseline = time_call(per_pair_matrix, repeat=1)
+    report(f'per-pair matrix x{num_pairs}, '
+           f'{measure_peak_memory(per_pair_matrix) / 2 ** 20:.0f} MiB peak',
+           baseline)
+    report(f'blockwise matrix x{num_pairs}, '
+           f'{measure_peak_memory(blockwise_total) / 2 ** 20:.1f} MiB peak',
+           time_call(blockwise_total, repeat=1), baseline)
+
+
+def benchmark_analytics(num_planes: int = 10, num_sources: int = 100) -> None:
+    """Time the connectivity analytics on OpenFlights-sized synthetic
+    routes.  Compare finding the strongly connected components with a BFS
+    from each airport, extrapolated from num_sources of them, and compare
+    the impact of decommissioning num_planes airplanes with copying the
+    routes, decommissioning the plane and analysing the copy again.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    analytics = flight_analytics.NetworkAnalytics(routes)
+    graph = analytics.graph
+
+    sources = list(routes)[:num_sources]
+    baseline = time_call(lambda: [
+        flight_functions.find_reachable_destinations(routes, source,
+                                                     len(graph.codes))
+        for source in sources], repeat=1) * len(graph.codes) / len(sources)
+    report('BFS from every airport (extrapolated)', baseline)
+    report(f'Tarjan, {analytics.num_components} components',
+           time_call(flight_analytics.find_components, graph), baseline)
+    report(f'articulation airports, '
+           f'{len(flight_analytics.find_articulation_ids(graph))} found',
+           time_call(flight_analytics.find_articulation_ids, graph))
+    report('NetworkAnalytics, everything',
+           time_call(flight_analytics.NetworkAnalytics, routes))
+
+    planes = flight_synthetic_data.DEFAULT_AIRCRAFT[:num_planes]
+
+    def copy_and_rescan() -> None:
+        for plane in planes:
+            changed = copy.deepcopy(routes)
+            for source, destination in flight_functions.decomission_plane(
+                    changed, plane):
+                del changed[source][destination]
+            flight_analytics.find_components(
+                flight_graph.CompiledGraph(changed))
+
+    baseline = time_call(copy_and_rescan, repeat=1)
+    report(f'copy and rescan x{num_planes}', baseline)
+    report(f'decommission_impact x{num_planes}',
+           time_call(lambda: [analytics.decommission_impact(plane)
+                              for plane in planes]), baseline)
+
+
+def benchmark_shared_aircraft(scale: int = 1) -> None:
+    """Compare the load time and the resident memory held by read_routes on
+    a synthetic routes file scale times the size of OpenFlights, giving each
+    route its own list of airplanes, and with share_aircraft=True, sharing
+    one list for each combination of airplanes.  Each load runs in a new
+    process.
+    """
+    num_airports = flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS * scale
+    routes = flight_synthetic_data.create_synthetic_routes(
+        num_airports, flight_synthetic_data.OPENFLIGHTS_NUM_ROUTES * scale)
+    path = create_temporary_file(
+        lambda routes_file: flight_synthetic_data.write_routes(routes_file,
+                                                               routes))
+    setup = ('import flight_synthetic_data\n'
+             'airports = set(flight_synthetic_data.create_synthetic_codes('
+             f'{num_airports}))')
+    read = (f'routes_file = open({path!r}, encoding="utf8")\n'
+            'routes = flight_reader.read_routes(routes_file, airports, '
+            '{share})')
+    try:
+        baseline = None
+        for name, share in [('a list per route', False),
+                            ('shared lists', True)]:
+            seconds, rss = measure_in_subprocess(read.format(share=share),
+                                                 setup, peak=False)
+            report(f'read_routes, {name}, +{rss / 2 ** 20:.1f} MiB RSS',
+                   seconds, baseline)
+            if baseline is None:
+                baseline = seconds
+        with open(path, encoding='utf8') as routes_file:
+            shared = flight_reader.read_routes(
+                routes_file, dict.fromkeys(
+                    flight_synthetic_data.create_synthetic_codes(
+                        num_airports)), share_aircraft=True)
+        print(f'{sum(map(len, shared.values()))} routes share '
+              f'{flight_shared_aircraft.count_shared()} lists')
+    finally:
+        os.remove(path)
+
+
+def benchmark_schedule(num_connections: int = 100000,
+                       num_queries: int = 1000,
+                       num_profiles: int = 50) -> None:
+    """Time reading a synthetic day of num_connections departures of
+    OpenFlights-sized synthetic routes, num_queries earliest arrival queries
+    between random airports at random times, and num_profiles profile
+    queries, compared with asking for the earliest arrival after every
+    departure from the source.
+    """
+    airports_file = StringIO()
+    flight_synthetic_data.write_synthetic_airports(
+        airports_file, flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS)
+    airports_file.seek(0)
+    airports = flight_reader.read_airports(airports_file)
+    routes = flight_synthetic_data.create_synthetic_routes()
+    schedule_file = StringIO()
+    flight_synthetic_data.write_synthetic_schedule(schedule_file, routes,
+                                                   num_connections)
+    day = datetime.date(2024, 6, 3)
+
+    def read() -> flight_schedule.Schedule:
+        schedule_file.seek(0)
+        return flight_schedule.read_schedule(schedule_file, airports, day,
+                                             routes)
+
+    schedule = read()
+    report(f'read_schedule, {len(schedule)} connections', time_call(read))
+
+    rng = random.Random(0)
+    sources = schedule.codes
+    queries = [(*rng.sample(sources, 2), rng.randrange(-12 * 60, 24 * 60))
+               for _ in range(num_queries)]
+    latencies = []
+    reached = 0
+    for source, destination, departure in queries:
+        start = time.perf_counter()
+        arrival = schedule.find_earliest_arrival(source, destination,
+                                                 departure)
+        latencies.append(time.perf_counter() - start)
+        reached += arrival is not None
+    latencies.sort()
+    report(f'earliest arrival, mean of {num_queries}',
+           sum(latencies) / num_queries)
+    report('earliest arrival, median', latencies[num_queries // 2])
+    report('earliest arrival, 99th percentile',
+           latencies[num_queries * 99 // 100])
+    print(f'{reached} of {num_queries} destinations reached')
+
+    pairs = [tuple(rng.sample(sources, 2)) for _ in range(num_profiles)]
+
+    def each_departure() -> list[list[tuple[int, int]]]:
+        # The earliest arrival after every departure from the source, less
+        # those that a later departure arrives as early as
+        profiles = []
+        for source, destination in pairs:
+            source_id = schedule.ids[source]
+            leaving = sorted({departure for departure, origin in
+                              zip(schedule.departures, schedule.sources)
+                              if origin == source_id}, reverse=True)
+            profile = []
+            for departure in leaving:
+                arrival = schedule.find_earliest_arrival(source, destination,
+                                                         departure)
+                if arrival is not None and \
+                        (not profile or arrival < profile[-1][1]):
+                    profile.append((departure, arrival))
+            profiles.append(profile[::-1])
+        return profiles
+
+    def one_pass() -> list[list[tuple[int, int]]]:
+        return [schedule.find_profile(source, destination)
+                for source, destination in pairs]
+
+    start = time.perf_counter()
+    expected = each_departure()
+    baseline = time.perf_counter() - start
+    report(f'profile, earliest arrival per departure, mean of '
+           f'{num_profiles}', baseline / num_profiles)
+    start = time.perf_counter()
+    profiles = one_pass()
+    report(f'profile, one pass, mean of {num_profiles}',
+           (time.perf_counter() - start) / num_profiles,
+           baseline / num_profiles)
+    assert profiles == expected
+    print(f'{sum(map(len, profiles))} departures on the profiles')
+
+
+def benchmark_inbound(num_queries: int = 5, num_changes: int = 1000) -> None:
+    """Compare finding the airports that can reach num_queries random
+    destinations in at most n flights by searching forwards from every
+    source, with an InboundIndex, on OpenFlights-sized synthetic routes.
+    Also time keeping the index in sync with num_changes changes made
+    through its RouteStore.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    rng = random.Random(0)
+    destinations = rng.sample(list(routes), num_queries)
+
+    def scan_every_source(n: int) -> list[list[str]]:
+        results = []
+        for destination in destinations:
+            origins = {destination}
+            for source in routes:
+                if destination in flight_functions.find_reachable_destinations(
+                        routes, source, n):
+                    origins.add(source)
+            results.append(sorted(origins))
+        return results
+
+    store = flight_route_store.RouteStore(routes)
+    report('building the inbound index',
+           time_call(flight_inbound.InboundIndex, store))
+    index = flight_inbound.InboundIndex(store)
+    for n in (1, 2):
+        start = time.perf_counter()
+        expected = scan_every_source(n)
+        baseline = time.perf_counter() - start
+        report(f'scan every source, n={n}, per query',
+               baseline / num_queries)
+        start = time.perf_counter()
+        results = [index.find_origins(destination, n)
+                   for destination in destinations]
+        report(f'find_origins, n={n}, per query',
+               (time.perf_counter() - start) / num_queries,
+               baseline / num_queries)
+        assert results == expected
+
+    codes = list(routes)
+    changes = [tuple(rng.sample(codes, 2)) for _ in range(num_changes)]
+    start = time.perf_counter()
+    for i, (source, destination) in enumerate(changes):
+        if i % 2:
+            store.remove_route(source, destination)
+        else:
+            store.add_route(source, destination)
+        index.find_origins(destination, 1)
+    report(f'{num_changes} changes, each followed by a query',
+           time.perf_counter() - start)
+
+
+BENCHMARKS = {
+    'reachability': benchmark_reachability,
+    'compiled_graph': benchmark_compiled_graph,
+    'airport_reader': benchmark_airport_reader,
+    'snapshot_cache': benchmark_snapshot_cache,
+    'reachability_index': benchmark_reachability_index,
+    'decommission': benchmark_decommission,
+    'sequence_batch': benchmark_sequence_batch,
+    'airport_table': benchmark_airport_table,
+    'spatial_index': benchmark_spatial_index,
+    'routing': benchmark_routing,
+    'route_parser': benchmark_route_parser,
+    'parallel_routes': benchmark_parallel_routes,
+    'parallel_reachability': benchmark_parallel_reachability,
+    'closure': benchmark_closure,
+    'route_store': benchmark_route_store,
+    'instrumentation': benchmark_instrumentation,
+    'lazy_airports': benchmark_lazy_airports,
+    'min_hops': benchmark_min_hops,
+    'distances': benchmark_distances,
+    'analytics': benchmark_analytics,
+    'shared_aircraft': benchmark_shared_aircraft,
+    'schedule': benchmark_schedule,
+    'inbound': benchmark_inbound,
+}
+
+
+if __name__ == '__main__':
+    # Run the benchmarks named on the command line, or all of them
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for benchmark_name in names:
+        print(f'== {benchmark_name} ==')
+        BENCHMARKS[benchmark_name]()
@@ -0,0 +1,454 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import NamedTuple
+
+from flight_constants import AirportDict, RouteDict
+from flight_reader import read_airports, read_routes
+import flight_shared_aircraft
+
+import flight_instrumentation
+
+
+################################################################################
+# A snapshot file stores a parsed AirportDict and RouteDict so that they can be
+# loaded without parsing the source files again.  It starts with a header:
+#
+#     magic, format version, number of strings, airports, sources, routes and
+#     airplanes, then the size, modification time and SHA-256 hash of the
+#     airports file and of the routes file that the snapshot was built from
+#
+# followed by these sections, each starting on a multiple of 8 bytes:
+#
+#     string offsets      uint32[num_strings + 1]
+#     string data         the UTF-8 bytes of every string, back to back
+#     airport fields      uint32[num_airports * 5]: the string ids of the
+#                         IATA code, name, city, country and timezone
+#     latitudes           float64[num_airports]
+#     longitudes          float64[num_airports]
+#     route sources       uint32[num_sources]: string ids of source airports
+#     route offsets       uint32[num_sources + 1]
+#     route destinations  uint32[num_routes]: string ids
+#     airplane offsets    uint32[num_routes + 1]
+#     airplanes           uint32[num_airplanes]: string ids
+#
+# Every string (airport code, name, airplane code, ...) is stored once in the
+# string table and referred to by its position in it.  Numbers are stored in
+# the byte order of the machine that wrote the file, which is part of the
+# magic, so the sections can be used directly from a memory-mapped file.
+################################################################################
+SNAPSHOT_MAGIC = b'FLTSNAP' + (b'<' if sys.byteorder == 'little' else b'>')
+SNAPSHOT_VERSION = 1
+
+_SOURCE_KEY_FORMAT = 'Qq32s'
+_HEADER = struct.Struct('=8s6I' + _SOURCE_KEY_FORMAT * 2)
+_NUM_AIRPORT_FIELDS = 5
+_ALIGNMENT = 8
+
+
+class SourceKey(NamedTuple):
+    """What a snapshot records about each source file it was built from."""
+    size: int
+    mtime_ns: int
+    sha256: bytes
+
+
+def get_source_key(path: str) -> SourceKey:
+    """Return the size, modification time and SHA-256 hash of the file at
+    path.
+    """
+    status = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source_file:
+        for block in iter(lambda: source_file.read(1 << 20), b''):
+            digest.update(block)
+    return SourceKey(status.st_size, status.st_mtime_ns, digest.digest())
+
+
+def is_same_source(key: SourceKey, path: str) -> bool:
+    """Return True if the file at path still has the contents described by
+    key.  The file is only hashed when its size is unchanged but its
+    modification time is not.
+    """
+    status = os.stat(path)
+    if status.st_size != key.size:
+        return False
+    if status.st_mtime_ns == key.mtime_ns:
+        return True
+    return get_source_key(path).sha256 == key.sha256
+
+
+################################################################################
+# Writing snapshots
+################################################################################
+
+def _padding(length: int) -> bytes:
+    """Return the zero bytes needed after length bytes to reach a multiple of
+    _ALIGNMENT bytes.
+    """
+    return bytes(-length % _ALIGNMENT)
+
+
+def write_snapshot(path: str, airports: AirportDict, routes: RouteDict,
+                   source_keys: tuple[SourceKey, SourceKey]) -> None:
+    """Write airports and routes to a new snapshot file at path, recording
+    source_keys as the keys of the airports file and the routes file they
+    were read from.
+
+    The snapshot is written to a temporary file first and then renamed, so a
+    reader never sees a partly written snapshot.  The temporary file is
+    removed if either step fails.
+    """
+    string_ids = {}
+    strings = []
+
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value.encode('utf8'))
+        return string_ids[value]
+
+    airport_fields = array('I')
+    latitudes = array('d')
+    longitudes = array('d')
+    for code, details in airports.items():
+        airport_fields.extend([intern(code), intern(details['Name']),
+                               intern(details['City']),
+                               intern(details['Country']),
+                               intern(details['Tz'])])
+        latitudes.append(float(details['Latitude']))
+        longitudes.append(float(details['Longitude']))
+
+    route_sources = array('I')
+    route_offsets = array('I', [0])
+    route_destinations = array('I')
+    airplane_offsets = array('I', [0])
+    airplanes = array('I')
+    for source, destinations in routes.items():
+        route_sources.append(intern(source))
+        for destination, destination_airplanes in destinations.items():
+            route_destinations.append(intern(destination))
+            airplanes.extend(intern(airplane)
+                             for airplane in destination_airplanes)
+            airplane_offsets.append(len(airplanes))
+        route_offsets.append(len(route_destinations))
+
+    string_offsets = array('I', [0])
+    for encoded in strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(strings),
+                          len(latitudes), len(route_sources),
+                          len(route_destinations), len(airplanes),
+                          *source_keys[0], *source_keys[1])
+    sections = [string_offsets.tobytes(), b''.join(strings),
+                airport_fields.tobytes(), latitudes.tobytes(),
+                longitudes.tobytes(), route_sources.tobytes(),
+                route_offsets.tobytes(), route_destinations.tobytes(),
+                airplane_offsets.tobytes(), airplanes.tobytes()]
+
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, 'wb') as snapshot_file:
+            snapshot_file.write(header + _padding(len(header)))
+            for section in sections:
+                snapshot_file.write(section + _padding(len(section)))
+        os.replace(temporary_path, path)
+    finally:
+        # Nothing is left behind if writing or renaming failed
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+################################################################################
+# Reading snapshots
+################################################################################
+
+class Snapshot:
+    """A snapshot file opened with mmap.  The sections are read directly from
+    the mapped file, and strings are only decoded when airports or routes are
+    built.
+
+    Instance Attributes:
+        - source_keys: the keys of the airports and routes files the snapshot
+          was built from
+        - num_airports: the number of airports in the snapshot
+        - num_routes: the number of source-destination routes in the snapshot
+    """
+    source_keys: tuple[SourceKey, SourceKey]
+    num_airports: int
+    num_routes: int
+    _file: mmap.mmap
+    _sections: list[memoryview]
+    _strings: list[str] | None
+
+    def __init__(self, path: str) -> None:
+        """Open the snapshot file at path.
+
+        Raise ValueError if the file is not a snapshot written by this
+        version of the module on a machine with the same byte order.
+        """
+        with open(path, 'rb') as snapshot_file:
+            self._file = mmap.mmap(snapshot_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        if len(self._file) < _HEADER.size:
+            self.close()
+            raise ValueError(f'{path} is not a flight snapshot')
+
+        fields = _HEADER.unpack_from(self._file)
+        magic, version, num_strings, num_airports, num_sources, num_routes, \
+            num_airplanes = fields[:7]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a flight snapshot')
+        self.source_keys = (SourceKey(*fields[7:10]), SourceKey(*fields[10:]))
+        self.num_airports = num_airports
+        self.num_routes = num_routes
+        self._strings = None
+
+        # The element type code and byte length of each section.  The length
+        # of the string data is the last string offset.
+        start = _HEADER.size + len(_padding(_HEADER.size))
+        last_offset = start + 4 * num_strings
+        if len(self._file) < last_offset + 4:
+            self.close()
+            raise ValueError(f'{path} is truncated')
+        string_data_length = struct.unpack_from('=I', self._file,
+                                                last_offset)[0]
+        layout = [('I', 4 * (num_strings + 1)),
+                  ('B', string_data_length),
+                  ('I', 4 * num_airports * _NUM_AIRPORT_FIELDS),
+                  ('d', 8 * num_airports),
+                  ('d', 8 * num_airports),
+                  ('I', 4 * num_sources),
+                  ('I', 4 * (num_sources + 1)),
+                  ('I', 4 * num_routes),
+                  ('I', 4 * (num_routes + 1)),
+                  ('I', 4 * num_airplanes)]
+        end = start + sum(length + len(_padding(length))
+                          for _, length in layout)
+        if len(self._file) < end:
+            self.close()
+            raise ValueError(f'{path} is truncated')
+
+        self._sections = []
+        with memoryview(self._file) as data:
+            for type_code, length in layout:
+                self._sections.append(data[start:start + length]
+                                      .cast(type_code))
+                start += length + len(_padding(length))
+
+    def close(self) -> None:
+        """Release the memory-mapped file."""
+        for section in getattr(self, '_sections', []):
+            section.release()
+        self._sections = []
+        self._file.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def strings(self) -> list[str]:
+        """Return every string in the string table, decoding them the first
+        time this method is called.
+        """
+        if self._strings is None:
+            offsets = self._sections[0].tolist()
+            raw = self._sections[1].tobytes()
+            self._strings = [raw[offsets[i]:offsets[i + 1]].decode('utf8')
+                             for i in range(len(offsets) - 1)]
+        return self._strings
+
+    def airports(self) -> AirportDict:
+        """Return the AirportDict stored in this snapshot."""
+        strings = self.strings()
+        fields = self._sections[2].tolist()
+        latitudes = self._sections[3].tolist()
+        longitudes = self._sections[4].tolist()
+        airports = {}
+        for i in range(self.num_airports):
+            start = i * _NUM_AIRPORT_FIELDS
+            code, name, city, country, timezone = \
+                fields[start:start + _NUM_AIRPORT_FIELDS]
+            airports[strings[code]] = {'Name': strings[name],
+                                       'City': strings[city],
+                                       'Country': strings[country],
+                                       'Latitude': latitudes[i],
+                                       'Longitude': longitudes[i],
+                                       'Tz': strings[timezone]}
+        return airports
+
+    def routes(self, share_aircraft: bool = False) -> RouteDict:
+        """Return the RouteDict stored in this snapshot, sharing the lists of
+        airplanes if share_aircraft is True, as read_routes does.
+        """
+        strings = self.strings()
+        sources, offsets, destinations, airplane_offsets, airplanes = \
+            [section.tolist() for section in self._sections[5:]]
+        make_list = flight_shared_aircraft.share_aircraft if share_aircraft \
+            else list
+        routes = {}
+        for i, source in enumerate(sources):
+            source_routes = {}
+            for route in range(offsets[i], offsets[i + 1]):
+                source_routes[strings[destinations[route]]] = \
+                    make_list([strings[airplane] for airplane in
+                               airplanes[airplane_offsets[route]:
+                                         airplane_offsets[route + 1]]])
+            routes[strings[source]] = source_routes
+        return routes
+
+
+################################################################################
+# The cache
+################################################################################
+
+class FlightDataCache:
+    """The airports and routes read from an airports file and a routes file,
+    kept in a snapshot file next to them.
+
+    Nothing is read until airports or routes is first used.  Then the
+    snapshot is loaded if it was built from the current contents of both
+    source files; otherwise the source files are parsed and the snapshot is
+    rebuilt.
+
+    Instance Attributes:
+        - airports_path: the path of the airports file
+        - routes_path: the path of the routes file
+        - cache_path: the path of the snapshot file
+        - loaded_from_snapshot: whether the data was last loaded from the
+          snapshot rather than parsed
+        - share_aircraft: whether routes with the same airplanes share one
+          list, as read_routes does with share_aircraft=True
+    """
+    airports_path: str
+    routes_path: str
+    cache_path: str
+    loaded_from_snapshot: bool
+    share_aircraft: bool
+    _airports: AirportDict | None
+    _routes: RouteDict | None
+
+    def __init__(self, airports_path: str, routes_path: str,
+                 cache_path: str | None = None,
+                 share_aircraft: bool = False) -> None:
+        """Initialize a new cache for the data in airports_path and
+        routes_path.  The snapshot is kept in cache_path, or next to the
+        routes file if cache_path is None.
+        """
+        self.airports_path = airports_path
+        self.routes_path = routes_path
+        if cache_path is None:
+            cache_path = routes_path + '.snapshot'
+        self.cache_path = cache_path
+        self.loaded_from_snapshot = False
+        self.share_aircraft = share_aircraft
+        self._airports = None
+        self._routes = None
+
+    @property
+    def airports(self) -> AirportDict:
+        """The airports in the airports file."""
+        if self._airports is None:
+            self._load()
+        return self._airports
+
+    @property
+    def routes(self) -> RouteDict:
+        """The routes in the routes file."""
+        if self._routes is None:
+            self._load()
+        return self._routes
+
+    def is_snapshot_current(self) -> bool:
+        """Return True if the snapshot exists and was built from the current
+        contents of the airports and routes files.
+        """
+        try:
+            with Snapshot(self.cache_path) as snapshot:
+                airports_key, routes_key = snapshot.source_keys
+            return is_same_source(airports_key, self.airports_path) and \
+                is_same_source(routes_key, self.routes_path)
+        except (OSError, ValueError):
+            return False
+
+    def refresh(self) -> None:
+        """Forget the loaded data if either source file has changed since it
+        was loaded, so that it is loaded again on next use.
+        """
+        if not self.is_snapshot_current():
+            self._airports = None
+            self._routes = None
+
+    def _load(self) -> None:
+        """Load the airports and routes from the snapshot, or parse the
+        source files and rebuild the snapshot if it is missing or out of date.
+        """
+        if self.is_snapshot_current():
+            with Snapshot(self.cache_path) as snapshot:
+                self._airports = snapshot.airports()
+                self._routes = snapshot.routes(self.share_aircraft)
+            self.loaded_from_snapshot = True
+            if flight_instrumentation.ENABLED:
+                flight_instrumentation.count('flight_cache.snapshot_hits')
+            return
+
+        # Key the sources before parsing them, so that a change made while
+        # they are parsed makes the new snapshot out of date
+        source_keys = (get_source_key(self.airports_path),
+                       get_source_key(self.routes_path))
+        with open(self.airports_path, encoding='utf8') as airports_file:
+            self._airports = read_airports(airports_file)
+        with open(self.routes_path, encoding='utf8') as routes_file:
+            self._routes = read_routes(routes_file, self._airports,
+                                       self.share_aircraft)
+        # The snapshot only saves parsing next time, so the parsed data is
+        # still returned if it cannot be written, such as to a read-only
+        # directory or a full disk
+        try:
+            write_snapshot(self.cache_path, self._airports, self._routes,
+                           source_keys)
+        except OSError:
+            if flight_instrumentation.ENABLED:
+                flight_instrumentation.count('flight_cache.write_failures')
+        self.loaded_from_snapshot = False
+        if flight_instrumentation.ENABLED:
+            flight_instrumentation.count('flight_cache.snapshot_misses')
+
+
+def load_flight_data(airports_path: str, routes_path: str,
+                     cache_path: str | None = None,
+                     share_aircraft: bool = False) -> \
+        tuple[AirportDict, RouteDict]:
+    """Return the airports and routes read from airports_path and
+    routes_path, using the snapshot in cache_path when it is current.  See
+    FlightDataCache for where the snapshot is kept when cache_path is None,
+    and read_routes for share_aircraft.
+    """
+    cache = FlightDataCache(airports_path, routes_path, cache_path,
+                            share_aircraft)
+    return cache.airports, cache.routes
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
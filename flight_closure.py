@@ -0,0 +1,121 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from flight_graph import CompiledGraph
+
+import flight_example_data
+
+
+################################################################################
+# A ReachabilityClosure holds, for every airport of a CompiledGraph, the set of
+# airports reachable from it in at most n flights, as a bitset: a Python int
+# whose bit i is set if the airport with id i is reachable.
+#
+# The sets are found for every source together.  Within 0 flights each
+# airport reaches only itself, and within k flights it reaches itself and
+# everything its destinations reach within k - 1 flights, so each step ORs
+# the bitsets of the destinations.  Once a step changes nothing, further
+# steps would not either, and the closure stops early.
+################################################################################
+
+class ReachabilityClosure:
+    """The airports reachable within a hop limit from every airport.
+
+    Instance Attributes:
+        - graph: the routes the closure was computed for
+        - n: the largest number of direct flights taken
+        - bitsets: the bitset of the airports reachable from each airport id
+        - steps: the number of OR steps taken, at most n
+    """
+    graph: CompiledGraph
+    n: int
+    bitsets: list[int]
+    steps: int
+
+    def __init__(self, graph: CompiledGraph, n: int) -> None:
+        """Initialize the closure of graph for at most n direct flights.
+
+        Preconditions:
+            - n >= 0
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> closure = ReachabilityClosure(graph, 6)
+        >>> bin(closure.bitsets[graph.ids['GFN']])
+        '0b11001'
+        >>> closure.steps
+        2
+        """
+        self.graph = graph
+        self.n = n
+        offsets = graph.offsets
+        targets = graph.targets
+        bitsets = [1 << i for i in range(len(graph))]
+
+        self.steps = 0
+        while self.steps < n:
+            changed = False
+            next_bitsets = []
+            for i, bitset in enumerate(bitsets):
+                reach = bitset
+                for j in targets[offsets[i]:offsets[i + 1]]:
+                    reach |= bitsets[j]
+                if reach != bitset:
+                    changed = True
+                next_bitsets.append(reach)
+            if not changed:
+                break
+            bitsets = next_bitsets
+            self.steps += 1
+        self.bitsets = bitsets
+
+    def count_reachable(self, source: str) -> int:
+        """Return the number of airports reachable from source by taking at
+        most n direct flights, counting source itself.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> ReachabilityClosure(graph, 1).count_reachable('GFN')
+        2
+        """
+        if source not in self.graph.ids:
+            return 1
+        return self.bitsets[self.graph.ids[source]].bit_count()
+
+    def find_reachable_destinations(self, source: str) -> list[str]:
+        """Return the list of IATA airport codes that are reachable from
+        source by taking at most n direct flights, in lexicographical order,
+        like flight_functions.find_reachable_destinations(routes, source, n).
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> ReachabilityClosure(graph, 2).find_reachable_destinations('GFN')
+        ['GFN', 'SYD', 'TRO']
+        >>> ReachabilityClosure(graph, 2).find_reachable_destinations('XYZ')
+        ['XYZ']
+        """
+        if source not in self.graph.ids:
+            return [source]
+
+        # Read the set bits from the binary digits, lowest bit first.  Ids
+        # are in lexicographical order, so the codes come out sorted.
+        codes = self.graph.codes
+        digits = bin(self.bitsets[self.graph.ids[source]])[:1:-1]
+        found = []
+        i = digits.find('1')
+        while i != -1:
+            found.append(codes[i])
+            i = digits.find('1', i + 1)
+        return found
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -11,6 +11,8 @@ this code, whether as given or with any changes, are expressly prohibited.
 All of the files in this directory and all subdirectories are:
 Copyright (c) 2024 The CSC108 Team
 """
+from typing import NamedTuple
+
 
 ################################################################################
 # Constants
@@ -24,6 +26,23 @@ OPENFLIGHTS_NULL_VALUE = '\\N'
 ################################################################################
 AirportDict = dict[str, dict[str, str]]
 
+
+################################################################################
+# An Airport is one row of the airport data, with the same information as an
+# entry of an AirportDict.  Streaming readers produce Airports rather than
+# dictionaries because a tuple is much smaller than a dictionary.
+################################################################################
+class Airport(NamedTuple):
+    """The information about one airport in the airport data."""
+    iata: str
+    name: str
+    city: str
+    country: str
+    latitude: float
+    longitude: float
+    tz: str
+
+
 ################################################################################
 # A RouteDict is a dictionary that maps IATA airport codes to dictionaries of
 # reachable destinations. Each reachable destination in the dictionary is an
@@ -31,3 +50,32 @@ AirportDict = dict[str, dict[str, str]]
 # flight.
 ################################################################################
 RouteDict = dict[str, dict[str, list[str]]]
+
+
+################################################################################
+# A RouteChange is one change made to a RouteDict through a RouteStore.  The
+# kind of change is one of the constants below, and planes holds the airplanes
+# that were added to or removed from the route.
+################################################################################
+ADD_ROUTE = 'add_route'
+REMOVE_ROUTE = 'remove_route'
+ADD_PLANE = 'add_plane'
+REMOVE_PLANE = 'remove_plane'
+
+# The routes were changed without going through the RouteStore, so anything
+# derived from them has to be rebuilt
+RESET = 'reset'
+
+# Only the airplanes of routes were changed without going through the
+# RouteStore, such as by decomission_plane, so anything derived from the
+# routes alone, and not from their airplanes, is still up to date
+RESET_PLANES = 'reset_planes'
+
+
+class RouteChange(NamedTuple):
+    """One change made to a RouteDict, and the version it produced."""
+    version: int
+    kind: str
+    source: str
+    destination: str
+    planes: tuple[str, ...]
@@ -0,0 +1,207 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import math
+from array import array
+from itertools import repeat
+from typing import Iterable, Iterator
+
+from flight_constants import AirportDict
+from flight_graph import CompiledGraph
+from flight_spatial import EARTH_RADIUS_KM, to_unit_vector
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The largest number of rows and of columns in each block of a distance
+# matrix, so a block holds at most DEFAULT_BLOCK_SIZE ** 2 distances
+DEFAULT_BLOCK_SIZE = 256
+
+
+################################################################################
+# Great-circle distances computed in bulk.  The coordinates of every airport
+# are converted once into a unit vector from the centre of the Earth, so the
+# distance between two airports needs no trigonometry beyond one asin, and the
+# straight-line distances are measured in bulk by math.dist:
+#     distance = 2 * EARTH_RADIUS_KM * asin(chord / 2)
+# where chord is the straight-line distance between their unit vectors.
+################################################################################
+
+def get_unit_vectors(airports: AirportDict, codes: list[str]) -> \
+        list[tuple[float, float, float]]:
+    """Return the unit vectors of the airports with IATA codes codes, in the
+    same order.
+
+    Preconditions:
+        - every code in codes is in airports
+
+    >>> airports = flight_example_data.create_example_airports()
+    >>> [round(coordinate, 4)
+    ...  for coordinate in get_unit_vectors(airports, ['SYD'])[0]]
+    [-0.7268, 0.3999, -0.5584]
+    """
+    vectors = []
+    for code in codes:
+        details = airports[code]
+        vectors.append(to_unit_vector(float(details['Latitude']),
+                                      float(details['Longitude'])))
+    return vectors
+
+
+def chords_to_km(chords: Iterable[float]) -> list[float]:
+    """Return the great-circle distances in kilometres between the pairs of
+    points on the Earth whose unit vectors are chords apart.
+
+    >>> [round(distance) for distance in chords_to_km([0.0, 2.0])]
+    [0, 20015]
+    """
+    asin = math.asin
+    diameter = 2 * EARTH_RADIUS_KM
+
+    # Rounding can make the chord of opposite points slightly longer than 2
+    return [diameter * asin(min(1.0, chord / 2)) for chord in chords]
+
+
+class RouteDistances:
+    """The great-circle length of every route in a CompiledGraph.
+
+    Instance Attributes:
+        - graph: the routes that are measured
+        - distances: the length in kilometres of the route at each position
+          in graph.targets
+    """
+    graph: CompiledGraph
+    distances: array
+
+    def __init__(self, graph: CompiledGraph, airports: AirportDict) -> None:
+        """Initialize the lengths of the routes in graph, between the
+        airports in airports.
+
+        Preconditions:
+            - every airport in graph is in airports
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> airports = flight_example_data.create_example_airports()
+        >>> [round(distance) for distance in
+        ...  RouteDistances(graph, airports).distances]
+        [242, 145, 145, 242, 261]
+        """
+        self.graph = graph
+        vectors = get_unit_vectors(airports, graph.codes)
+        offsets = graph.offsets
+
+        # Line up the vector of the source and of the destination of every
+        # route, so all of the chords are measured in one call to map
+        sources = []
+        for source, vector in enumerate(vectors):
+            sources.extend(repeat(vector,
+                                  offsets[source + 1] - offsets[source]))
+        destinations = [vectors[target] for target in graph.targets]
+        self.distances = array('d', chords_to_km(
+            map(math.dist, sources, destinations)))
+
+    def get_distance(self, source: str, destination: str) -> float:
+        """Return the length in kilometres of the route from source to
+        destination, or -1.0 if there is no such route.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> airports = flight_example_data.create_example_airports()
+        >>> route_distances = RouteDistances(graph, airports)
+        >>> round(route_distances.get_distance('TRO', 'SYD'))
+        261
+        >>> route_distances.get_distance('SYD', 'TRO')
+        -1.0
+        """
+        position = self.graph.find_route(source, destination)
+        if position == -1:
+            return -1.0
+        return self.distances[position]
+
+    def get_path_distance(self, flight_sequence: list[str]) -> float:
+        """Return the total length in kilometres of the direct flights
+        between each adjacent pair of IATA codes in flight_sequence, or -1.0
+        if one of them is not a route.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> airports = flight_example_data.create_example_airports()
+        >>> route_distances = RouteDistances(graph, airports)
+        >>> round(route_distances.get_path_distance(['GFN', 'TRO', 'SYD']))
+        502
+        >>> route_distances.get_path_distance(['SYD', 'TRO'])
+        -1.0
+        """
+        total = 0.0
+        for i in range(len(flight_sequence) - 1):
+            distance = self.get_distance(flight_sequence[i],
+                                         flight_sequence[i + 1])
+            if distance == -1.0:
+                return -1.0
+            total += distance
+        return total
+
+
+def iter_distance_blocks(airports: AirportDict, rows: list[str],
+                         columns: list[str] | None = None,
+                         block_size: int = DEFAULT_BLOCK_SIZE) -> \
+        Iterator[tuple[int, int, list[array]]]:
+    """Yield the matrix of great-circle distances in kilometres from each
+    airport in rows to each airport in columns, or in rows if columns is
+    None, one block at a time.  Each block is (row_start, column_start,
+    block), where block[i][j] is the distance from rows[row_start + i] to
+    columns[column_start + j], and has at most block_size rows and columns.
+
+    Only one block is built at a time, so the matrix for any number of
+    airports can be scanned in bounded memory, as long as the caller does
+    not keep earlier blocks.
+
+    Preconditions:
+        - every code in rows and columns is in airports
+        - block_size >= 1
+
+    >>> airports = flight_example_data.create_example_airports()
+    >>> for row_start, column_start, block in iter_distance_blocks(
+    ...         airports, ['SYD', 'TRO', 'GFN'], block_size=2):
+    ...     print(row_start, column_start,
+    ...           [[round(distance) for distance in row] for row in block])
+    0 0 [[0, 261], [261, 0]]
+    0 2 [[497], [242]]
+    2 0 [[497, 242]]
+    2 2 [[0]]
+    """
+    if columns is None:
+        columns = rows
+    row_vectors = get_unit_vectors(airports, rows)
+    if columns is rows:
+        column_vectors = row_vectors
+    else:
+        column_vectors = get_unit_vectors(airports, columns)
+
+    for row_start in range(0, len(rows), block_size):
+        for column_start in range(0, len(columns), block_size):
+            block_vectors = column_vectors[column_start:
+                                           column_start + block_size]
+            block = [array('d', chords_to_km(map(
+                         math.dist, repeat(vector, len(block_vectors)),
+                         block_vectors)))
+                     for vector in row_vectors[row_start:
+                                               row_start + block_size]]
+            yield row_start, column_start, block
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
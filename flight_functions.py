@@ -11,9 +11,111 @@ this code, whether as given or with any changes, are expressly prohibited.
 All of the files in this directory and all subdirectories are:
 Copyright (c) 2024 The CSC108 Team
 """
+from collections import deque
+from weakref import WeakValueDictionary
+
 from flight_constants import AirportDict, RouteDict, OPENFLIGHTS_NULL_VALUE
+from flight_shared_aircraft import remove_plane_from_route
 
 import flight_example_data
+import flight_instrumentation
+
+
+################################################################################
+# Tracking changes to routes
+################################################################################
+
+class RoutesVersion:
+    """The number of times one RouteDict has been changed in place since a
+    structure derived from it began tracking it.
+
+    Instance Attributes:
+        - routes: the routes whose changes are counted
+        - version: the number of times routes has been changed by
+          mark_routes_changed
+        - structure_version: the number of those changes that may have
+          added or removed routes, rather than only changed their airplanes
+    """
+    __slots__ = ('routes', 'version', 'structure_version', '__weakref__')
+    routes: RouteDict
+    version: int
+    structure_version: int
+
+    def __init__(self, routes: RouteDict) -> None:
+        """Initialize a new count of the changes to routes."""
+        self.routes = routes
+        self.version = 0
+        self.structure_version = 0
+
+
+# Maps the id of each tracked RouteDict to its RoutesVersion.  Only the
+# structures derived from the routes keep a RoutesVersion alive, so its entry
+# goes once the last of them is freed, and since it holds the routes, their id
+# cannot be reused by another RouteDict while the entry exists.
+_routes_versions: WeakValueDictionary[int, RoutesVersion] = \
+    WeakValueDictionary()
+
+
+def track_routes(routes: RouteDict) -> RoutesVersion:
+    """Return the RoutesVersion of routes.  A structure derived from routes
+    keeps it for as long as it needs get_routes_version to see the changes
+    made to routes.
+
+    >>> example_routes = flight_example_data.create_example_routes()
+    >>> track_routes(example_routes) is track_routes(example_routes)
+    True
+    """
+    tracked = _routes_versions.get(id(routes))
+    if tracked is None:
+        tracked = _routes_versions[id(routes)] = RoutesVersion(routes)
+    return tracked
+
+
+def get_routes_version(routes: RouteDict) -> int:
+    """Return the number of times routes has been changed by
+    mark_routes_changed while it was tracked by track_routes, or 0 if it is
+    not tracked.
+
+    >>> example_routes = flight_example_data.create_example_routes()
+    >>> tracked = track_routes(example_routes)
+    >>> get_routes_version(example_routes)
+    0
+    >>> mark_routes_changed(example_routes)
+    >>> get_routes_version(example_routes)
+    1
+    """
+    tracked = _routes_versions.get(id(routes))
+    return 0 if tracked is None else tracked.version
+
+
+def get_routes_structure_version(routes: RouteDict) -> int:
+    """Return the number of times routes has been changed by
+    mark_routes_changed with planes_only False while it was tracked by
+    track_routes, or 0 if it is not tracked.
+
+    >>> example_routes = flight_example_data.create_example_routes()
+    >>> tracked = track_routes(example_routes)
+    >>> mark_routes_changed(example_routes, planes_only=True)
+    >>> get_routes_version(example_routes)
+    1
+    >>> get_routes_structure_version(example_routes)
+    0
+    """
+    tracked = _routes_versions.get(id(routes))
+    return 0 if tracked is None else tracked.structure_version
+
+
+def mark_routes_changed(routes: RouteDict, planes_only: bool = False) -> None:
+    """Record that routes has been changed in place.  Every function that
+    mutates a RouteDict calls this after doing so, with planes_only True if
+    it only changed the airplanes of existing routes.  Nothing is recorded
+    for routes that no structure tracks, since nothing was derived from them.
+    """
+    tracked = _routes_versions.get(id(routes))
+    if tracked is not None:
+        tracked.version += 1
+        if not planes_only:
+            tracked.structure_version += 1
 
 
 ################################################################################
@@ -88,6 +190,65 @@ def is_valid_flight_sequence(RouteDict, flight_sequence: list[str]) -> bool:
     return True
 
 
+@flight_instrumentation.instrumented
+def find_first_invalid_legs(routes: RouteDict,
+                            flight_sequences: list[list[str]]) -> list[int]:
+    """Return a list with one entry for each flight sequence in
+    flight_sequences: -1 if is_valid_flight_sequence(routes, flight_sequence)
+    is True, and otherwise the index i of the first leg, from
+    flight_sequence[i] to flight_sequence[i + 1], that makes it invalid.
+    A sequence with fewer than 2 IATA codes is invalid at leg 0.
+
+    A leg is invalid if there is no direct flight for it, or if it arrives at
+    an airport that is not a source in routes.
+
+    >>> example_routes = flight_example_data.create_example_routes()
+    >>> find_first_invalid_legs(example_routes, [['RCM', 'JCK', 'RCM'],
+    ...                                          ['GFN', 'TRO', 'SYD'],
+    ...                                          ['RCM', 'JCK', 'TRO'],
+    ...                                          ['GFN']])
+    [-1, 1, 1, 0]
+    """
+    first_invalid_legs = []
+    no_destinations = {}
+
+    for flight_sequence in flight_sequences:
+        first_invalid_leg = -1
+        if len(flight_sequence) < 2:
+            first_invalid_leg = 0
+
+        # Each leg costs two dictionary lookups, and the destination of one
+        # leg is reused as the source of the next
+        source = flight_sequence[0] if flight_sequence else None
+        for i in range(1, len(flight_sequence)):
+            destination = flight_sequence[i]
+            if destination not in routes or \
+                    destination not in routes.get(source, no_destinations):
+                first_invalid_leg = i - 1
+                break
+            source = destination
+        first_invalid_legs.append(first_invalid_leg)
+
+    return first_invalid_legs
+
+
+@flight_instrumentation.instrumented
+def are_valid_flight_sequences(routes: RouteDict,
+                               flight_sequences: list[list[str]]) -> \
+        list[bool]:
+    """Return a list with the value of is_valid_flight_sequence(routes,
+    flight_sequence) for each flight_sequence in flight_sequences.
+
+    >>> example_routes = flight_example_data.create_example_routes()
+    >>> are_valid_flight_sequences(example_routes, [['RCM', 'JCK'],
+    ...                                             ['RCM', 'JCK', 'TRO']])
+    [True, False]
+    """
+    return [first_invalid_leg == -1 for first_invalid_leg
+            in find_first_invalid_legs(routes, flight_sequences)]
+
+
+@flight_instrumentation.instrumented
 def summarize_by_timezone(AirportDict) -> dict[str, int]:
     """
     Return a dictionary where the key is a timezone, and the value is the 
@@ -99,13 +260,14 @@ def summarize_by_timezone(AirportDict) -> dict[str, int]:
     """
     timezone_counts = {}
     # Iterate over each airport in AirportDict
-    for info in AirportDict.items():
+    for info in AirportDict.values():
         timezone = info.get('Tz')
-        if timezone is not None:
+        if timezone is not None and timezone != OPENFLIGHTS_NULL_VALUE:
             timezone_counts[timezone] = timezone_counts.get(timezone, 0) + 1
     return timezone_counts
 
 
+@flight_instrumentation.instrumented
 def find_reachable_destinations(routes: RouteDict, source: str, n: int) -> \
         list[str]:
     """Return the list of IATA airport codes that are reachable from source by
@@ -125,40 +287,46 @@ def find_reachable_destinations(routes: RouteDict, source: str, n: int) -> \
     >>> find_reachable_destinations(example_routes, 'GFN', 2)
     ['GFN', 'SYD', 'TRO']
     """        
-    visited = []
-    reachable_destinations = []
+    if n < 0:
+        return []
 
-    queue = [(source, 0)]
+    # Each airport is marked as visited when it is first enqueued, so it is
+    # expanded at most once and always with its smallest number of hops
+    visited = {source}
+    queue = deque([(source, 0)])
+    edges_expanded = 0
 
     # Perform BFS
     while queue:
-        airport, hops = queue.pop(0)
+        airport, hops = queue.popleft()
 
-        # Continue if airport has already been visited or if the
-        # number of hops exceeds the limit
-        if airport in visited or hops > n:
+        # Airports found at the hop limit are reachable but not expanded
+        if hops == n or airport not in routes:
             continue
 
-        visited.append(airport)
-        reachable_destinations.append(airport)
-
-        # Enqueue neighboring airports
-        if airport in routes:
-            for neighbor in routes[airport]:
+        # Enqueue neighboring airports that have not been seen yet
+        destinations = routes[airport]
+        edges_expanded += len(destinations)
+        for neighbor in destinations:
+            if neighbor not in visited:
+                visited.add(neighbor)
                 queue.append((neighbor, hops + 1))
 
-    # check that elements in final list are not repeated
-    for i in range(len(reachable_destinations)):
-        if reachable_destinations.count(i) > 1:
-            reachable_destinations.remove(i)
-        elif reachable_destinations.count(i) == 1:
-            continue
+    if flight_instrumentation.ENABLED:
+        flight_instrumentation.count(
+            'flight_functions.find_reachable_destinations.edges_expanded',
+            edges_expanded)
+        flight_instrumentation.observe(
+            'flight_functions.find_reachable_destinations.visited',
+            len(visited))
 
     # Sorting list in lexicographical order
+    reachable_destinations = list(visited)
     reachable_destinations.sort()
     return reachable_destinations
 
 
+@flight_instrumentation.instrumented
 def decomission_plane(routes: RouteDict, plane: str) -> list[tuple[str, str]]:
     """Update routes by removing plane from all source-destination routes that
     use plane. Do not remove the source-destination pair, only the plane.
@@ -180,19 +348,27 @@ def decomission_plane(routes: RouteDict, plane: str) -> list[tuple[str, str]]:
     ['DH4']
     """
     routes_with_no_planes = []
+    changed = False
 
     # Iterates over each source destination route
     for source, destinations in routes.items():
         for destination, airplanes in destinations.items():
-            
-            # If the plane is in the list of airplanes for this route, remove it
+
+            # If the plane is in the list of airplanes for this route, remove
+            # it, replacing rather than changing a list shared with other
+            # routes
             if plane in airplanes:
-                airplanes.remove(plane)
-                
-                # If there are no airplanes left for this route, 
+                airplanes = remove_plane_from_route(destinations, destination,
+                                                    plane)
+                changed = True
+
+                # If there are no airplanes left for this route,
                 # add it to routes_with_no_planes
                 if not airplanes:
                     routes_with_no_planes.append((source, destination))
+    if changed:
+        mark_routes_changed(routes, planes_only=True)
+
     # sort the list of tuples
     routes_with_no_planes.sort()
     return routes_with_no_planes
@@ -0,0 +1,207 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from flight_constants import RouteDict
+
+import flight_example_data
+
+
+################################################################################
+# A CompiledGraph stores the same routes as a RouteDict in compressed sparse
+# row (CSR) form.  Every IATA airport code is given an integer id, and ids are
+# assigned in lexicographical order of the codes.  The destinations of the
+# airport with id i are targets[offsets[i]:offsets[i + 1]], sorted by id.
+#
+# The airplanes of each route are stored the same way: the airplanes of the
+# route at position e in targets are aircraft[aircraft_offsets[e]:
+# aircraft_offsets[e + 1]], where every entry is an index into aircraft_codes.
+################################################################################
+
+class CompiledGraph:
+    """A read-only, integer-indexed copy of a RouteDict.
+
+    Instance Attributes:
+        - codes: the IATA airport code of each airport id
+        - ids: maps each IATA airport code to its airport id
+        - offsets: where the destinations of each airport start in targets
+        - targets: the destination airport id of each route
+        - aircraft_codes: the airplane code of each airplane index
+        - aircraft_offsets: where the airplanes of each route start in aircraft
+        - aircraft: the airplane index of each airplane used on a route
+    """
+    codes: list[str]
+    ids: dict[str, int]
+    offsets: array
+    targets: array
+    aircraft_codes: list[str]
+    aircraft_offsets: array
+    aircraft: array
+
+    def __init__(self, routes: RouteDict) -> None:
+        """Initialize a new CompiledGraph with the routes in routes.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.codes
+        ['GFN', 'JCK', 'RCM', 'SYD', 'TRO']
+        >>> list(graph.offsets)
+        [0, 1, 2, 3, 3, 5]
+        """
+        airport_codes = set(routes)
+        aircraft_codes = set()
+        for destinations in routes.values():
+            airport_codes.update(destinations)
+            for airplanes in destinations.values():
+                aircraft_codes.update(airplanes)
+
+        self.codes = sorted(airport_codes)
+        self.ids = {code: i for i, code in enumerate(self.codes)}
+        self.aircraft_codes = sorted(aircraft_codes)
+        aircraft_ids = {code: i for i, code in enumerate(self.aircraft_codes)}
+
+        self.offsets = array('I', [0])
+        self.targets = array('I')
+        self.aircraft_offsets = array('I', [0])
+        self.aircraft = array('H')
+        for code in self.codes:
+            destinations = routes.get(code, {})
+            for destination in sorted(destinations):
+                self.targets.append(self.ids[destination])
+                self.aircraft.extend(aircraft_ids[airplane]
+                                     for airplane in destinations[destination])
+                self.aircraft_offsets.append(len(self.aircraft))
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        """Return the number of airports in this graph.
+
+        >>> len(CompiledGraph(flight_example_data.create_example_routes()))
+        5
+        """
+        return len(self.codes)
+
+    def num_routes(self) -> int:
+        """Return the number of source-destination routes in this graph.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.num_routes()
+        5
+        """
+        return len(self.targets)
+
+    def find_route(self, source: str, destination: str) -> int:
+        """Return the position in targets of the route from source to
+        destination, or -1 if there is no such route.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.find_route('TRO', 'SYD')
+        4
+        >>> graph.find_route('SYD', 'TRO')
+        -1
+        """
+        if source not in self.ids or destination not in self.ids:
+            return -1
+
+        source_id = self.ids[source]
+        destination_id = self.ids[destination]
+        start = self.offsets[source_id]
+        end = self.offsets[source_id + 1]
+
+        # The destinations of each airport are sorted, so binary search them
+        position = bisect_left(self.targets, destination_id, start, end)
+        if position < end and self.targets[position] == destination_id:
+            return position
+        return -1
+
+    def is_direct_flight(self, source: str, destination: str) -> bool:
+        """Return True if there exists a direct flight from source to
+        destination in this graph, like flight_functions.is_direct_flight.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.is_direct_flight('RCM', 'JCK')
+        True
+        >>> graph.is_direct_flight('TRO', 'JCK')
+        False
+        """
+        return self.find_route(source, destination) != -1
+
+    def get_airplanes(self, source: str, destination: str) -> list[str]:
+        """Return the list of airplanes used on the route from source to
+        destination, or an empty list if there is no such route.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.get_airplanes('TRO', 'SYD')
+        ['SF3', 'DH4']
+        """
+        position = self.find_route(source, destination)
+        if position == -1:
+            return []
+        start = self.aircraft_offsets[position]
+        end = self.aircraft_offsets[position + 1]
+        return [self.aircraft_codes[i] for i in self.aircraft[start:end]]
+
+    def reachable_ids(self, source_id: int, n: int) -> list[int]:
+        """Return the sorted list of airport ids that are reachable from the
+        airport with id source_id by taking at most n direct flights.  The
+        source airport itself is always included.
+
+        Preconditions:
+            - n >= 0
+            - 0 <= source_id < len(self)
+        """
+        offsets = self.offsets
+        targets = self.targets
+        visited = bytearray(len(self.codes))
+        visited[source_id] = 1
+        found = [source_id]
+        queue = deque([(source_id, 0)])
+
+        # Perform BFS, never expanding the airports at the hop limit
+        while queue:
+            airport, hops = queue.popleft()
+            if hops == n:
+                continue
+            for neighbor in targets[offsets[airport]:offsets[airport + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    found.append(neighbor)
+                    queue.append((neighbor, hops + 1))
+
+        found.sort()
+        return found
+
+    def find_reachable_destinations(self, source: str, n: int) -> list[str]:
+        """Return the list of IATA airport codes that are reachable from
+        source by taking at most n direct flights, in lexicographical order,
+        like flight_functions.find_reachable_destinations.
+
+        >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+        >>> graph.find_reachable_destinations('GFN', 2)
+        ['GFN', 'SYD', 'TRO']
+        """
+        if n < 0:
+            return []
+        if source not in self.ids:
+            return [source]
+
+        # Airport ids are in lexicographical order, so sorted ids give sorted
+        # airport codes
+        return [self.codes[i] for i in self.reachable_ids(self.ids[source], n)]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
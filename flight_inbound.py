@@ -0,0 +1,125 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from flight_constants import ADD_ROUTE, REMOVE_ROUTE, RESET
+from flight_functions import find_reachable_destinations
+from flight_route_store import RouteStore
+
+import flight_example_data
+
+
+################################################################################
+# A RouteDict only lists the routes out of each airport, so finding the
+# airports that can reach a destination means searching from every source.
+# An InboundIndex lists the routes into each airport instead, and keeps up with
+# the routes by applying the journal of their RouteStore.  Only adding and
+# removing a route changes it; adding or removing airplanes does not, since a
+# route with no airplanes is still a route to find_reachable_destinations.  So
+# the index is only rebuilt after a RESET, and not after a RESET_PLANES, which
+# is all that decomission_plane causes.
+################################################################################
+
+class InboundIndex:
+    """The source airports of the routes into each airport of a RouteStore.
+
+    Instance Attributes:
+        - store: the store of the routes that are indexed
+    """
+    store: RouteStore
+    _sources: dict[str, set[str]]
+    _version: int
+
+    def __init__(self, store: RouteStore) -> None:
+        """Initialize a new index of the routes into each airport of the
+        routes in store.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> InboundIndex(store).get_sources('SYD')
+        ['TRO']
+        """
+        self.store = store
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Index every route in the store from scratch."""
+        self._sources = {}
+        for source, destinations in self.store.routes.items():
+            for destination in destinations:
+                if destination not in self._sources:
+                    self._sources[destination] = set()
+                self._sources[destination].add(source)
+        self._version = self.store.version
+
+    def _sync(self) -> None:
+        """Apply the changes made through the store since this index was
+        last in sync with it, or rebuild it if routes may have been added or
+        removed without going through the store.
+        """
+        for change in self.store.changes_since(self._version):
+            if change.kind == RESET:
+                self._rebuild()
+                return
+            if change.kind == ADD_ROUTE:
+                if change.destination not in self._sources:
+                    self._sources[change.destination] = set()
+                self._sources[change.destination].add(change.source)
+            elif change.kind == REMOVE_ROUTE:
+                sources = self._sources.get(change.destination, set())
+                sources.discard(change.source)
+                if not sources:
+                    self._sources.pop(change.destination, None)
+        self._version = self.store.version
+
+    def get_sources(self, destination: str) -> list[str]:
+        """Return the sorted list of airports with a direct flight to
+        destination.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> index = InboundIndex(store)
+        >>> store.add_route('RCM', 'TRO')
+        True
+        >>> index.get_sources('TRO')
+        ['GFN', 'RCM']
+        """
+        self._sync()
+        return sorted(self._sources.get(destination, ()))
+
+    def find_origins(self, destination: str, n: int) -> list[str]:
+        """Return the sorted list of IATA airport codes from which destination
+        can be reached by taking at most n direct flights, including
+        destination itself, like find_reachable_destinations with the routes
+        reversed.
+
+        Preconditions:
+            - n >= 1
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> index = InboundIndex(store)
+        >>> index.find_origins('SYD', 1)
+        ['SYD', 'TRO']
+        >>> index.find_origins('SYD', 2)
+        ['GFN', 'SYD', 'TRO']
+        >>> store.remove_route('GFN', 'TRO')
+        True
+        >>> index.find_origins('SYD', 2)
+        ['SYD', 'TRO']
+        """
+        self._sync()
+        # The search only looks up and iterates over the neighbours of each
+        # airport, so the sets of sources serve as the reversed routes
+        return find_reachable_destinations(self._sources, destination, n)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,334 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+################################################################################
+# Opt-in instrumentation of the flight modules.  Instrumentation is off unless
+# the FLIGHT_INSTRUMENTATION environment variable is set to something other
+# than 0, or enable() is called.  While it is off, an instrumented function
+# only checks ENABLED before calling the real function, and the modules only
+# record counts behind an "if flight_instrumentation.ENABLED" check.
+#
+# Metrics are named with dots, such as 'flight_reader.read_routes.seconds':
+#     - a counter is a number that only goes up, such as lines parsed
+#     - a histogram counts how many observed values fell in each bucket, such
+#       as the times taken by a function, along with their count and sum
+################################################################################
+
+ENABLED = os.environ.get('FLIGHT_INSTRUMENTATION', '0') not in ('', '0')
+
+# The upper bounds of the histogram buckets: 1, 2.5 and 5 times each power of
+# ten from 1 microsecond up to 10 million, so that the same buckets suit
+# durations in seconds and sizes in items
+DEFAULT_BUCKETS = tuple(scale * 10.0 ** power for power in range(-6, 8)
+                        for scale in (1.0, 2.5, 5.0))
+
+
+class Histogram:
+    """A count of observed values in buckets.
+
+    Instance Attributes:
+        - bounds: the upper bound of each bucket, in increasing order
+        - counts: the number of values observed in each bucket, with one more
+          for the values above the last bound
+        - count: the number of values observed
+        - total: the sum of the values observed
+    """
+    bounds: tuple[float, ...]
+    counts: list[int]
+    count: int
+    total: float
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize a new histogram with no values and buckets up to each
+        of bounds.
+
+        >>> Histogram((1.0, 10.0)).counts
+        [0, 0, 0]
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add value to this histogram.
+
+        >>> histogram = Histogram((1.0, 10.0))
+        >>> for value in [0.5, 1.0, 3.0, 30.0]:
+        ...     histogram.observe(value)
+        >>> histogram.counts, histogram.count, histogram.total
+        ([2, 1, 1], 4, 34.5)
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self) -> dict:
+        """Return this histogram as a dictionary that can be saved as JSON.
+
+        >>> Histogram((1.0,)).to_dict()
+        {'count': 0, 'sum': 0.0, 'buckets': {'1.0': 0, '+Inf': 0}}
+        """
+        buckets = {repr(bound): count
+                   for bound, count in zip(self.bounds, self.counts)}
+        buckets['+Inf'] = self.counts[-1]
+        return {'count': self.count, 'sum': self.total, 'buckets': buckets}
+
+
+_counters: dict[str, float] = {}
+_histograms: dict[str, Histogram] = {}
+
+
+def enable() -> None:
+    """Start recording metrics."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    """Stop recording metrics.  The metrics recorded so far are kept."""
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    """Forget every metric recorded so far."""
+    _counters.clear()
+    _histograms.clear()
+
+
+def count(name: str, amount: float = 1) -> None:
+    """Add amount to the counter called name.
+
+    >>> reset()
+    >>> count('example.lines', 3)
+    >>> count('example.lines')
+    >>> get_metrics()['counters']
+    {'example.lines': 4}
+    """
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name: str, value: float) -> None:
+    """Add value to the histogram called name.
+
+    >>> reset()
+    >>> observe('example.size', 12)
+    >>> get_metrics()['histograms']['example.size']['count']
+    1
+    """
+    histogram = _histograms.get(name)
+    if histogram is None:
+        histogram = _histograms[name] = Histogram()
+    histogram.observe(value)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Time the body of the with statement into the histogram called name
+    + '.seconds', if instrumentation is enabled.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name + '.seconds', time.perf_counter() - start)
+
+
+def instrumented(function: Callable) -> Callable:
+    """Return function, instrumented to count its calls in the counter
+    called module.name + '.calls' and time them in the histogram called
+    module.name + '.seconds' while instrumentation is enabled.
+
+    >>> reset()
+    >>> enable()
+    >>> @instrumented
+    ... def double(x: int) -> int:
+    ...     return 2 * x
+    >>> double(4)
+    8
+    >>> get_metrics()['counters']
+    {'flight_instrumentation.double.calls': 1}
+    >>> disable()
+    """
+    name = f'{function.__module__}.{function.__name__}'
+    calls_name = name + '.calls'
+    seconds_name = name + '.seconds'
+
+    @functools.wraps(function)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        if not ENABLED:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            observe(seconds_name, time.perf_counter() - start)
+            count(calls_name)
+
+    return wrapper
+
+
+def get_metrics() -> dict:
+    """Return every metric recorded so far as a dictionary that can be
+    saved as JSON, with a 'counters' and a 'histograms' dictionary.
+    """
+    return {'counters': dict(_counters),
+            'histograms': {name: histogram.to_dict()
+                           for name, histogram in _histograms.items()}}
+
+
+def _prometheus_name(name: str) -> str:
+    """Return name made into a valid Prometheus metric name.
+
+    >>> _prometheus_name('flight_reader.read_routes.seconds')
+    'flight_reader_read_routes_seconds'
+    """
+    return re.sub('[^a-zA-Z0-9_:]', '_', name)
+
+
+def format_prometheus() -> str:
+    """Return every metric recorded so far in the Prometheus text format.
+
+    >>> reset()
+    >>> count('example.lines', 2)
+    >>> print(format_prometheus(), end='')
+    # TYPE example_lines_total counter
+    example_lines_total 2
+    """
+    lines = []
+    for name, value in sorted(_counters.items()):
+        metric = _prometheus_name(name) + '_total'
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {value}')
+    for name, histogram in sorted(_histograms.items()):
+        metric = _prometheus_name(name)
+        lines.append(f'# TYPE {metric} histogram')
+
+        # Prometheus buckets count every value up to their bound
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+            cumulative += bucket_count
+            lines.append(f'{metric}_bucket{{le="{bound!r}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+        lines.append(f'{metric}_sum {histogram.total!r}')
+        lines.append(f'{metric}_count {histogram.count}')
+    return ''.join(line + '\n' for line in lines)
+
+
+def export_json(path: str) -> None:
+    """Save every metric recorded so far to the file at path as JSON."""
+    with open(path, 'w', encoding='utf8') as metrics_file:
+        json.dump(get_metrics(), metrics_file, indent=2)
+
+
+def export_prometheus(path: str) -> None:
+    """Save every metric recorded so far to the file at path in the
+    Prometheus text format, for example for the node exporter's textfile
+    collector.
+    """
+    with open(path, 'w', encoding='utf8') as metrics_file:
+        metrics_file.write(format_prometheus())
+
+
+################################################################################
+# Profiling a single call
+################################################################################
+
+class ProfileReport:
+    """What was captured while profiling, filled in when profiling stops.
+
+    Instance Attributes:
+        - stats: the cProfile statistics of the profiled code
+        - peak_memory: the largest number of bytes allocated at once by the
+          profiled code, or -1 if memory was not traced
+        - top_allocations: the tracemalloc statistics of the lines that had
+          allocated the most memory still in use when profiling stopped
+    """
+    stats: pstats.Stats | None
+    peak_memory: int
+    top_allocations: list[tracemalloc.Statistic]
+
+    def __init__(self) -> None:
+        """Initialize a new, empty report."""
+        self.stats = None
+        self.peak_memory = -1
+        self.top_allocations = []
+
+    def format_stats(self, sort: str = 'cumulative', limit: int = 20) -> str:
+        """Return the limit most expensive functions by sort, as printed by
+        pstats.
+        """
+        output = io.StringIO()
+        if self.stats is not None:
+            self.stats.stream = output
+            self.stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+@contextmanager
+def profile(trace_memory: bool = True, num_allocations: int = 10) -> \
+        Iterator[ProfileReport]:
+    """Profile the body of the with statement with cProfile, and trace its
+    memory with tracemalloc if trace_memory is True, whether or not
+    instrumentation is enabled.  The report given by the with statement is
+    filled in when the body finishes.
+
+    >>> with profile() as report:
+    ...     _ = sorted(range(1000), key=lambda x: -x)
+    >>> report.peak_memory > 0
+    True
+    >>> 'sorted' in report.format_stats()
+    True
+    """
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    was_tracing = tracemalloc.is_tracing()
+    if trace_memory and not was_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        report.stats = pstats.Stats(profiler)
+        if trace_memory:
+            report.peak_memory = tracemalloc.get_traced_memory()[1]
+            report.top_allocations = tracemalloc.take_snapshot().statistics(
+                'lineno')[:num_allocations]
+            if not was_tracing:
+                tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
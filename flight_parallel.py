@@ -0,0 +1,366 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import codecs
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from sys import intern
+from typing import BinaryIO, Container, Iterable, Iterator
+
+from flight_constants import RouteDict
+from flight_graph import CompiledGraph
+from flight_reader import ROUTES_CHUNK_SIZE, RouteParser
+import flight_shared_aircraft
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The start of the line that begins each block of a routes file
+SOURCE_MARKER = b'SOURCE:'
+
+# The number of bytes read at a time while looking for a block boundary
+BOUNDARY_SCAN_SIZE = 1 << 16
+
+# The number of sources sent to a worker process at a time
+REACHABILITY_BATCH_SIZE = 64
+
+
+################################################################################
+# Sharded parsing of routes files.  Each SOURCE: block of a routes file can be
+# parsed on its own, so the file is cut into byte ranges that start at the
+# beginning of a block and each range is parsed in a separate process.
+#
+# A worker sends its routes back flattened into a few lists and arrays (see
+# flatten_routes) rather than as nested dictionaries, and the parent merges
+# the shards in file order so that the result is the same as read_routes
+# gives.
+#
+# Whether this is faster than read_routes depends on the number of CPUs.  It
+# has only been timed on one CPU, where the pickling and merging made it
+# slower than read_routes for every number of workers; run
+# benchmark_parallel_routes in flight_benchmarks on the target machine.
+################################################################################
+
+# A flattened RouteDict: the source airports, the number of destinations of
+# each source, the destinations, the number of airplanes of each destination,
+# and the airplanes
+FlatRoutes = tuple[list[str], array, list[str], array, list[str]]
+
+
+def _find_block_start(routes_file: BinaryIO, position: int) -> int:
+    """Return the offset of the first line at or after position in the binary
+    file routes_file that starts a SOURCE: block, or the size of the file if
+    there is none.
+    """
+    if position == 0:
+        return 0
+
+    # Look for a newline followed by the marker and a space, starting one
+    # byte early so that a block starting exactly at position is found
+    pattern = b'\n' + SOURCE_MARKER
+    routes_file.seek(position - 1)
+    offset = position - 1
+    buffer = b''
+    while True:
+        chunk = routes_file.read(BOUNDARY_SCAN_SIZE)
+        if not chunk:
+            return offset + len(buffer)
+        buffer += chunk
+        index = buffer.find(pattern)
+        while index != -1:
+            after = index + len(pattern)
+            if after >= len(buffer):
+                break
+            if buffer[after:after + 1] in (b' ', b'\t'):
+                return offset + index + 1
+            index = buffer.find(pattern, index + 1)
+
+        # Keep enough of the end of the buffer to match a split pattern.  A
+        # buffer no longer than that is kept whole, so offset never moves
+        # back past the start of the buffer
+        keep = len(pattern)
+        offset += max(0, len(buffer) - keep)
+        buffer = buffer[-keep:]
+
+
+def find_shard_offsets(routes_path: str, num_shards: int) -> list[int]:
+    """Return the byte offsets that cut the routes file at routes_path into
+    at most num_shards shards of about the same size.  Every shard starts at
+    the beginning of a SOURCE: block; the last offset is the size of the
+    file, so shard i is the bytes from offsets[i] up to offsets[i + 1].
+
+    Preconditions:
+        - num_shards >= 1
+    """
+    size = os.path.getsize(routes_path)
+    offsets = [0]
+    with open(routes_path, 'rb') as routes_file:
+        for i in range(1, num_shards):
+            start = _find_block_start(routes_file, size * i // num_shards)
+            if offsets[-1] < start < size:
+                offsets.append(start)
+    offsets.append(size)
+    return offsets
+
+
+def read_routes_range(routes_path: str, start: int, end: int,
+                      airports: Container[str],
+                      share_aircraft: bool = False) -> RouteDict:
+    """Return the routes dictionary of the bytes from start up to end of the
+    routes file at routes_path, keeping only routes between airports in
+    airports, and sharing the lists of airplanes if share_aircraft is True,
+    as flight_reader.read_routes does.
+
+    Preconditions:
+        - start is 0 or the offset of the beginning of a SOURCE: block
+        - end is the size of the file or the offset of the beginning of a
+          SOURCE: block
+    """
+    parser = RouteParser(airports, share_aircraft)
+    decoder = codecs.getincrementaldecoder('utf8')()
+    with open(routes_path, 'rb') as routes_file:
+        routes_file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = routes_file.read(min(ROUTES_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    return parser.close()
+
+
+def flatten_routes(routes: RouteDict) -> FlatRoutes:
+    """Return routes flattened into lists and arrays.
+
+    >>> flatten_routes({'TRO': {'SYD': ['SF3', 'DH4']}, 'GFN': {}})
+    (['TRO', 'GFN'], array('I', [1, 0]), ['SYD'], array('I', [2]), \
+['SF3', 'DH4'])
+    """
+    destination_counts = array('I')
+    destinations = []
+    plane_counts = array('I')
+    planes = []
+    for inner in routes.values():
+        destination_counts.append(len(inner))
+        for destination, airplanes in inner.items():
+            destinations.append(destination)
+            plane_counts.append(len(airplanes))
+            planes.extend(airplanes)
+    return (list(routes), destination_counts, destinations, plane_counts,
+            planes)
+
+
+def merge_routes(routes: RouteDict, flat: FlatRoutes,
+                 share_aircraft: bool = False) -> None:
+    """Add the flattened routes flat to routes, as if the data they were
+    parsed from came after the data routes was parsed from: the airplanes of
+    a route that is already in routes are added after its airplanes.  If
+    share_aircraft is True, the lists of airplanes of routes must be shared,
+    and the new ones are shared too.
+
+    >>> routes = {'TRO': {'SYD': ['SF3']}}
+    >>> merge_routes(routes, flatten_routes({'TRO': {'SYD': ['DH4'],
+    ...                                              'GFN': []}}))
+    >>> routes
+    {'TRO': {'SYD': ['SF3', 'DH4'], 'GFN': []}}
+    """
+    sources, destination_counts, destinations, plane_counts, planes = flat
+    destination_iter = zip(destinations, plane_counts)
+    plane_iter = iter(planes)
+    for source, count in zip(sources, destination_counts):
+        inner = routes.get(source)
+        if inner is None:
+            inner = routes[intern(source)] = {}
+        for destination, num_planes in islice(destination_iter, count):
+            if share_aircraft:
+                inner[intern(destination)] = \
+                    flight_shared_aircraft.share_aircraft(
+                        (*inner.get(destination, ()),
+                         *islice(plane_iter, num_planes)))
+                continue
+            airplanes = inner.get(destination)
+            if airplanes is None:
+                airplanes = inner[intern(destination)] = []
+            airplanes.extend(map(intern, islice(plane_iter, num_planes)))
+
+
+# The airport codes known to a worker process, set once when it starts so
+# that they are not sent with every shard
+_worker_airports: Container[str] = frozenset()
+
+
+def _init_worker(airports: Container[str]) -> None:
+    """Set the airport codes known to this worker process."""
+    global _worker_airports
+    _worker_airports = airports
+
+
+def _parse_shard(routes_path: str, start: int, end: int) -> FlatRoutes:
+    """Return the flattened routes of one shard of the routes file at
+    routes_path, using the airport codes known to this worker process.
+    """
+    return flatten_routes(read_routes_range(routes_path, start, end,
+                                            _worker_airports))
+
+
+def read_routes_parallel(routes_path: str, airports: Container[str],
+                         workers: int | None = None,
+                         share_aircraft: bool = False) -> RouteDict:
+    """Return the same routes dictionary as read_routes gives for the routes
+    file at routes_path, airports and share_aircraft, parsing shards of the
+    file in workers processes at once.  If workers is None, use one process
+    per CPU; if workers is 1, parse the whole file in this process.
+
+    Preconditions:
+        - workers is None or workers >= 1
+        - The data in the file at routes_path is formatted correctly
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    offsets = find_shard_offsets(routes_path, workers)
+    if len(offsets) <= 2:
+        return read_routes_range(routes_path, 0, offsets[-1], airports,
+                                 share_aircraft)
+
+    routes = {}
+    num_shards = len(offsets) - 1
+    with ProcessPoolExecutor(max_workers=min(workers, num_shards),
+                             initializer=_init_worker,
+                             initargs=(frozenset(airports),)) as executor:
+        # map gives the shards back in file order, so each can be merged as
+        # soon as it and the shards before it are done
+        for flat in executor.map(_parse_shard, [routes_path] * num_shards,
+                                 offsets[:-1], offsets[1:]):
+            merge_routes(routes, flat, share_aircraft)
+    return routes
+
+
+################################################################################
+# Reachability from many sources at once.  Each source is an independent
+# breadth-first search over a CompiledGraph, so batches of sources are
+# searched in separate processes.
+#
+# The graph is given to each worker once, by the pool initializer.  Where
+# processes are started by forking (the default on Linux), the workers use
+# the parent's copy of the graph without it being pickled at all.  Elsewhere
+# the graph is pickled once per worker, never once per task.  Workers send
+# back sorted airport ids in arrays, which the parent turns into codes.
+#
+# As with read_routes_parallel, any speedup depends on the number of CPUs and
+# has not been measured: on one CPU this was slower than searching in one
+# process.  Run benchmark_parallel_reachability in flight_benchmarks on the
+# target machine.
+################################################################################
+
+# The graph searched by a worker process, set once when it starts
+_worker_graph: CompiledGraph | None = None
+
+
+def _init_graph_worker(graph: CompiledGraph) -> None:
+    """Set the graph searched by this worker process."""
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _reach_batch(source_ids: list[int], n: int) -> list[tuple[int, array]]:
+    """Return each of source_ids with the ids of the airports reachable from
+    it in at most n flights in the graph of this worker process.
+    """
+    return [(source_id, array('I', _worker_graph.reachable_ids(source_id, n)))
+            for source_id in source_ids]
+
+
+def iter_reachable_destinations(graph: CompiledGraph, n: int,
+                                sources: Iterable[str] | None = None,
+                                workers: int | None = None) -> \
+        Iterator[tuple[str, list[str]]]:
+    """Yield (source, graph.find_reachable_destinations(source, n)) for each
+    airport in sources, or for every airport in graph if sources is None.
+    The searches are spread over workers processes, or one process per CPU
+    if workers is None, and each result is yielded as soon as its batch is
+    done, so the results are not in the order of sources.  If workers is 1,
+    every search is done in this process, in order.
+
+    Preconditions:
+        - workers is None or workers >= 1
+
+    >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+    >>> sorted(iter_reachable_destinations(graph, 1, ['GFN', 'XYZ'], 1))
+    [('GFN', ['GFN', 'TRO']), ('XYZ', ['XYZ'])]
+    """
+    if sources is None:
+        sources = graph.codes
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Sources that are not in the graph, and negative hop limits, need no
+    # search
+    source_ids = []
+    for source in sources:
+        if n < 0:
+            yield source, []
+        elif source not in graph.ids:
+            yield source, [source]
+        else:
+            source_ids.append(graph.ids[source])
+    if not source_ids:
+        return
+
+    codes = graph.codes
+    if workers == 1:
+        for source_id in source_ids:
+            yield codes[source_id], [codes[i] for i in
+                                     graph.reachable_ids(source_id, n)]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_graph_worker,
+                             initargs=(graph,)) as executor:
+        futures = [executor.submit(_reach_batch,
+                                   source_ids[i:i + REACHABILITY_BATCH_SIZE],
+                                   n)
+                   for i in range(0, len(source_ids),
+                                  REACHABILITY_BATCH_SIZE)]
+        for future in as_completed(futures):
+            for source_id, reachable in future.result():
+                yield codes[source_id], [codes[i] for i in reachable]
+
+
+def find_all_reachable_destinations(graph: CompiledGraph, n: int,
+                                    sources: Iterable[str] | None = None,
+                                    workers: int | None = None) -> \
+        dict[str, list[str]]:
+    """Return a dictionary that maps each airport in sources, or every
+    airport in graph if sources is None, to the list of airports reachable
+    from it by taking at most n direct flights, as given by
+    graph.find_reachable_destinations.  See iter_reachable_destinations for
+    workers.
+
+    >>> graph = CompiledGraph(flight_example_data.create_example_routes())
+    >>> find_all_reachable_destinations(graph, 2, ['GFN', 'RCM'], 1)
+    {'GFN': ['GFN', 'SYD', 'TRO'], 'RCM': ['JCK', 'RCM']}
+    """
+    return dict(iter_reachable_destinations(graph, n, sources, workers))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,234 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import sys
+from collections import OrderedDict
+
+from flight_constants import RouteDict
+from flight_functions import RoutesVersion, get_routes_structure_version, \
+    track_routes
+
+import flight_instrumentation
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The default limit on the memory used by the layers kept by a
+# ReachabilityIndex, in bytes
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+
+################################################################################
+# The layers of a source airport are the lists of airports at exactly 0, 1,
+# 2, ... hops from it, so layers[0] == [source].  The airports reachable by
+# taking at most n direct flights are the union of layers[0] to layers[n].
+################################################################################
+
+class _Layers:
+    """The BFS layers found so far for one source airport.
+
+    Instance Attributes:
+        - layers: the airports at exactly k hops from the source, for each k
+          that has been explored
+        - complete: whether every airport reachable from the source is in
+          layers
+        - size: an estimate of the bytes used by layers
+    """
+    layers: list[list[str]]
+    complete: bool
+    size: int
+
+    def __init__(self, source: str) -> None:
+        self.layers = [[source]]
+        self.complete = False
+        self.size = sys.getsizeof(self.layers) + sys.getsizeof(self.layers[0])
+
+    def extend(self, routes: RouteDict, n: int) -> None:
+        """Explore routes until there are at least n + 1 layers, or until
+        every reachable airport has been found.
+        """
+        if self.complete or len(self.layers) > n:
+            return
+
+        seen = set()
+        for layer in self.layers:
+            seen.update(layer)
+
+        while len(self.layers) <= n:
+            next_layer = []
+            for airport in self.layers[-1]:
+                for neighbor in routes.get(airport, {}):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_layer.append(neighbor)
+            if not next_layer:
+                self.complete = True
+                return
+            next_layer.sort()
+            self.layers.append(next_layer)
+            self.size += sys.getsizeof(next_layer)
+
+    def reachable(self, n: int) -> list[str]:
+        """Return the sorted list of airports in the first n + 1 layers."""
+        reachable_destinations = []
+        for layer in self.layers[:n + 1]:
+            reachable_destinations.extend(layer)
+
+        # Each layer is already sorted, and sorting a list made of sorted
+        # runs takes close to linear time
+        reachable_destinations.sort()
+        return reachable_destinations
+
+
+class ReachabilityIndex:
+    """A cache of the BFS layers of the source airports queried in routes,
+    so that find_reachable_destinations can be answered for any n without
+    searching the routes again.
+
+    Layers are evicted in least recently used order once they use more than
+    max_bytes.  Every layer is thrown away when routes may have had routes
+    added or removed, as recorded by flight_functions.mark_routes_changed.
+    Reachability does not depend on airplanes, so changes that only change
+    airplanes, such as decomission_plane, keep the layers.
+
+    Instance Attributes:
+        - routes: the routes that are indexed
+        - max_bytes: the memory limit for the cached layers, in bytes
+        - hits: the number of queries answered from cached layers
+        - misses: the number of queries that had to search routes
+    """
+    routes: RouteDict
+    max_bytes: int
+    hits: int
+    misses: int
+    _cache: OrderedDict[str, _Layers]
+    _size: int
+    _tracked: RoutesVersion
+    _version: int
+
+    def __init__(self, routes: RouteDict,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize a new, empty index of routes.
+
+        >>> routes = flight_example_data.create_example_routes()
+        >>> len(ReachabilityIndex(routes))
+        0
+        """
+        self.routes = routes
+        self._tracked = track_routes(routes)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._size = 0
+        self._version = get_routes_structure_version(routes)
+
+    def __len__(self) -> int:
+        """Return the number of source airports with cached layers."""
+        return len(self._cache)
+
+    def memory_used(self) -> int:
+        """Return an estimate of the bytes used by the cached layers."""
+        return self._size
+
+    def invalidate(self) -> None:
+        """Throw away every cached layer."""
+        self._cache.clear()
+        self._size = 0
+        self._version = get_routes_structure_version(self.routes)
+
+    def get_layers(self, source: str, n: int) -> list[list[str]]:
+        """Return the lists of airports at exactly 0, 1, ..., n hops from
+        source, each in lexicographical order.  The list is shorter than
+        n + 1 if no airport is n hops away.
+
+        Preconditions:
+            - n >= 0
+
+        >>> routes = flight_example_data.create_example_routes()
+        >>> ReachabilityIndex(routes).get_layers('GFN', 3)
+        [['GFN'], ['TRO'], ['SYD']]
+        """
+        return self._find(source, n).layers[:n + 1]
+
+    def find_reachable_destinations(self, source: str, n: int) -> list[str]:
+        """Return the same list as
+        flight_functions.find_reachable_destinations(self.routes, source, n).
+
+        >>> routes = flight_example_data.create_example_routes()
+        >>> index = ReachabilityIndex(routes)
+        >>> index.find_reachable_destinations('GFN', 2)
+        ['GFN', 'SYD', 'TRO']
+        >>> index.find_reachable_destinations('GFN', 1)
+        ['GFN', 'TRO']
+        >>> index.hits, index.misses
+        (1, 1)
+        >>> from flight_functions import decomission_plane
+        >>> _ = decomission_plane(routes, 'DH4')
+        >>> index.find_reachable_destinations('GFN', 1)
+        ['GFN', 'TRO']
+        >>> index.hits, index.misses
+        (2, 1)
+        """
+        if n < 0:
+            return []
+        return self._find(source, n).reachable(n)
+
+    def _find(self, source: str, n: int) -> _Layers:
+        """Return the layers of source, explored to at least n hops, and mark
+        them as the most recently used.
+        """
+        if get_routes_structure_version(self.routes) != self._version:
+            self.invalidate()
+
+        if source in self._cache:
+            entry = self._cache[source]
+            self._cache.move_to_end(source)
+            self._size -= entry.size
+            if entry.complete or len(entry.layers) > n:
+                self.hits += 1
+                hit = True
+            else:
+                self.misses += 1
+                hit = False
+        else:
+            entry = _Layers(source)
+            self._cache[source] = entry
+            self.misses += 1
+            hit = False
+        if flight_instrumentation.ENABLED:
+            flight_instrumentation.count('flight_reachability_index.hits'
+                                         if hit else
+                                         'flight_reachability_index.misses')
+
+        entry.extend(self.routes, n)
+        self._size += entry.size
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Remove the least recently used layers until the cache fits in
+        max_bytes.  The most recently used layers are always kept.
+        """
+        while self._size > self.max_bytes and len(self._cache) > 1:
+            _, entry = self._cache.popitem(last=False)
+            self._size -= entry.size
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
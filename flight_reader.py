@@ -11,10 +11,16 @@ this code, whether as given or with any changes, are expressly prohibited.
 All of the files in this directory and all subdirectories are:
 Copyright (c) 2024 The CSC108 Team
 """
-from typing import TextIO
-from flight_constants import AirportDict, RouteDict
+import csv
+from collections.abc import Mapping
+from itertools import islice
+from sys import intern
+from typing import Container, Iterable, Iterator, TextIO
+from flight_constants import Airport, AirportDict, RouteDict
+import flight_shared_aircraft
 
 import flight_example_data
+import flight_instrumentation
 
 
 ################################################################################
@@ -28,6 +34,15 @@ INDEX_AIRPORTS_LATITUDE = 4
 INDEX_AIRPORTS_LONGITUDE = 5
 INDEX_AIRPORTS_TZ = 6
 
+# The number of fields of an airport; any columns after them are ignored
+NUM_AIRPORT_FIELDS = 7
+
+# The number of airports in each batch yielded by iter_airport_batches
+DEFAULT_BATCH_SIZE = 1024
+
+# The number of characters read_routes reads from the routes file at a time
+ROUTES_CHUNK_SIZE = 1 << 20
+
 # An AirportDict is a dictionary that maps IATA airport codes to dictionaries
 # that contains more information about the airport (e.g., name, country, etc.)
 
@@ -41,6 +56,102 @@ INDEX_AIRPORTS_TZ = 6
 ################################################################################
 
 
+def iter_airports(airports_data: TextIO) -> Iterator[Airport]:
+    """Yield an Airport for each line of the airport data in the open file
+    referred to by airports_data, one at a time, without reading the rest of
+    the file.
+
+    The lines are split with the csv module, so quoted fields may contain
+    commas.  Blank lines are skipped, as LazyAirportDict skips them.  Columns
+    after the first NUM_AIRPORT_FIELDS are ignored, and a ValueError is
+    raised for a line with fewer columns.
+
+    Preconditions:
+        - The data in airports_data is formatted correctly
+
+    >>> airports = iter_airports(flight_example_data.create_airport_file())
+    >>> airport = next(airports)
+    >>> airport.name, airport.latitude
+    ('Richmond Airport', -20.701900482177734)
+    >>> [airport.iata for airport in airports]
+    ['JCK', 'TRO', 'SYD', 'GFN']
+    >>> from io import StringIO
+    >>> next(iter_airports(StringIO('"YYZ","Lester B. Pearson, Toronto",'
+    ...                             '"Toronto","Canada","43.6","-79.6",'
+    ...                             '"America/Toronto"'))).name
+    'Lester B. Pearson, Toronto'
+    >>> next(iter_airports(StringIO('"YYZ","Toronto"')))
+    Traceback (most recent call last):
+    ...
+    ValueError: an airport needs 7 fields, not 2: ['YYZ', 'Toronto']
+    """
+    # skipinitialspace also skips the spaces at the start of each line
+    for fields in csv.reader(airports_data, skipinitialspace=True):
+        if len(fields) < NUM_AIRPORT_FIELDS:
+            if not ''.join(fields).strip():
+                continue
+            raise ValueError(f'an airport needs {NUM_AIRPORT_FIELDS} '
+                             f'fields, not {len(fields)}: {fields!r}')
+        del fields[NUM_AIRPORT_FIELDS:]
+        fields[INDEX_AIRPORTS_LATITUDE] = \
+            float(fields[INDEX_AIRPORTS_LATITUDE])
+        fields[INDEX_AIRPORTS_LONGITUDE] = \
+            float(fields[INDEX_AIRPORTS_LONGITUDE])
+        yield Airport._make(fields)
+
+
+def iter_airport_batches(airports_data: TextIO,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> \
+        Iterator[list[Airport]]:
+    """Yield lists of at most batch_size Airports read from the open file
+    referred to by airports_data, in the order they appear in the file.
+
+    Preconditions:
+        - batch_size >= 1
+        - The data in airports_data is formatted correctly
+
+    >>> example_airport_file = flight_example_data.create_airport_file()
+    >>> batches = iter_airport_batches(example_airport_file, 2)
+    >>> [[airport.iata for airport in batch] for batch in batches]
+    [['RCM', 'JCK'], ['TRO', 'SYD'], ['GFN']]
+    """
+    airports = iter_airports(airports_data)
+    batch = list(islice(airports, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(airports, batch_size))
+
+
+def airports_to_dict(airports: Iterable[Airport]) -> AirportDict:
+    """Return an airports dictionary that maps the IATA airport code of each
+    Airport in airports to its inner dictionary, in the same form as
+    read_airports.
+
+    >>> example_airport_file = flight_example_data.create_airport_file()
+    >>> actual = airports_to_dict(iter_airports(example_airport_file))
+    >>> actual['TRO']['Tz']
+    'Australia/Sydney'
+    """
+    return {airport.iata: airport_to_details(airport) for airport in airports}
+
+
+def airport_to_details(airport: Airport) -> dict:
+    """Return the inner dictionary of an airports dictionary for airport.
+
+    >>> airport_file = flight_example_data.create_airport_file()
+    >>> airport = next(iter_airports(airport_file))
+    >>> airport_to_details(airport)['City']
+    'Richmond'
+    """
+    return {'Name': airport.name,
+            'City': airport.city,
+            'Country': airport.country,
+            'Latitude': airport.latitude,
+            'Longitude': airport.longitude,
+            'Tz': airport.tz}
+
+
+@flight_instrumentation.instrumented
 def read_airports(airports_data: TextIO) -> AirportDict:
     """Return an airports dictionary based on the data in the open file
     referred to by airports_data.  The airports dictionary maps each IATA
@@ -61,42 +172,234 @@ def read_airports(airports_data: TextIO) -> AirportDict:
     >>> actual == flight_example_data.create_example_airports()
     True
     """
-    airports = {}
-
-    for line in airports_data:
-        # Split the line into fields
-        fields = line.replace('"', '').strip().split(',')
-
-        iata_code = fields[INDEX_AIRPORTS_IATA]
-        airport_name = fields[INDEX_AIRPORTS_NAME]
-        city = fields[INDEX_AIRPORTS_CITY]
-        country = fields[INDEX_AIRPORTS_COUNTRY]
-        latitude = float(fields[INDEX_AIRPORTS_LATITUDE]) 
-        # couldn't convrt latitude to float
-        longitude = float(fields[INDEX_AIRPORTS_LONGITUDE])
-        timezone = fields[INDEX_AIRPORTS_TZ]
-
-        # airport_details is a dictionary containing all the information found
-        # in airport_data related to an IATA  
-        airport_details = {
-            'Name': airport_name,
-            'City': city,
-            'Country': country,
-            'Latitude': latitude,
-            'Longitude': longitude,
-            'Tz': timezone}
-        
-        airports[iata_code] = airport_details
+    airports = airports_to_dict(iter_airports(airports_data))
+    if flight_instrumentation.ENABLED:
+        flight_instrumentation.count('flight_reader.airports_parsed',
+                                     len(airports))
     return airports
 
 
-def read_routes(routes_data: TextIO, airports: AirportDict) -> RouteDict:
+class LazyAirportDict(Mapping):
+    """A read-only airports dictionary that keeps the line of airport data
+    for each IATA airport code, and only parses a line into its inner
+    dictionary the first time that airport is looked up.  Looking up codes,
+    iterating over them and counting them never parse a line.
+
+    It can be used wherever an AirportDict is only read.
+    """
+    _rows: dict[str, str | dict]
+
+    def __init__(self, airports_data: Iterable[str]) -> None:
+        """Initialize a new dictionary of the airports in the lines of airport
+        data in airports_data, which are only split far enough to find their
+        IATA codes.
+
+        Preconditions:
+            - The data in airports_data is formatted correctly
+
+        >>> example_airport_file = flight_example_data.create_airport_file()
+        >>> airports = LazyAirportDict(example_airport_file)
+        >>> len(airports), 'TRO' in airports
+        (5, True)
+        >>> airports['TRO']['Tz']
+        'Australia/Sydney'
+        >>> example_airport_file = flight_example_data.create_airport_file()
+        >>> airports == read_airports(example_airport_file)
+        True
+        """
+        rows = {}
+        for line in airports_data:
+            line = line.strip()
+            if not line:
+                continue
+
+            # IATA codes never contain quotes or commas, so the code is
+            # everything up to the first one that ends it
+            if line[0] == '"':
+                rows[line[1:line.index('"', 1)]] = line
+            else:
+                rows[line.split(',', 1)[0]] = line
+        self._rows = rows
+
+    def __getitem__(self, code: str) -> dict:
+        """Return the inner dictionary of the airport with IATA code code,
+        parsing its line if it has not been parsed yet.
+        """
+        details = self._rows[code]
+        if isinstance(details, str):
+            details = airport_to_details(next(iter_airports([details])))
+            self._rows[code] = details
+        return details
+
+    def __contains__(self, code: object) -> bool:
+        """Return whether there is an airport with IATA code code."""
+        return code in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the IATA codes, in the order of the data."""
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        """Return the number of airports."""
+        return len(self._rows)
+
+    def num_parsed(self) -> int:
+        """Return the number of airports whose lines have been parsed.
+
+        >>> example_airport_file = flight_example_data.create_airport_file()
+        >>> airports = LazyAirportDict(example_airport_file)
+        >>> _ = airports['SYD']['Name'], airports['SYD']['City']
+        >>> airports.num_parsed()
+        1
+        """
+        return sum(1 for details in self._rows.values()
+                   if not isinstance(details, str))
+
+
+def read_airports_lazy(airports_data: TextIO) -> LazyAirportDict:
+    """Return a LazyAirportDict of the airport data in the open file referred
+    to by airports_data, with the same contents as read_airports would
+    return, but parsing each airport's data only when it is looked up.
+
+    >>> example_airport_file = flight_example_data.create_airport_file()
+    >>> airports = read_airports_lazy(example_airport_file)
+    >>> airports['GFN']['Latitude']
+    -29.7593994140625
+    """
+    return LazyAirportDict(airports_data)
+
+
+class RouteParser:
+    """An incremental parser for route data in the SOURCE: / DESTINATIONS
+    BEGIN / DESTINATIONS END block format.  Data can be given in chunks of
+    any size, split anywhere, so a file or a network stream can be parsed
+    without holding all of it in memory.
+
+    Each line is split once, and every airport code and airplane code is
+    interned, so equal codes share one string.
+
+    Instance Attributes:
+        - routes: the routes parsed so far
+        - airports: only routes whose source and destination airport codes
+          are in airports are kept
+        - share_aircraft: whether routes with the same airplanes share one
+          SharedAircraft list, which cannot be changed in place, rather than
+          each having its own list
+    """
+    routes: RouteDict
+    airports: Container[str]
+    share_aircraft: bool
+    _source: str | None
+    _pending: str
+
+    def __init__(self, airports: Container[str],
+                 share_aircraft: bool = False) -> None:
+        """Initialize a new parser that keeps the routes between airports in
+        airports, sharing the lists of airplanes if share_aircraft is True.
+
+        >>> parser = RouteParser(flight_example_data.create_example_airports())
+        >>> parser.routes
+        {}
+        """
+        self.routes = {}
+        self.airports = airports
+        self.share_aircraft = share_aircraft
+        self._source = None
+        self._pending = ''
+
+    def feed(self, chunk: str) -> None:
+        """Parse the route data in chunk, which continues the data given to
+        the previous calls.  An incomplete last line is kept until the next
+        call to feed or close.
+
+        >>> parser = RouteParser(flight_example_data.create_example_airports())
+        >>> parser.feed('SOURCE: TRO\\nDESTINATIONS BEGIN\\nSY')
+        >>> parser.feed('D SF3 DH4\\nDESTINATIONS END\\n')
+        >>> parser.routes
+        {'TRO': {'SYD': ['SF3', 'DH4']}}
+        """
+        lines = (self._pending + chunk).split('\n')
+        self._pending = lines.pop()
+        self._parse_lines(lines)
+
+    def close(self) -> RouteDict:
+        """Parse any data left from the last call to feed and return the
+        routes.
+
+        >>> parser = RouteParser(flight_example_data.create_example_airports())
+        >>> parser.feed('SOURCE: GFN\\nDESTINATIONS BEGIN\\nTRO SF3')
+        >>> parser.close()
+        {'GFN': {'TRO': ['SF3']}}
+        """
+        if self._pending:
+            self._parse_lines([self._pending])
+            self._pending = ''
+        return self.routes
+
+    def _parse_lines(self, lines: list[str]) -> None:
+        """Parse each complete line in lines."""
+        if flight_instrumentation.ENABLED:
+            flight_instrumentation.count('flight_reader.route_lines_parsed',
+                                         len(lines))
+        routes = self.routes
+        airports = self.airports
+        share = flight_shared_aircraft.share_aircraft \
+            if self.share_aircraft else None
+        source_airport = self._source
+        destinations = routes.get(source_airport)
+
+        for line in lines:
+            fields = line.split()
+            if not fields:
+                continue
+            first = fields[0]
+
+            # If line starts with 'SOURCE:', we have reached a new source
+            # airport
+            if first == 'SOURCE:':
+                source_airport = fields[1]
+                if source_airport in airports:
+                    source_airport = intern(source_airport)
+                    if source_airport not in routes:
+                        routes[source_airport] = {}
+                    destinations = routes[source_airport]
+                else:
+                    source_airport = None
+                    destinations = None
+
+            elif first == 'DESTINATIONS':
+                continue
+
+            # Otherwise, it is a destination line (an IATA code followed by
+            # the plane types), which is only kept for a known source
+            elif destinations is not None and first in airports:
+                if share is not None:
+                    destinations[intern(first)] = share(
+                        (*destinations.get(first, ()), *fields[1:]))
+                else:
+                    if first not in destinations:
+                        destinations[intern(first)] = []
+                    destinations[first].extend(map(intern, fields[1:]))
+
+        self._source = source_airport
+
+
+@flight_instrumentation.instrumented
+def read_routes(routes_data: TextIO, airports: AirportDict,
+                share_aircraft: bool = False) -> RouteDict:
     """Return a routes dictionary based on the data in the open file
     referred to by routes_data and given airports dictionary.
 
     Do not include routes with a source or destination airport codes that are
     not in airports.
 
+    If share_aircraft is True, routes with the same airplanes share one
+    SharedAircraft list, which takes much less memory for large files.  The
+    lists then cannot be changed in place: routes[source][destination].append
+    raises a TypeError, and the airplanes of a route must be changed with
+    flight_shared_aircraft.add_plane_to_route and remove_plane_from_route,
+    as RouteStore does.  Otherwise every route has its own list.
+
     Preconditions:
         - The data in routes_data is formatted correctly
 
@@ -105,38 +408,18 @@ def read_routes(routes_data: TextIO, airports: AirportDict) -> RouteDict:
     >>> actual = read_routes(example_routes_file, example_airports)
     >>> actual == flight_example_data.create_example_routes()
     True
+    >>> example_routes_file.seek(0)
+    0
+    >>> shared = read_routes(example_routes_file, example_airports, True)
+    >>> shared['GFN']['TRO'] is shared['JCK']['RCM']
+    True
     """
-    routes = {}
-    source_airport = None
-    
-    for line in routes_data:
-        line = line.strip()
-
-        # If line starts with 'SOURCE:', we have reached a new source airport
-        if line.startswith('SOURCE:'):
-            source_airport = line.split()[1]
-            if source_airport in airports:
-                if source_airport not in routes:
-                    routes[source_airport] = {}
-            else:
-                source_airport = None
-        
-        elif line == 'DESTINATIONS BEGIN':
-            continue
-        elif line == 'DESTINATIONS END':
-            continue
-        
-        # Otherwise, its a source airport (a line containing 
-        # IATA code and plane type)
-        elif source_airport:
-            destination = line.split()
-            airplanes = line.split()
-            if destination in airports:
-                if destination not in routes[source_airport]:
-                    routes[source_airport][destination] = []
-                routes[source_airport][destination].append(airplanes)
-
-    return routes    
+    parser = RouteParser(airports, share_aircraft)
+    chunk = routes_data.read(ROUTES_CHUNK_SIZE)
+    while chunk:
+        parser.feed(chunk)
+        chunk = routes_data.read(ROUTES_CHUNK_SIZE)
+    return parser.close()
 
 
 if __name__ == '__main__':
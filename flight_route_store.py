@@ -0,0 +1,310 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from flight_aircraft_index import AircraftIndex
+from flight_constants import ADD_PLANE, ADD_ROUTE, REMOVE_PLANE, \
+    REMOVE_ROUTE, RESET, RESET_PLANES, RouteChange, RouteDict
+from flight_functions import RoutesVersion, decomission_plane, \
+    get_routes_structure_version, get_routes_version, mark_routes_changed, \
+    track_routes
+from flight_shared_aircraft import add_plane_to_route, \
+    remove_plane_from_route
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The default number of changes a RouteStore keeps in its journal
+DEFAULT_MAX_JOURNAL = 10000
+
+
+################################################################################
+# A RouteStore is the one place a RouteDict is changed.  Every change is given
+# the next version number and appended to the journal, so a structure derived
+# from the routes can remember the version it was built for and later apply
+# only the changes since then, rather than being rebuilt.  Only the latest
+# changes are kept, and a structure that has fallen further behind than that
+# is told to rebuild by a RESET instead.
+################################################################################
+
+class RouteStore:
+    """A RouteDict with operations to change it and a journal of changes.
+
+    Instance Attributes:
+        - routes: the routes that are stored, changed in place
+        - version: the number of changes made through this store
+        - journal: the latest changes made through this store, oldest
+          first; the change at position i has version
+          self.version - len(self.journal) + i + 1
+        - max_journal: the number of changes the journal keeps; once it holds
+          more, the oldest are dropped until it holds half as many
+        - aircraft_index: an index of the routes using each airplane, kept in
+          sync with routes, or None if the store does not keep one
+    """
+    routes: RouteDict
+    version: int
+    journal: list[RouteChange]
+    max_journal: int
+    aircraft_index: AircraftIndex | None
+    _tracked: RoutesVersion
+    _routes_version: int
+    _structure_version: int
+
+    def __init__(self, routes: RouteDict, index_aircraft: bool = True,
+                 max_journal: int = DEFAULT_MAX_JOURNAL) -> None:
+        """Initialize a new store of routes, keeping the latest max_journal
+        changes.  If index_aircraft is True, keep an AircraftIndex of routes
+        so that decommissioning a plane only visits the routes that use it.
+
+        Preconditions:
+            - max_journal >= 1
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.version, store.journal
+        (0, [])
+        """
+        self.routes = routes
+        self._tracked = track_routes(routes)
+        self.version = 0
+        self.journal = []
+        self.max_journal = max_journal
+        self.aircraft_index = AircraftIndex(routes) if index_aircraft \
+            else None
+        self._routes_version = get_routes_version(routes)
+        self._structure_version = get_routes_structure_version(routes)
+
+    def _check_version(self) -> None:
+        """Record a RESET change if routes was changed without going through
+        this store, or a RESET_PLANES change if only their airplanes were.
+        """
+        if get_routes_version(self.routes) != self._routes_version:
+            structure_version = get_routes_structure_version(self.routes)
+            kind = RESET_PLANES \
+                if structure_version == self._structure_version else RESET
+            self._record(kind, '', '', ())
+            self._routes_version = get_routes_version(self.routes)
+            self._structure_version = structure_version
+            if self.aircraft_index is not None:
+                self.aircraft_index.apply_changes(self.journal[-1:])
+            self._trim_journal()
+
+    def _record(self, kind: str, source: str, destination: str,
+                planes: tuple[str, ...]) -> None:
+        """Append a change of the given kind to the journal."""
+        self.version += 1
+        self.journal.append(RouteChange(self.version, kind, source,
+                                        destination, planes))
+
+    def _trim_journal(self) -> None:
+        """Drop the oldest changes from the journal if it holds more than
+        max_journal.
+        """
+        if len(self.journal) > self.max_journal:
+            del self.journal[:len(self.journal) - self.max_journal // 2]
+
+    def _finish(self, version: int) -> None:
+        """Mark routes as changed if there have been changes since version,
+        and bring the aircraft index up to date with them.
+        """
+        if self.version == version:
+            return
+        changes = self.journal[version - self.version:]
+        planes_only = all(change.kind in (ADD_PLANE, REMOVE_PLANE)
+                          for change in changes)
+        mark_routes_changed(self.routes, planes_only)
+        self._routes_version = get_routes_version(self.routes)
+        self._structure_version = get_routes_structure_version(self.routes)
+        if self.aircraft_index is not None:
+            self.aircraft_index.apply_changes(changes)
+        self._trim_journal()
+
+    def changes_since(self, version: int) -> list[RouteChange]:
+        """Return the changes made through this store after version, oldest
+        first.  If some of them have been dropped from the journal, return a
+        single RESET change instead, since they cannot be applied.
+
+        Preconditions:
+            - 0 <= version <= self.version
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.add_plane('SYD', 'TRO', 'DH4')
+        >>> [change.kind for change in store.changes_since(0)]
+        ['add_route', 'add_plane']
+        >>> store.changes_since(2)
+        []
+        """
+        self._check_version()
+        if self.version - version > len(self.journal):
+            return [RouteChange(self.version, RESET, '', '', ())]
+        return self.journal[len(self.journal) - (self.version - version):]
+
+    def is_direct_flight(self, source: str, destination: str) -> bool:
+        """Return True if there exists a direct flight from source to
+        destination.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.is_direct_flight('TRO', 'SYD')
+        True
+        """
+        return destination in self.routes.get(source, {})
+
+    def get_airplanes(self, source: str, destination: str) -> list[str]:
+        """Return a copy of the list of airplanes used on the route from
+        source to destination, or an empty list if there is no such route.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.get_airplanes('TRO', 'SYD')
+        ['SF3', 'DH4']
+        """
+        return list(self.routes.get(source, {}).get(destination, ()))
+
+    def add_route(self, source: str, destination: str) -> bool:
+        """Add a route from source to destination with no planes, and return
+        True, unless there already is one.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.add_route('SYD', 'TRO'), store.add_route('SYD', 'TRO')
+        (True, False)
+        >>> store.routes['SYD']
+        {'TRO': []}
+        """
+        self._check_version()
+        version = self.version
+        destinations = self.routes.get(source)
+        if destinations is None:
+            destinations = self.routes[source] = {}
+        if destination in destinations:
+            return False
+        destinations[destination] = []
+        self._record(ADD_ROUTE, source, destination, ())
+        self._finish(version)
+        return True
+
+    def remove_route(self, source: str, destination: str) -> bool:
+        """Remove the route from source to destination and return True,
+        unless there is no such route.  The source airport is kept, even if
+        it has no other routes.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.remove_route('TRO', 'SYD')
+        True
+        >>> store.journal[-1].planes
+        ('SF3', 'DH4')
+        >>> store.aircraft_index.get_routes_using('DH4')
+        []
+        """
+        self._check_version()
+        version = self.version
+        destinations = self.routes.get(source, {})
+        if destination not in destinations:
+            return False
+        planes = destinations.pop(destination)
+        self._record(REMOVE_ROUTE, source, destination, tuple(planes))
+        self._finish(version)
+        return True
+
+    def add_plane(self, source: str, destination: str, plane: str) -> None:
+        """Add plane to the route from source to destination, adding the
+        route first if there is none.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.add_plane('TRO', 'SYD', '737')
+        >>> store.routes['TRO']['SYD']
+        ['SF3', 'DH4', '737']
+        >>> store.aircraft_index.get_routes_using('737')
+        [('TRO', 'SYD')]
+        """
+        self._check_version()
+        version = self.version
+        destinations = self.routes.get(source)
+        if destinations is None:
+            destinations = self.routes[source] = {}
+        if destination not in destinations:
+            destinations[destination] = []
+            self._record(ADD_ROUTE, source, destination, ())
+        add_plane_to_route(destinations, destination, plane)
+        self._record(ADD_PLANE, source, destination, (plane,))
+        self._finish(version)
+
+    def remove_plane(self, source: str, destination: str, plane: str) -> \
+            bool:
+        """Remove one copy of plane from the route from source to destination
+        and return True, unless the route does not use plane.  The route is
+        kept, even if it has no planes left.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.remove_plane('TRO', 'SYD', 'SF3')
+        True
+        >>> store.remove_plane('TRO', 'SYD', 'SF3')
+        False
+        >>> store.routes['TRO']['SYD']
+        ['DH4']
+        """
+        self._check_version()
+        version = self.version
+        destinations = self.routes.get(source, {})
+        if plane not in destinations.get(destination, ()):
+            return False
+        remove_plane_from_route(destinations, destination, plane)
+        self._record(REMOVE_PLANE, source, destination, (plane,))
+        self._finish(version)
+        return True
+
+    def decommission(self, plane: str) -> list[tuple[str, str]]:
+        """Remove one copy of plane from every route that uses it and return
+        the sorted list of routes left with no planes, like
+        flight_functions.decomission_plane.  If this store keeps an aircraft
+        index, only the routes that use plane are visited, and each is
+        journalled as a REMOVE_PLANE change.  Otherwise every route is
+        checked by decomission_plane, and the whole decommission is
+        journalled as one RESET_PLANES change.
+
+        >>> store = RouteStore(flight_example_data.create_example_routes())
+        >>> store.decommission('SF3')
+        [('GFN', 'TRO'), ('JCK', 'RCM'), ('RCM', 'JCK'), ('TRO', 'GFN')]
+        >>> len(store.changes_since(0))
+        5
+        >>> store = RouteStore(flight_example_data.create_example_routes(),
+        ...                    index_aircraft=False)
+        >>> store.decommission('SF3')[0]
+        ('GFN', 'TRO')
+        >>> [change.kind for change in store.changes_since(0)]
+        ['reset_planes']
+        """
+        self._check_version()
+        if self.aircraft_index is None:
+            routes_with_no_planes = decomission_plane(self.routes, plane)
+            self._check_version()
+            return routes_with_no_planes
+
+        version = self.version
+        routes_with_no_planes = []
+        change = (plane,)
+        for source, destination in self.aircraft_index.get_routes_using(plane):
+            airplanes = remove_plane_from_route(self.routes[source],
+                                                destination, plane)
+            self._record(REMOVE_PLANE, source, destination, change)
+            if not airplanes:
+                routes_with_no_planes.append((source, destination))
+        self._finish(version)
+
+        routes_with_no_planes.sort()
+        return routes_with_no_planes
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
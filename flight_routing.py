@@ -0,0 +1,374 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import heapq
+from typing import Collection, NamedTuple
+
+from flight_constants import AirportDict, RouteDict
+from flight_functions import RoutesVersion, get_routes_version, track_routes
+from flight_spatial import haversine_km
+
+import flight_example_data
+
+
+class ShortestRoute(NamedTuple):
+    """The shortest route found between two airports.
+
+    Instance Attributes:
+        - path: the IATA airport codes along the route, starting with the
+          source and ending with the destination
+        - distance: the total great-circle length of the route, in kilometres
+    """
+    path: list[str]
+    distance: float
+
+
+def search_route(routes: RouteDict, airports: AirportDict, source: str,
+                 destination: str, use_heuristic: bool = True,
+                 max_hops: int | None = None,
+                 allowed_aircraft: Collection[str] | None = None) -> \
+        tuple[ShortestRoute | None, int]:
+    """Return the shortest route from source to destination in routes, or
+    None if there is none, together with the number of (airport, hops)
+    labels the search expanded.  The length of each flight is the
+    great-circle distance between its airports.
+
+    The search is Dijkstra's algorithm with a binary heap.  If use_heuristic
+    is True it is A*, guided by the great-circle distance to destination,
+    which never overestimates the remaining length.
+
+    If max_hops is not None, the route takes at most max_hops direct flights.
+    If allowed_aircraft is not None, only flights that use at least one of
+    the airplanes in allowed_aircraft are taken.
+
+    Airports that are not in airports have no known position, so flights to
+    them are never taken, and there is no route to or from them.
+
+    Preconditions:
+        - max_hops is None or max_hops >= 0
+
+    >>> routes = flight_example_data.create_example_routes()
+    >>> airports = flight_example_data.create_example_airports()
+    >>> route, expanded = search_route(routes, airports, 'GFN', 'SYD')
+    >>> route.path
+    ['GFN', 'TRO', 'SYD']
+    >>> search_route(routes, airports, 'GFN', 'SYD', max_hops=1)
+    (None, 2)
+    >>> search_route(routes, airports, 'GFN', 'YYZ')
+    (None, 0)
+    """
+    if allowed_aircraft is not None:
+        allowed_aircraft = set(allowed_aircraft)
+
+    coordinates = {}
+
+    def get_coordinates(airport: str) -> tuple[float, float] | None:
+        if airport not in coordinates:
+            details = airports.get(airport)
+            coordinates[airport] = None if details is None else \
+                (float(details['Latitude']), float(details['Longitude']))
+        return coordinates[airport]
+
+    target = get_coordinates(destination)
+    if target is None or get_coordinates(source) is None:
+        return None, 0
+
+    def estimate(airport: str) -> float:
+        if not use_heuristic:
+            return 0.0
+        return haversine_km(*get_coordinates(airport), *target)
+
+    # A label (airport, hops) is reaching airport with exactly hops flights.
+    # A label is dominated, and skipped, once the same airport has been
+    # expanded with no more hops, because that expansion was no longer.
+    # Without a hop limit the number of hops does not matter, so every label
+    # of an airport has hops 0.
+    step = 0 if max_hops is None else 1
+    fewest_expanded_hops = {}
+    parents = {(source, 0): None}
+    distances = {(source, 0): 0.0}
+    heap = [(estimate(source), 0.0, source, 0)]
+    expanded = 0
+
+    while heap:
+        _, distance, airport, hops = heapq.heappop(heap)
+        if fewest_expanded_hops.get(airport, hops + 1) <= hops or \
+                distance > distances[(airport, hops)]:
+            continue
+        fewest_expanded_hops[airport] = hops
+        expanded += 1
+
+        if airport == destination:
+            path = []
+            label = (airport, hops)
+            while label is not None:
+                path.append(label[0])
+                label = parents[label]
+            path.reverse()
+            return ShortestRoute(path, distance), expanded
+
+        if max_hops is not None and hops == max_hops:
+            continue
+        next_hops = hops + step
+        for neighbor, airplanes in routes.get(airport, {}).items():
+            if allowed_aircraft is not None and \
+                    allowed_aircraft.isdisjoint(airplanes):
+                continue
+            if fewest_expanded_hops.get(neighbor, next_hops + 1) <= next_hops:
+                continue
+            if get_coordinates(neighbor) is None:
+                continue
+            new_distance = distance + haversine_km(*get_coordinates(airport),
+                                                   *get_coordinates(neighbor))
+            label = (neighbor, next_hops)
+            if new_distance < distances.get(label, float('inf')):
+                distances[label] = new_distance
+                parents[label] = (airport, hops)
+                heapq.heappush(heap, (new_distance + estimate(neighbor),
+                                      new_distance, neighbor, next_hops))
+
+    return None, expanded
+
+
+def find_shortest_route(routes: RouteDict, airports: AirportDict,
+                        source: str, destination: str,
+                        max_hops: int | None = None,
+                        allowed_aircraft: Collection[str] | None = None) -> \
+        ShortestRoute | None:
+    """Return the shortest route from source to destination by great-circle
+    distance, found with A*, or None if there is none.  See search_route for
+    max_hops and allowed_aircraft.
+
+    >>> routes = flight_example_data.create_example_routes()
+    >>> airports = flight_example_data.create_example_airports()
+    >>> route = find_shortest_route(routes, airports, 'TRO', 'SYD')
+    >>> route.path, round(route.distance)
+    (['TRO', 'SYD'], 261)
+    >>> find_shortest_route(routes, airports, 'TRO', 'SYD',
+    ...                     allowed_aircraft=['737']) is None
+    True
+    """
+    return search_route(routes, airports, source, destination, True,
+                        max_hops, allowed_aircraft)[0]
+
+
+def find_shortest_route_dijkstra(routes: RouteDict, airports: AirportDict,
+                                 source: str, destination: str,
+                                 max_hops: int | None = None,
+                                 allowed_aircraft: Collection[str] | None =
+                                 None) -> ShortestRoute | None:
+    """Return the same route as find_shortest_route, found with Dijkstra's
+    algorithm instead of A*.
+
+    >>> routes = flight_example_data.create_example_routes()
+    >>> airports = flight_example_data.create_example_airports()
+    >>> find_shortest_route_dijkstra(routes, airports, 'GFN', 'SYD').path
+    ['GFN', 'TRO', 'SYD']
+    """
+    return search_route(routes, airports, source, destination, False,
+                        max_hops, allowed_aircraft)[0]
+
+
+################################################################################
+# Fewest hops between two airports
+################################################################################
+
+class MinHopPath(NamedTuple):
+    """A route between two airports that takes the fewest direct flights.
+
+    Instance Attributes:
+        - hops: the number of direct flights taken
+        - path: the IATA airport codes along the route, starting with the
+          source and ending with the destination
+    """
+    hops: int
+    path: list[str]
+
+
+def build_reverse_routes(routes: RouteDict) -> dict[str, list[str]]:
+    """Return a dictionary that maps each airport with a direct flight to it
+    in routes to the list of sources of those flights, in the order of
+    routes.
+
+    >>> routes = flight_example_data.create_example_routes()
+    >>> build_reverse_routes(routes)['TRO']
+    ['GFN']
+    >>> build_reverse_routes(routes)['SYD']
+    ['TRO']
+    """
+    reverse_routes = {}
+    for source, destinations in routes.items():
+        for destination in destinations:
+            if destination in reverse_routes:
+                reverse_routes[destination].append(source)
+            else:
+                reverse_routes[destination] = [source]
+    return reverse_routes
+
+
+def _join_paths(forward_parents: dict[str, str | None],
+                backward_parents: dict[str, str | None],
+                meeting: str) -> MinHopPath:
+    """Return the path from the source of forward_parents through meeting to
+    the destination of backward_parents.
+    """
+    path = []
+    airport = meeting
+    while airport is not None:
+        path.append(airport)
+        airport = forward_parents[airport]
+    path.reverse()
+    airport = backward_parents[meeting]
+    while airport is not None:
+        path.append(airport)
+        airport = backward_parents[airport]
+    return MinHopPath(len(path) - 1, path)
+
+
+def search_min_hops(routes: RouteDict, reverse_routes: dict[str, list[str]],
+                    source: str, destination: str) -> \
+        tuple[MinHopPath | None, int]:
+    """Return a route from source to destination in routes that takes the
+    fewest direct flights, or None if there is none, together with the
+    number of airports the search expanded.  reverse_routes must be
+    build_reverse_routes(routes).
+
+    Every route returned with at least one flight is valid according to
+    is_valid_flight_sequence, so like it, a route only passes through and
+    arrives at airports that are sources in routes.  The exception is the
+    route from an airport in routes to itself, which takes no flights and is
+    just [source], a sequence that is_valid_flight_sequence rejects for
+    being shorter than 2 airports.
+
+    The search is a breadth-first search from both ends at once, which
+    expands a whole level of whichever side has fewer flights to examine
+    until the two sides meet.  The first airport reached from both sides is
+    on a route with the fewest flights, because every airport up to the
+    current level of each side has already been reached.
+
+    >>> routes = flight_example_data.create_example_routes()
+    >>> reverse_routes = build_reverse_routes(routes)
+    >>> search_min_hops(routes, reverse_routes, 'GFN', 'TRO')
+    (MinHopPath(hops=1, path=['GFN', 'TRO']), 1)
+    >>> search_min_hops(routes, reverse_routes, 'GFN', 'SYD')
+    (None, 0)
+    >>> search_min_hops(routes, reverse_routes, 'GFN', 'RCM')
+    (None, 3)
+    >>> search_min_hops(routes, reverse_routes, 'GFN', 'GFN')
+    (MinHopPath(hops=0, path=['GFN']), 0)
+    """
+    if source not in routes or destination not in routes:
+        return None, 0
+    if source == destination:
+        return MinHopPath(0, [source]), 0
+
+    # Each side maps every airport it has reached to the airport it was
+    # reached from, which is the next airport towards its own end
+    forward_parents = {source: None}
+    backward_parents = {destination: None}
+    forward_frontier = [source]
+    backward_frontier = [destination]
+    no_airports = ()
+    expanded = 0
+
+    while forward_frontier and backward_frontier:
+        forward_cost = sum(len(routes[airport])
+                           for airport in forward_frontier)
+        backward_cost = sum(len(reverse_routes.get(airport, no_airports))
+                            for airport in backward_frontier)
+        next_frontier = []
+        if forward_cost <= backward_cost:
+            for airport in forward_frontier:
+                expanded += 1
+                for neighbor in routes[airport]:
+                    # An airport that is not a source in routes can be on no
+                    # valid route, since the destination is a source
+                    if neighbor in forward_parents or neighbor not in routes:
+                        continue
+                    forward_parents[neighbor] = airport
+                    if neighbor in backward_parents:
+                        return _join_paths(forward_parents, backward_parents,
+                                           neighbor), expanded
+                    next_frontier.append(neighbor)
+            forward_frontier = next_frontier
+        else:
+            for airport in backward_frontier:
+                expanded += 1
+                for neighbor in reverse_routes.get(airport, no_airports):
+                    if neighbor in backward_parents:
+                        continue
+                    backward_parents[neighbor] = airport
+                    if neighbor in forward_parents:
+                        return _join_paths(forward_parents, backward_parents,
+                                           neighbor), expanded
+                    next_frontier.append(neighbor)
+            backward_frontier = next_frontier
+
+    return None, expanded
+
+
+class MinHopRouter:
+    """Answers fewest-hop queries about routes with search_min_hops, keeping
+    the reverse routes it needs between queries.  The reverse routes are
+    rebuilt when routes is changed by a function that calls
+    flight_functions.mark_routes_changed.
+
+    Instance Attributes:
+        - routes: the routes that queries are answered from
+        - reverse_routes: build_reverse_routes(routes)
+    """
+    routes: RouteDict
+    reverse_routes: dict[str, list[str]]
+    _tracked: RoutesVersion
+    _version: int
+
+    def __init__(self, routes: RouteDict) -> None:
+        """Initialize a new router for routes.
+
+        >>> router = MinHopRouter(flight_example_data.create_example_routes())
+        >>> router.reverse_routes['GFN']
+        ['TRO']
+        """
+        self.routes = routes
+        self._tracked = track_routes(routes)
+        self.reverse_routes = build_reverse_routes(routes)
+        self._version = get_routes_version(routes)
+
+    def search(self, source: str, destination: str) -> \
+            tuple[MinHopPath | None, int]:
+        """Return search_min_hops(self.routes, self.reverse_routes, source,
+        destination).
+        """
+        if get_routes_version(self.routes) != self._version:
+            self.reverse_routes = build_reverse_routes(self.routes)
+            self._version = get_routes_version(self.routes)
+        return search_min_hops(self.routes, self.reverse_routes, source,
+                               destination)
+
+    def find_min_hop_path(self, source: str, destination: str) -> \
+            MinHopPath | None:
+        """Return a route from source to destination that takes the fewest
+        direct flights, or None if there is none.  See search_min_hops.
+
+        >>> router = MinHopRouter(flight_example_data.create_example_routes())
+        >>> router.find_min_hop_path('TRO', 'GFN')
+        MinHopPath(hops=1, path=['TRO', 'GFN'])
+        >>> router.find_min_hop_path('TRO', 'RCM') is None
+        True
+        """
+        return self.search(source, destination)[0]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,421 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import csv
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from io import StringIO
+from itertools import islice
+from typing import Iterable, NamedTuple, TextIO
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from flight_constants import AirportDict, RouteDict
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The fewest minutes needed to change planes at an airport
+MIN_TRANSFER_MINUTES = 30
+
+# A time later than any in a schedule, for airports that cannot be reached
+NEVER = 2 ** 31 - 1
+
+# The column number for each field in the schedule data csv file
+INDEX_SCHEDULE_SOURCE = 0
+INDEX_SCHEDULE_DESTINATION = 1
+INDEX_SCHEDULE_AIRPLANE = 2
+INDEX_SCHEDULE_DEPARTURE = 3
+INDEX_SCHEDULE_DURATION = 4
+
+
+################################################################################
+# A schedule is the timed departures of one day.  The schedule data extends
+# the routes data with one csv line for each departure:
+#     source,destination,airplane,departure,duration
+# where departure is the local time HH:MM at the source airport, in the time
+# zone of its Tz field, and duration is the length of the flight in minutes.
+# Airports whose Tz is unknown are taken to be on UTC.
+#
+# Inside a Schedule every time is a number of minutes since midnight UTC at
+# the start of its day, so times at different airports can be compared, and
+# the departures are kept in arrays sorted by departure time.  Queries are
+# answered with the Connection Scan Algorithm, which visits each departure at
+# most once in time order.
+################################################################################
+
+class Connection(NamedTuple):
+    """One timed departure of a flight.
+
+    Instance Attributes:
+        - source: the IATA code of the airport the flight leaves from
+        - destination: the IATA code of the airport the flight arrives at
+        - airplane: the airplane used for the flight
+        - departure: when the flight leaves, in minutes since midnight UTC
+        - arrival: when the flight arrives, in minutes since midnight UTC
+    """
+    source: str
+    destination: str
+    airplane: str
+    departure: int
+    arrival: int
+
+
+# Maps each Tz field to its time zone, since looking one up reads tzdata
+_zones: dict[str, ZoneInfo | timezone] = {}
+
+
+def get_timezone(airports: AirportDict, code: str) -> ZoneInfo | timezone:
+    """Return the time zone of the airport with IATA code code in airports,
+    or UTC if it is not known.
+
+    >>> airports = flight_example_data.create_example_airports()
+    >>> get_timezone(airports, 'SYD')
+    zoneinfo.ZoneInfo(key='Australia/Sydney')
+    >>> get_timezone(airports, 'RCM')
+    datetime.timezone.utc
+    """
+    name = airports[code]['Tz'] if code in airports else None
+    zone = _zones.get(name)
+    if zone is None:
+        try:
+            zone = ZoneInfo(name)
+        except (TypeError, ValueError, ZoneInfoNotFoundError):
+            zone = timezone.utc
+        _zones[name] = zone
+    return zone
+
+
+def parse_local_time(text: str) -> int:
+    """Return the number of minutes after midnight of the time text, in the
+    format HH:MM.
+
+    >>> parse_local_time('07:45')
+    465
+    """
+    hours, minutes = text.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class Schedule:
+    """The timed departures of one day, sorted by departure time.
+
+    Instance Attributes:
+        - day: the date of the schedule, whose midnight UTC is minute 0
+        - codes: the IATA airport code of each airport id
+        - ids: maps each IATA airport code to its airport id
+        - timezones: the time zone of each airport id
+        - departures: the departure time of each connection, in order
+        - arrivals: the arrival time of each connection
+        - sources: the airport id each connection leaves from
+        - destinations: the airport id each connection arrives at
+        - airplanes: the airplane used for each connection
+    """
+    day: date
+    codes: list[str]
+    ids: dict[str, int]
+    timezones: list[ZoneInfo | timezone]
+    departures: array
+    arrivals: array
+    sources: array
+    destinations: array
+    airplanes: list[str]
+
+    def __init__(self, connections: Iterable[Connection],
+                 airports: AirportDict, day: date) -> None:
+        """Initialize a new schedule of connections on day, between the
+        airports in airports.
+
+        Preconditions:
+            - every airport of connections is in airports
+
+        >>> schedule = Schedule([Connection('TRO', 'SYD', 'SF3', 60, 115),
+        ...                      Connection('GFN', 'TRO', 'SF3', 0, 40)],
+        ...                     flight_example_data.create_example_airports(),
+        ...                     date(2024, 6, 3))
+        >>> list(schedule.departures), [schedule.codes[i]
+        ...                             for i in schedule.sources]
+        ([0, 60], ['GFN', 'TRO'])
+        """
+        self.day = day
+        ordered = sorted(connections, key=lambda connection:
+                         (connection.departure, connection.arrival))
+        self.codes = sorted({code for connection in ordered
+                             for code in connection[:2]})
+        self.ids = {code: i for i, code in enumerate(self.codes)}
+        self.timezones = [get_timezone(airports, code) for code in self.codes]
+        self.departures = array('i', [connection.departure
+                                      for connection in ordered])
+        self.arrivals = array('i', [connection.arrival
+                                    for connection in ordered])
+        self.sources = array('I', [self.ids[connection.source]
+                                   for connection in ordered])
+        self.destinations = array('I', [self.ids[connection.destination]
+                                        for connection in ordered])
+        self.airplanes = [connection.airplane for connection in ordered]
+
+    def __len__(self) -> int:
+        """Return the number of connections in this schedule."""
+        return len(self.departures)
+
+    def get_connection(self, i: int) -> Connection:
+        """Return the connection at position i in departure order."""
+        return Connection(self.codes[self.sources[i]],
+                          self.codes[self.destinations[i]],
+                          self.airplanes[i], self.departures[i],
+                          self.arrivals[i])
+
+    def to_minutes(self, airport: str, local_time: str) -> int:
+        """Return the time in this schedule of local_time, in the format
+        HH:MM, at airport on the day of this schedule.
+
+        >>> schedule = Schedule([], {}, date(2024, 6, 3))
+        >>> schedule.to_minutes('YYZ', '08:30')
+        510
+        """
+        zone = self.timezones[self.ids[airport]] if airport in self.ids \
+            else timezone.utc
+        return _to_schedule_minutes(self.day, zone,
+                                    parse_local_time(local_time))
+
+    def get_local_time(self, airport: str, minutes: int) -> datetime:
+        """Return the local date and time at airport of the time minutes in
+        this schedule.
+
+        >>> schedule = Schedule([], {}, date(2024, 6, 3))
+        >>> schedule.get_local_time('YYZ', 1500)
+        datetime.datetime(2024, 6, 4, 1, 0, tzinfo=datetime.timezone.utc)
+        """
+        zone = self.timezones[self.ids[airport]] if airport in self.ids \
+            else timezone.utc
+        midnight = datetime.combine(self.day, time(), timezone.utc)
+        return (midnight + timedelta(minutes=minutes)).astimezone(zone)
+
+    def _scan(self, source: int, target: int, departure: int) -> \
+            tuple[list[int], list[int]]:
+        """Return the earliest arrival time at each airport id when leaving
+        the airport with id source no earlier than departure, and the
+        position of the connection that arrives then, or -1, scanning
+        connections only until none can arrive at target any earlier.
+        """
+        arrivals_at = [NEVER] * len(self.codes)
+        ready = [NEVER] * len(self.codes)
+        last_connection = [-1] * len(self.codes)
+        arrivals_at[source] = departure
+        ready[source] = departure
+
+        start = bisect_left(self.departures, departure)
+        connections = zip(islice(self.departures, start, None),
+                          islice(self.arrivals, start, None),
+                          islice(self.sources, start, None),
+                          islice(self.destinations, start, None))
+        for i, (leaves, arrives, origin, destination) in \
+                enumerate(connections, start):
+            if leaves >= arrivals_at[target]:
+                break
+            if ready[origin] <= leaves and arrives < arrivals_at[destination]:
+                arrivals_at[destination] = arrives
+                ready[destination] = arrives + MIN_TRANSFER_MINUTES
+                last_connection[destination] = i
+        return arrivals_at, last_connection
+
+    def find_earliest_arrival(self, source: str, destination: str,
+                              departure: int) -> int | None:
+        """Return the earliest time at which destination can be reached
+        when leaving source no earlier than departure, or None if it cannot
+        be reached today.  Changing planes takes at least
+        MIN_TRANSFER_MINUTES.
+
+        >>> airports = flight_example_data.create_example_airports()
+        >>> schedule = read_schedule(create_example_schedule_file(), airports,
+        ...                          date(2024, 6, 3))
+        >>> arrival = schedule.find_earliest_arrival(
+        ...     'GFN', 'SYD', schedule.to_minutes('GFN', '06:00'))
+        >>> schedule.get_local_time('SYD', arrival).strftime('%H:%M')
+        '09:55'
+        """
+        if source not in self.ids or destination not in self.ids:
+            return departure if source == destination else None
+        target = self.ids[destination]
+        arrivals_at, _ = self._scan(self.ids[source], target, departure)
+        return None if arrivals_at[target] == NEVER else arrivals_at[target]
+
+    def find_journey(self, source: str, destination: str,
+                     departure: int) -> list[Connection] | None:
+        """Return the connections of a journey that reaches destination as
+        early as possible when leaving source no earlier than departure, or
+        None if there is none.
+
+        >>> airports = flight_example_data.create_example_airports()
+        >>> schedule = read_schedule(create_example_schedule_file(), airports,
+        ...                          date(2024, 6, 3))
+        >>> journey = schedule.find_journey(
+        ...     'GFN', 'SYD', schedule.to_minutes('GFN', '06:00'))
+        >>> [(leg.source, leg.destination) for leg in journey]
+        [('GFN', 'TRO'), ('TRO', 'SYD')]
+        """
+        if source == destination:
+            return []
+        if source not in self.ids or destination not in self.ids:
+            return None
+        target = self.ids[destination]
+        arrivals_at, last_connection = self._scan(self.ids[source], target,
+                                                  departure)
+        if arrivals_at[target] == NEVER:
+            return None
+
+        journey = []
+        airport = target
+        while airport != self.ids[source]:
+            connection = last_connection[airport]
+            journey.append(self.get_connection(connection))
+            airport = self.sources[connection]
+        journey.reverse()
+        return journey
+
+    def find_profile(self, source: str, destination: str) -> \
+            list[tuple[int, int]]:
+        """Return (departure, arrival) for every departure time from source
+        that gives an earlier arrival at destination than any later
+        departure, in order of departure.  Each arrival is the one
+        find_earliest_arrival gives for its departure.
+
+        The connections are scanned once, latest first, keeping for every
+        airport the same list of departure and arrival times towards
+        destination.
+
+        >>> airports = flight_example_data.create_example_airports()
+        >>> schedule = read_schedule(create_example_schedule_file(), airports,
+        ...                          date(2024, 6, 3))
+        >>> [(schedule.get_local_time('GFN', leaves).strftime('%H:%M'),
+        ...   schedule.get_local_time('SYD', arrives).strftime('%H:%M'))
+        ...  for leaves, arrives in schedule.find_profile('GFN', 'SYD')]
+        [('07:00', '09:55'), ('12:00', '14:55')]
+        """
+        if source == destination or source not in self.ids or \
+                destination not in self.ids:
+            return []
+        target = self.ids[destination]
+
+        # Each airport's profile is appended to in decreasing order of
+        # departure, and kept only if it arrives earlier than every later
+        # departure, so arrivals decrease too.  Departures are negated so
+        # the lists are increasing and can be searched with bisect.
+        negated_departures = [[] for _ in self.codes]
+        profile_arrivals = [[] for _ in self.codes]
+
+        for leaves, arrives, origin, destination_id in zip(
+                reversed(self.departures), reversed(self.arrivals),
+                reversed(self.sources), reversed(self.destinations)):
+            if origin == target:
+                continue
+            if destination_id == target:
+                best = arrives
+            else:
+                # The earliest arrival when changing planes at destination_id
+                departures = negated_departures[destination_id]
+                k = bisect_right(departures,
+                                 -(arrives + MIN_TRANSFER_MINUTES)) - 1
+                if k < 0:
+                    continue
+                best = profile_arrivals[destination_id][k]
+
+            departures = negated_departures[origin]
+            arrivals = profile_arrivals[origin]
+            if arrivals and best >= arrivals[-1]:
+                continue
+            if departures and departures[-1] == -leaves:
+                arrivals[-1] = best
+            else:
+                departures.append(-leaves)
+                arrivals.append(best)
+
+        source_id = self.ids[source]
+        return [(-leaves, arrives) for leaves, arrives in
+                zip(reversed(negated_departures[source_id]),
+                    reversed(profile_arrivals[source_id]))]
+
+
+def _to_schedule_minutes(day: date, zone: ZoneInfo | timezone,
+                         local_minutes: int) -> int:
+    """Return the minutes since midnight UTC at the start of day of the time
+    local_minutes after midnight on day in zone.
+    """
+    local = datetime.combine(day, time(), zone) + \
+        timedelta(minutes=local_minutes)
+    offset = local.utcoffset() // timedelta(minutes=1)
+    return local_minutes - offset
+
+
+def read_schedule(schedule_data: TextIO, airports: AirportDict, day: date,
+                  routes: RouteDict | None = None) -> Schedule:
+    """Return the schedule on day of the departures in the schedule data in
+    the open file schedule_data.  Departures whose airports are not in
+    airports are left out, and so are those whose route is not in routes,
+    unless routes is None.
+
+    >>> schedule = read_schedule(create_example_schedule_file(),
+    ...                          flight_example_data.create_example_airports(),
+    ...                          date(2024, 6, 3),
+    ...                          flight_example_data.create_example_routes())
+    >>> len(schedule), schedule.get_connection(0)
+    (5, Connection(source='GFN', destination='TRO', airplane='SF3', \
+departure=-180, arrival=-140))
+    """
+    # Every departure at the same local time in the same zone has the same
+    # offset from UTC, so each is converted once
+    converted = {}
+    zones = {}
+    connections = []
+    for row in csv.reader(schedule_data):
+        if not row:
+            continue
+        source = row[INDEX_SCHEDULE_SOURCE].strip()
+        destination = row[INDEX_SCHEDULE_DESTINATION].strip()
+        if source not in airports or destination not in airports:
+            continue
+        if routes is not None and destination not in routes.get(source, {}):
+            continue
+        zone = zones.get(source)
+        if zone is None:
+            zone = zones[source] = get_timezone(airports, source)
+        key = (zone, row[INDEX_SCHEDULE_DEPARTURE])
+        departure = converted.get(key)
+        if departure is None:
+            departure = converted[key] = _to_schedule_minutes(
+                day, zone, parse_local_time(key[1]))
+        connections.append(Connection(
+            source, destination, row[INDEX_SCHEDULE_AIRPLANE].strip(),
+            departure, departure + int(row[INDEX_SCHEDULE_DURATION])))
+    return Schedule(connections, airports, day)
+
+
+def create_example_schedule_file() -> StringIO:
+    """Return a "dummy file" with schedule data for the example routes, to
+    use for docstring examples.
+    """
+    return StringIO('GFN,TRO,SF3,07:00,40\n'
+                    'TRO,SYD,SF3,09:00,55\n'
+                    'TRO,SYD,DH4,07:30,55\n'
+                    'GFN,TRO,SF3,12:00,40\n'
+                    'TRO,SYD,SF3,14:00,55\n'
+                    'SYD,TRO,SF3,10:00,55\n')
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
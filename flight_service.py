@@ -0,0 +1,358 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable
+
+from flight_constants import RouteDict
+from flight_functions import find_reachable_destinations, is_direct_flight, \
+    is_valid_flight_sequence
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8108
+
+# The largest number of computations run in the executor at once
+MAX_RUNNING = 8
+
+# The largest number of computations waiting for the executor; requests that
+# would wait beyond this are rejected with BUSY_ERROR
+MAX_WAITING = 256
+
+# The largest number of requests read from one connection and not yet
+# answered; the connection is not read from again until one is answered
+MAX_PIPELINED = 32
+
+BUSY_ERROR = 'busy'
+CANCELLED_ERROR = 'the query was cancelled'
+TOO_LONG_ERROR = 'the request line is too long'
+
+
+################################################################################
+# The flight query service answers queries over TCP, one JSON object per line.
+# A request is {"id": ..., "query": ..., "args": [...]}, where query is the
+# name of one of the QUERIES below and args are its arguments after routes.
+# The response is {"id": ..., "result": ...} or {"id": ..., "error": ...},
+# with the id of the request.  Requests on one connection may be answered out
+# of order.
+#
+# Identical queries that arrive while one is still being answered share its
+# answer rather than being computed again.
+################################################################################
+
+# Maps the name of each query to its function, and whether it is expensive
+# enough to run in the executor rather than on the event loop
+QUERIES: dict[str, tuple[Callable, bool]] = {
+    'is_direct_flight': (is_direct_flight, False),
+    'is_valid_flight_sequence': (is_valid_flight_sequence, False),
+    'find_reachable_destinations': (find_reachable_destinations, True),
+}
+
+
+def decode_request(line: bytes) -> dict:
+    """Return the request in line, a JSON object.  Raise a ValueError if line
+    is not a JSON object.
+
+    >>> decode_request(b'{"id": 7, "query": "is_direct_flight"}')
+    {'id': 7, 'query': 'is_direct_flight'}
+    >>> decode_request(b'[]')
+    Traceback (most recent call last):
+    ...
+    ValueError: a request must be a JSON object
+    """
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f'malformed request: {error}') from None
+    if not isinstance(request, dict):
+        raise ValueError('a request must be a JSON object')
+    return request
+
+
+def parse_request(request: dict) -> tuple[str, tuple]:
+    """Return the query name and the arguments of request.  Raise a
+    ValueError if request does not name a query in QUERIES or its arguments
+    are not a list.
+
+    >>> parse_request({'query': 'is_valid_flight_sequence',
+    ...                'args': [['RCM', 'JCK']]})
+    ('is_valid_flight_sequence', (('RCM', 'JCK'),))
+    >>> parse_request({'query': 'decomission_plane', 'args': ['SF3']})
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown query: 'decomission_plane'
+    """
+    query = request.get('query')
+    if query not in QUERIES:
+        raise ValueError(f'unknown query: {query!r}')
+    args = request.get('args', [])
+    if not isinstance(args, list):
+        raise ValueError('args must be a list')
+
+    # Lists are not hashable, so a flight sequence is made a tuple for the
+    # coalescing key and turned back into a list when the query is run
+    return query, tuple(tuple(arg) if isinstance(arg, list) else arg
+                        for arg in args)
+
+
+async def read_line(reader: asyncio.StreamReader) -> bytes | None:
+    """Return the next line read from reader, or b'' at the end of the
+    stream.  Return None if the line is longer than the limit of reader, once
+    the whole line has been read and discarded.
+    """
+    too_long = False
+    while True:
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:
+            # The stream ended, possibly in the middle of a line
+            line = error.partial
+        except asyncio.LimitOverrunError as error:
+            # Drop what was buffered and keep reading to the end of the line
+            await reader.readexactly(error.consumed)
+            too_long = True
+            continue
+        return None if too_long else line
+
+
+class FlightService:
+    """A query service over a fixed RouteDict.
+
+    Instance Attributes:
+        - routes: the routes that queries are answered from
+        - executor: where expensive queries are run
+        - requests: the number of requests received
+        - computed: the number of queries that were computed
+        - coalesced: the number of queries answered by sharing the answer to
+          an identical query that was already being computed
+        - rejected: the number of queries rejected with BUSY_ERROR
+    """
+    routes: RouteDict
+    executor: Executor
+    requests: int
+    computed: int
+    coalesced: int
+    rejected: int
+    _in_flight: dict[tuple, asyncio.Future]
+    _running: asyncio.Semaphore | None
+    _waiting: int
+
+    def __init__(self, routes: RouteDict,
+                 executor: Executor | None = None) -> None:
+        """Initialize a new service answering queries about routes, running
+        expensive queries in executor.  If executor is None, a thread pool
+        of MAX_RUNNING threads is used, which keeps the event loop free to
+        accept and answer cheap queries while they run.
+
+        >>> service = FlightService(flight_example_data.create_example_routes())
+        >>> service.requests, service.computed
+        (0, 0)
+        """
+        self.routes = routes
+        self.executor = executor if executor is not None else \
+            ThreadPoolExecutor(MAX_RUNNING)
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._in_flight = {}
+        self._running = None
+        self._waiting = 0
+
+    async def answer(self, query: str, args: tuple) -> object:
+        """Return the answer to query with args, sharing the answer of an
+        identical query that is already being computed.  Raise a
+        RuntimeError with BUSY_ERROR if too many queries are waiting.
+
+        Preconditions:
+            - query in QUERIES
+
+        >>> service = FlightService(flight_example_data.create_example_routes())
+        >>> asyncio.run(service.answer('find_reachable_destinations',
+        ...                            ('GFN', 2)))
+        ['GFN', 'SYD', 'TRO']
+        """
+        key = (query, args)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only this waiter should be cancelled by its own
+                # cancellation; if the shared query was cancelled instead,
+                # this one fails like any other query
+                if future.cancelled() and \
+                        not asyncio.current_task().cancelling():
+                    raise RuntimeError(CANCELLED_ERROR) from None
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._compute(query, args)
+        except Exception as error:
+            future.set_exception(error)
+
+            # Mark the exception as retrieved, in case no one else waited
+            future.exception()
+            raise
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _compute(self, query: str, args: tuple) -> object:
+        """Return the answer to query with args, computed now."""
+        function, is_expensive = QUERIES[query]
+        call_args = [list(arg) if isinstance(arg, tuple) else arg
+                     for arg in args]
+        if not is_expensive:
+            self.computed += 1
+            return function(self.routes, *call_args)
+
+        if self._running is None:
+            self._running = asyncio.Semaphore(MAX_RUNNING)
+        if self._running.locked() and self._waiting >= MAX_WAITING:
+            self.rejected += 1
+            raise RuntimeError(BUSY_ERROR)
+        self._waiting += 1
+        try:
+            await self._running.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            self.computed += 1
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, function, self.routes, *call_args)
+        finally:
+            self._running.release()
+
+    async def respond(self, line: bytes | None) -> dict:
+        """Return the response to the request in line, or to a request line
+        that was too long to read if line is None.  Every request gets a
+        response, even if answering it fails unexpectedly.
+
+        >>> service = FlightService(flight_example_data.create_example_routes())
+        >>> asyncio.run(service.respond(
+        ...     b'{"id": 1, "query": "is_valid_flight_sequence", '
+        ...     b'"args": [["RCM", "JCK"]]}'))
+        {'id': 1, 'result': True}
+        >>> asyncio.run(service.respond(b'[]'))
+        {'id': None, 'error': 'a request must be a JSON object'}
+        >>> asyncio.run(service.respond(
+        ...     b'{"id": 2, "query": "is_direct_flight", "args": [1, 2, 3]}'))
+        {'id': 2, 'error': 'is_direct_flight() takes 3 positional arguments \
+but 4 were given'}
+        """
+        self.requests += 1
+        request_id = None
+        try:
+            if line is None:
+                raise ValueError(TOO_LONG_ERROR)
+            request = decode_request(line)
+            request_id = request.get('id')
+            query, args = parse_request(request)
+            return {'id': request_id, 'result': await self.answer(query, args)}
+        except (ValueError, TypeError, RuntimeError) as error:
+            return {'id': request_id, 'error': str(error)}
+        except Exception as error:
+            return {'id': request_id,
+                    'error': f'internal error: {type(error).__name__}: '
+                             f'{error}'}
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Answer the requests sent on one connection until it is closed."""
+        pipelined = asyncio.Semaphore(MAX_PIPELINED)
+        tasks = set()
+
+        async def answer_line(line: bytes | None) -> None:
+            try:
+                response = await self.respond(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                pipelined.release()
+
+        try:
+            while True:
+                # Stop reading while too many requests are unanswered, so a
+                # fast client is slowed down by TCP flow control
+                await pipelined.acquire()
+                line = await read_line(reader)
+                if line == b'':
+                    break
+                if line is not None and not line.strip():
+                    pipelined.release()
+                    continue
+                task = asyncio.create_task(answer_line(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Return a server that answers queries on host and port, already
+        accepting connections.
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def serve_forever(routes: RouteDict, host: str = DEFAULT_HOST,
+                        port: int = DEFAULT_PORT) -> None:
+    """Answer queries about routes on host and port until cancelled."""
+    service = FlightService(routes)
+    server = await service.serve(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    # Serve the routes in the airports and routes files named on the command
+    # line, for example: python flight_service.py data/airports.csv
+    # data/routes.dat 8108
+    if len(sys.argv) >= 3:
+        from flight_cache import load_flight_data
+        _, flight_routes = load_flight_data(sys.argv[1], sys.argv[2])
+        service_port = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_PORT
+        print(f'serving {len(flight_routes)} airports on '
+              f'{DEFAULT_HOST}:{service_port}')
+        asyncio.run(serve_forever(flight_routes, DEFAULT_HOST, service_port))
@@ -0,0 +1,188 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from flight_service import DEFAULT_HOST, DEFAULT_PORT
+import flight_synthetic_data
+
+
+################################################################################
+# A load generator for the flight query service.  Each client opens one
+# connection and sends requests one after another, waiting for each response,
+# so the number of clients is the number of requests in flight.  Sources are
+# chosen from a small set of popular airports, so identical queries arrive
+# at the same time, as they do in bursts of real traffic.
+#
+# Run with no arguments to start a service on synthetic data in a separate
+# process, or with a host and port to load a service that is already running:
+#     python flight_service_loadgen.py
+#     python flight_service_loadgen.py 127.0.0.1 8108
+################################################################################
+
+NUM_CLIENTS = 50
+REQUESTS_PER_CLIENT = 200
+NUM_POPULAR_AIRPORTS = 20
+
+
+def create_requests(codes: list[str], num_requests: int, seed: int) -> \
+        list[dict]:
+    """Return num_requests random requests about the airports in codes: 60%
+    is_direct_flight, 20% is_valid_flight_sequence and 20%
+    find_reachable_destinations with up to 2 flights.
+
+    >>> requests = create_requests(['AAA', 'AAB', 'AAC'], 10, 0)
+    >>> len(requests), requests[0]['id']
+    (10, 0)
+    """
+    rng = random.Random(seed)
+    popular = codes[:NUM_POPULAR_AIRPORTS]
+    requests = []
+    for i in range(num_requests):
+        roll = rng.random()
+        if roll < 0.6:
+            query = 'is_direct_flight'
+            args = [rng.choice(popular), rng.choice(codes)]
+        elif roll < 0.8:
+            query = 'is_valid_flight_sequence'
+            args = [[rng.choice(popular) for _ in range(3)]]
+        else:
+            query = 'find_reachable_destinations'
+            args = [rng.choice(popular), 2]
+        requests.append({'id': i, 'query': query, 'args': args})
+    return requests
+
+
+async def run_client(host: str, port: int, requests: list[dict],
+                     latencies: dict[str, list[float]]) -> int:
+    """Send each of requests in turn to the service at host and port, adding
+    the latency in seconds of each response to latencies under its query,
+    and return the number of error responses.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies[request['query']].append(time.perf_counter() - start)
+            if 'error' in response:
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the value at fraction of the way through the sorted values.
+
+    >>> percentile([4.0, 1.0, 3.0, 2.0], 0.5)
+    3.0
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def generate_load(host: str, port: int, codes: list[str],
+                        num_clients: int = NUM_CLIENTS,
+                        requests_per_client: int = REQUESTS_PER_CLIENT) -> \
+        None:
+    """Run num_clients clients at once against the service at host and port,
+    each sending requests_per_client requests about the airports in codes,
+    and print the throughput and the p50 and p99 latency of each query.
+    """
+    latencies = {'is_direct_flight': [], 'is_valid_flight_sequence': [],
+                 'find_reachable_destinations': []}
+    start = time.perf_counter()
+    errors = await asyncio.gather(*[
+        run_client(host, port, create_requests(codes, requests_per_client, i),
+                   latencies)
+        for i in range(num_clients)])
+    seconds = time.perf_counter() - start
+
+    total = num_clients * requests_per_client
+    print(f'{total} requests from {num_clients} clients in {seconds:.2f} s: '
+          f'{total / seconds:.0f} requests/s, {sum(errors)} errors')
+    everything = [latency for values in latencies.values()
+                  for latency in values]
+    for name, values in [('all', everything)] + list(latencies.items()):
+        if values:
+            print(f'{name:<30} p50 {percentile(values, 0.5) * 1000:8.2f} ms  '
+                  f'p99 {percentile(values, 0.99) * 1000:8.2f} ms')
+
+
+def wait_for_port(host: str, port: int, timeout: float = 60.0) -> None:
+    """Wait until a server accepts connections on host and port.  Raise a
+    TimeoutError if none does within timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+
+    async def try_connect() -> bool:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            return False
+        writer.close()
+        return True
+
+    while not asyncio.run(try_connect()):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'no server on {host}:{port}')
+        time.sleep(0.1)
+
+
+def run_against_local_service(port: int = DEFAULT_PORT) -> None:
+    """Start a service on OpenFlights-sized synthetic data in a separate
+    process, generate load against it, and stop it.
+    """
+    routes = flight_synthetic_data.create_synthetic_routes()
+    codes = list(routes)
+    with tempfile.TemporaryDirectory() as directory:
+        airports_path = os.path.join(directory, 'airports.csv')
+        routes_path = os.path.join(directory, 'routes.dat')
+        with open(airports_path, 'w', encoding='utf8') as airports_file:
+            flight_synthetic_data.write_synthetic_airports(
+                airports_file, flight_synthetic_data.OPENFLIGHTS_NUM_AIRPORTS)
+        with open(routes_path, 'w', encoding='utf8') as routes_file:
+            flight_synthetic_data.write_routes(routes_file, routes)
+
+        service_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'flight_service.py')
+        server = subprocess.Popen([sys.executable, service_path, airports_path,
+                                   routes_path, str(port)])
+        try:
+            wait_for_port(DEFAULT_HOST, port)
+            asyncio.run(generate_load(DEFAULT_HOST, port, codes))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 3:
+        # The service's airports are not known, so use synthetic codes
+        asyncio.run(generate_load(sys.argv[1], int(sys.argv[2]),
+                                  flight_synthetic_data.create_synthetic_codes(
+                                      flight_synthetic_data.
+                                      OPENFLIGHTS_NUM_AIRPORTS)))
+    else:
+        run_against_local_service()
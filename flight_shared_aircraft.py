@@ -0,0 +1,163 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from sys import intern
+from typing import Iterable, NoReturn
+from weakref import WeakValueDictionary
+
+
+################################################################################
+# Most routes use one of a few combinations of airplanes, such as ['SF3'] or
+# ['SF3', 'DH4'], so routes can share one list for each combination instead
+# of each having its own.  Sharing is opt-in: read_routes and the other
+# readers only share lists when called with share_aircraft=True, and
+# otherwise give every route its own list as they always have.
+#
+# A shared list is a SharedAircraft: it is a list, so it is read, compared
+# and printed exactly like one, but it cannot be changed in place.  The
+# flight modules change the airplanes of a route by copy-on-write: the route
+# is given a different shared list, and every other route that used the old
+# list is unaffected.  Lists that are not shared are still changed in place.
+# Code that changes shared routes itself must do the same, through
+# add_plane_to_route and remove_plane_from_route.
+################################################################################
+
+class SharedAircraft(list):
+    """A list of airplane codes that may be used by many routes at once, and
+    so cannot be changed.
+
+    >>> airplanes = share_aircraft(['SF3', 'DH4'])
+    >>> airplanes
+    ['SF3', 'DH4']
+    >>> airplanes == ['SF3', 'DH4'], 'DH4' in airplanes
+    (True, True)
+    >>> airplanes.append('320')
+    Traceback (most recent call last):
+    ...
+    TypeError: the airplanes of a route are shared and cannot be changed
+    """
+    __slots__ = ('__weakref__',)
+
+    def _refuse(self, *args: object) -> NoReturn:
+        """Raise a TypeError, since a shared list cannot be changed."""
+        raise TypeError('the airplanes of a route are shared and cannot be '
+                        'changed')
+
+    append = extend = insert = remove = pop = clear = sort = reverse = \
+        __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+
+    def __copy__(self) -> 'SharedAircraft':
+        """Return this list, since it cannot be changed, as a tuple would.
+        Use list(airplanes) or airplanes.copy() for a list that can be.
+        """
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'SharedAircraft':
+        """Return this list, since it cannot be changed, as a tuple would.
+
+        >>> import copy
+        >>> airplanes = share_aircraft(['SF3'])
+        >>> copy.deepcopy({'TRO': airplanes})['TRO'] is airplanes
+        True
+        """
+        return self
+
+    def __reduce__(self) -> tuple:
+        """Return how to pickle this list: it is shared again when it is
+        unpickled.
+        """
+        return share_aircraft, (tuple(self),)
+
+
+# Maps each combination of airplanes to the one shared list for it, for as
+# long as some route still uses that list
+_shared: WeakValueDictionary[tuple[str, ...], SharedAircraft] = \
+    WeakValueDictionary()
+
+
+def share_aircraft(airplanes: Iterable[str]) -> SharedAircraft:
+    """Return the shared list of the airplanes in airplanes, in the same
+    order.  Every call with the same airplanes returns the same list.
+
+    >>> share_aircraft(['SF3']) is share_aircraft(('SF3',))
+    True
+    """
+    key = tuple(airplanes)
+    shared = _shared.get(key)
+    if shared is None:
+        shared = _shared[key] = SharedAircraft(map(intern, key))
+    return shared
+
+
+def count_shared() -> int:
+    """Return the number of shared lists of airplanes still in use.
+
+    >>> airplanes = share_aircraft(['SF3', '737', 'DH4'])
+    >>> before = count_shared()
+    >>> del airplanes
+    >>> count_shared() == before - 1
+    True
+    """
+    return len(_shared)
+
+
+def add_plane_to_route(destinations: dict[str, list[str]], destination: str,
+                       plane: str) -> None:
+    """Add plane to the end of the airplanes of the route to destination in
+    destinations, the destinations of one source airport.  A shared list is
+    replaced rather than changed.
+
+    Preconditions:
+        - destination in destinations
+
+    >>> destinations = {'SYD': share_aircraft(['SF3'])}
+    >>> add_plane_to_route(destinations, 'SYD', 'DH4')
+    >>> destinations['SYD'] is share_aircraft(['SF3', 'DH4'])
+    True
+    """
+    airplanes = destinations[destination]
+    if isinstance(airplanes, SharedAircraft):
+        destinations[destination] = share_aircraft((*airplanes, plane))
+    else:
+        airplanes.append(plane)
+
+
+def remove_plane_from_route(destinations: dict[str, list[str]],
+                            destination: str, plane: str) -> list[str]:
+    """Remove the first copy of plane from the airplanes of the route to
+    destination in destinations, the destinations of one source airport, and
+    return the airplanes left.  A shared list is replaced rather than
+    changed.
+
+    Preconditions:
+        - plane in destinations[destination]
+
+    >>> destinations = {'SYD': share_aircraft(['SF3', 'DH4'])}
+    >>> remove_plane_from_route(destinations, 'SYD', 'SF3')
+    ['DH4']
+    >>> share_aircraft(['SF3', 'DH4'])
+    ['SF3', 'DH4']
+    """
+    airplanes = destinations[destination]
+    if isinstance(airplanes, SharedAircraft):
+        remaining = list(airplanes)
+        remaining.remove(plane)
+        airplanes = destinations[destination] = share_aircraft(remaining)
+    else:
+        airplanes.remove(plane)
+    return airplanes
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,289 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import heapq
+import math
+from array import array
+
+from flight_constants import AirportDict
+
+import flight_example_data
+
+
+################################################################################
+# Constants
+################################################################################
+
+# The mean radius of the Earth, in kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+# The largest number of airports in a leaf of an AirportSpatialIndex
+LEAF_SIZE = 16
+
+
+################################################################################
+# Distances
+################################################################################
+
+def haversine_km(latitude1: float, longitude1: float, latitude2: float,
+                 longitude2: float) -> float:
+    """Return the great-circle distance in kilometres between the points at
+    (latitude1, longitude1) and (latitude2, longitude2), given in degrees.
+
+    >>> round(haversine_km(-33.9461, 151.1770, -31.8886, 152.5140))
+    261
+    >>> haversine_km(10.0, 20.0, 10.0, 20.0)
+    0.0
+    """
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = math.sin(half_dphi) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def to_unit_vector(latitude: float, longitude: float) -> \
+        tuple[float, float, float]:
+    """Return the point at (latitude, longitude), given in degrees, as a
+    vector of length 1 from the centre of the Earth.
+
+    >>> to_unit_vector(0.0, 0.0)
+    (1.0, 0.0, 0.0)
+    """
+    phi = math.radians(latitude)
+    lam = math.radians(longitude)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam),
+            math.sin(phi))
+
+
+def _km_to_chord(distance: float) -> float:
+    """Return the straight-line distance between the unit vectors of two
+    points on the Earth that are distance kilometres apart.
+    """
+    angle = min(math.pi, distance / EARTH_RADIUS_KM)
+    return 2 * math.sin(angle / 2)
+
+
+################################################################################
+# An AirportSpatialIndex is a k-d tree over the unit vectors of the airports.
+# Straight-line (chord) distance between unit vectors grows with great-circle
+# distance, so the tree can prune with cheap coordinate differences and only
+# the airports that survive are measured exactly.
+#
+# The tree is stored implicitly in the point arrays: the node covering
+# positions [lo, hi) at depth d splits on axis d % 3 at position
+# (lo + hi) // 2, with smaller coordinates to the left.  Nodes with at most
+# LEAF_SIZE airports are leaves and are scanned directly.
+################################################################################
+
+class AirportSpatialIndex:
+    """A spatial index for nearest-airport and radius queries.
+
+    Instance Attributes:
+        - codes: the IATA airport code at each position in the tree
+        - latitudes: the latitude at each position, in degrees
+        - longitudes: the longitude at each position, in degrees
+        - points: the x, y and z arrays of the unit vector at each position
+    """
+    codes: list[str]
+    latitudes: array
+    longitudes: array
+    points: tuple[array, array, array]
+
+    def __init__(self, airports: AirportDict) -> None:
+        """Initialize a new index of the airports in airports.
+
+        >>> index = AirportSpatialIndex(
+        ...     flight_example_data.create_example_airports())
+        >>> len(index)
+        5
+        """
+        entries = []
+        for code, details in airports.items():
+            latitude = float(details['Latitude'])
+            longitude = float(details['Longitude'])
+            entries.append((to_unit_vector(latitude, longitude), latitude,
+                            longitude, code))
+
+        # Sort each node's airports along its axis, top down
+        stack = [(0, len(entries), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                continue
+            axis = depth % 3
+            entries[lo:hi] = sorted(entries[lo:hi],
+                                    key=lambda entry: entry[0][axis])
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+        self.codes = [entry[3] for entry in entries]
+        self.latitudes = array('d', [entry[1] for entry in entries])
+        self.longitudes = array('d', [entry[2] for entry in entries])
+        self.points = (array('d', [entry[0][0] for entry in entries]),
+                       array('d', [entry[0][1] for entry in entries]),
+                       array('d', [entry[0][2] for entry in entries]))
+
+    def __len__(self) -> int:
+        """Return the number of airports in this index."""
+        return len(self.codes)
+
+    def _exact_distances(self, latitude: float, longitude: float,
+                         positions: list[int]) -> list[tuple[float, str]]:
+        """Return the haversine distance in kilometres from (latitude,
+        longitude) to the airport at each of positions, with its code.
+        """
+        lats = self.latitudes
+        lons = self.longitudes
+        phi1 = math.radians(latitude)
+        cos_phi1 = math.cos(phi1)
+        results = []
+        for i in positions:
+            phi2 = math.radians(lats[i])
+            a = math.sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * math.cos(phi2) \
+                * math.sin(math.radians(lons[i] - longitude) / 2) ** 2
+            distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+            results.append((distance, self.codes[i]))
+        return results
+
+    def find_within_radius(self, latitude: float, longitude: float,
+                           radius_km: float) -> list[tuple[str, float]]:
+        """Return the (IATA code, distance in km) of every airport within
+        radius_km kilometres of (latitude, longitude), nearest first.
+
+        >>> index = AirportSpatialIndex(
+        ...     flight_example_data.create_example_airports())
+        >>> [code for code, _ in index.find_within_radius(-33.9, 151.2, 500)]
+        ['SYD', 'TRO', 'GFN']
+        """
+        query = to_unit_vector(latitude, longitude)
+        xs, ys, zs = self.points
+
+        # Allow for rounding so that airports exactly on the radius are kept
+        # for the exact check
+        limit = _km_to_chord(radius_km) + 1e-9
+        limit_squared = limit * limit
+
+        candidates = []
+        stack = [(0, len(self.codes), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                for i in range(lo, hi):
+                    dx = xs[i] - query[0]
+                    dy = ys[i] - query[1]
+                    dz = zs[i] - query[2]
+                    if dx * dx + dy * dy + dz * dz <= limit_squared:
+                        candidates.append(i)
+                continue
+
+            mid = (lo + hi) // 2
+            point = (xs[mid], ys[mid], zs[mid])
+            difference = query[depth % 3] - point[depth % 3]
+            dx = point[0] - query[0]
+            dy = point[1] - query[1]
+            dz = point[2] - query[2]
+            if dx * dx + dy * dy + dz * dz <= limit_squared:
+                candidates.append(mid)
+            if difference - limit <= 0:
+                stack.append((lo, mid, depth + 1))
+            if difference + limit >= 0:
+                stack.append((mid + 1, hi, depth + 1))
+
+        found = [(code, distance) for distance, code in
+                 sorted(self._exact_distances(latitude, longitude, candidates))
+                 if distance <= radius_km]
+        return found
+
+    def find_nearest(self, latitude: float, longitude: float, k: int) -> \
+            list[tuple[str, float]]:
+        """Return the (IATA code, distance in km) of the k airports nearest
+        to (latitude, longitude), nearest first.
+
+        Preconditions:
+            - k >= 1
+
+        >>> index = AirportSpatialIndex(
+        ...     flight_example_data.create_example_airports())
+        >>> [code for code, _ in index.find_nearest(-20.7, 142.0, 2)]
+        ['JCK', 'RCM']
+        """
+        query = to_unit_vector(latitude, longitude)
+        xs, ys, zs = self.points
+
+        # best is a max-heap, by negated squared chord, of the k nearest
+        # airports found so far
+        best = []
+
+        def consider(i: int) -> None:
+            dx = xs[i] - query[0]
+            dy = ys[i] - query[1]
+            dz = zs[i] - query[2]
+            entry = (-(dx * dx + dy * dy + dz * dz), i)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        stack = [(0, len(self.codes), 0, 0.0)]
+        while stack:
+            lo, hi, depth, bound = stack.pop()
+
+            # bound is how far the splitting planes put this node away from
+            # the query, squared
+            if len(best) == k and bound > -best[0][0]:
+                continue
+            if hi - lo <= LEAF_SIZE:
+                for i in range(lo, hi):
+                    consider(i)
+                continue
+
+            mid = (lo + hi) // 2
+            consider(mid)
+            axis = depth % 3
+            difference = query[axis] - (xs, ys, zs)[axis][mid]
+            near = (lo, mid) if difference <= 0 else (mid + 1, hi)
+            far = (mid + 1, hi) if difference <= 0 else (lo, mid)
+
+            # Visit the near side first by pushing it last
+            stack.append((*far, depth + 1, max(bound, difference ** 2)))
+            stack.append((*near, depth + 1, bound))
+
+        positions = [i for _, i in best]
+        nearest = sorted(self._exact_distances(latitude, longitude, positions))
+        return [(code, distance) for distance, code in nearest]
+
+
+def find_nearest_brute_force(airports: AirportDict, latitude: float,
+                             longitude: float, k: int) -> \
+        list[tuple[str, float]]:
+    """Return the same list as AirportSpatialIndex(airports).find_nearest(
+    latitude, longitude, k) by measuring the distance to every airport.
+
+    >>> find_nearest_brute_force(flight_example_data.create_example_airports(),
+    ...                          -20.7, 142.0, 1)[0][0]
+    'JCK'
+    """
+    distances = [(haversine_km(latitude, longitude, float(details['Latitude']),
+                               float(details['Longitude'])), code)
+                 for code, details in airports.items()]
+    return [(code, distance)
+            for distance, code in heapq.nsmallest(k, distances)]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,306 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import os
+import random
+import sys
+from string import ascii_uppercase
+from typing import TextIO
+
+from flight_constants import AirportDict, RouteDict, OPENFLIGHTS_NULL_VALUE
+from flight_spatial import AirportSpatialIndex
+
+
+################################################################################
+# Constants: the size of the full OpenFlights data set
+################################################################################
+OPENFLIGHTS_NUM_AIRPORTS = 7000
+OPENFLIGHTS_NUM_ROUTES = 67000
+
+DEFAULT_TIMEZONES = ['America/Toronto', 'America/New_York', 'Europe/London',
+                     'Europe/Paris', 'Asia/Tokyo', 'Australia/Sydney',
+                     'Australia/Brisbane', OPENFLIGHTS_NULL_VALUE]
+
+DEFAULT_AIRCRAFT = ['SF3', 'DH4', '320', '319', '737', '738', '73H', '321',
+                    'CR2', 'CR9', 'E90', 'ER4', 'AT7', '767', '777', '744']
+
+
+def create_synthetic_codes(num_airports: int) -> list[str]:
+    """Return a list of num_airports unique airport codes.  The first 17576
+    codes are three letters long, like real IATA codes; any further codes use
+    four letters.
+
+    >>> create_synthetic_codes(3)
+    ['AAA', 'AAB', 'AAC']
+    >>> create_synthetic_codes(17577)[-1]
+    'AAAA'
+    """
+    codes = []
+    for index in range(num_airports):
+        length = 3
+        if index >= 26 ** 3:
+            length = 4
+            index -= 26 ** 3
+
+        # Write index in base 26 using the letters A to Z as digits
+        letters = []
+        for _ in range(length):
+            index, digit = divmod(index, 26)
+            letters.append(ascii_uppercase[digit])
+        letters.reverse()
+        codes.append(''.join(letters))
+    return codes
+
+
+def create_synthetic_aircraft(num_aircraft: int) -> list[str]:
+    """Return a list of num_aircraft unique airplane codes: the codes in
+    DEFAULT_AIRCRAFT first, then made-up codes.
+
+    >>> create_synthetic_aircraft(2)
+    ['SF3', 'DH4']
+    >>> create_synthetic_aircraft(18)[-2:]
+    ['X00', 'X01']
+    """
+    aircraft = DEFAULT_AIRCRAFT[:num_aircraft]
+    for i in range(num_aircraft - len(aircraft)):
+        aircraft.append(f'X{i:02}')
+    return aircraft
+
+
+def create_synthetic_routes(num_airports: int = OPENFLIGHTS_NUM_AIRPORTS,
+                            num_routes: int = OPENFLIGHTS_NUM_ROUTES,
+                            seed: int = 0,
+                            aircraft: list[str] | None = None,
+                            hub_exponent: float = 1.0) -> RouteDict:
+    """Return a randomly generated RouteDict with num_airports airports and
+    num_routes distinct source-destination routes.  A few airports act as
+    hubs: the chance that the airport at position rank in the list of codes
+    is picked as the end of a route is proportional to
+    1 / (rank + 1) ** hub_exponent, a power law, as it is for the busiest
+    real airports.  A larger hub_exponent gives fewer, busier hubs, and 0
+    gives every airport the same chance.  Each route uses one to three
+    airplanes chosen from aircraft, or from DEFAULT_AIRCRAFT if aircraft is
+    None.
+
+    The same seed always produces the same routes.
+
+    Preconditions:
+        - num_airports >= 2
+        - num_routes <= num_airports * (num_airports - 1)
+        - aircraft is None or len(aircraft) >= 1
+        - hub_exponent >= 0
+
+    >>> routes = create_synthetic_routes(50, 200)
+    >>> routes == create_synthetic_routes(50, 200)
+    True
+    >>> sum(len(destinations) for destinations in routes.values())
+    200
+    >>> uniform = create_synthetic_routes(50, 200, hub_exponent=0.0)
+    >>> len(routes['AAA']) > len(uniform['AAA'])
+    True
+    """
+    if aircraft is None:
+        aircraft = DEFAULT_AIRCRAFT
+    rng = random.Random(seed)
+    codes = create_synthetic_codes(num_airports)
+    weights = [1 / (rank + 1) ** hub_exponent for rank in range(num_airports)]
+
+    routes = {}
+    num_added = 0
+    while num_added < num_routes:
+        # Draw the remaining routes in one batch; pairs that already exist
+        # are skipped and drawn again in the next batch
+        remaining = num_routes - num_added
+        sources = rng.choices(codes, weights, k=remaining)
+        destinations = rng.choices(codes, weights, k=remaining)
+        for source, destination in zip(sources, destinations):
+            if source == destination:
+                continue
+            if source not in routes:
+                routes[source] = {}
+            if destination not in routes[source]:
+                num_planes = rng.randint(1, min(3, len(aircraft)))
+                routes[source][destination] = rng.sample(aircraft,
+                                                         num_planes)
+                num_added += 1
+    return routes
+
+
+def create_synthetic_network(num_airports: int = OPENFLIGHTS_NUM_AIRPORTS,
+                             num_neighbours: int = 6, num_hubs: int = 100,
+                             seed: int = 0) -> tuple[AirportDict, RouteDict]:
+    """Return randomly placed airports and routes between them that follow
+    geography, like real airline networks: every airport has return flights
+    to its num_neighbours nearest airports, and the first num_hubs airports
+    also have return flights to ten other hubs anywhere in the world.
+
+    The same seed always produces the same network.
+
+    Preconditions:
+        - num_airports > num_neighbours >= 1
+        - num_hubs <= num_airports
+
+    >>> airports, routes = create_synthetic_network(40, 3, 5)
+    >>> len(airports)
+    40
+    >>> all(source in routes[destination]
+    ...     for source in routes for destination in routes[source])
+    True
+    """
+    rng = random.Random(seed)
+    codes = create_synthetic_codes(num_airports)
+    airports = {}
+    for code in codes:
+        airports[code] = {'Name': f'{code} Airport',
+                          'City': f'{code} City',
+                          'Country': f'Country {rng.randrange(200)}',
+                          'Latitude': rng.uniform(-60, 70),
+                          'Longitude': rng.uniform(-180, 180),
+                          'Tz': rng.choice(DEFAULT_TIMEZONES)}
+
+    routes = {code: {} for code in codes}
+
+    def add_return_flights(source: str, destination: str) -> None:
+        airplanes = rng.sample(DEFAULT_AIRCRAFT, rng.randint(1, 3))
+        routes[source][destination] = airplanes
+        routes[destination][source] = list(airplanes)
+
+    index = AirportSpatialIndex(airports)
+    for code, details in airports.items():
+        nearest = index.find_nearest(details['Latitude'],
+                                     details['Longitude'], num_neighbours + 1)
+        for neighbour, _ in nearest:
+            if neighbour != code and neighbour not in routes[code]:
+                add_return_flights(code, neighbour)
+
+    hubs = codes[:num_hubs]
+    for hub in hubs:
+        for other in rng.sample(hubs, min(10, len(hubs))):
+            if other != hub and other not in routes[hub]:
+                add_return_flights(hub, other)
+    return airports, routes
+
+
+def write_synthetic_airports(airports_file: TextIO, num_airports: int,
+                             seed: int = 0) -> None:
+    """Write num_airports lines of randomly generated airport data to the
+    open file airports_file, in the format read by flight_reader.read_airports.
+
+    >>> from io import StringIO
+    >>> airports_file = StringIO()
+    >>> write_synthetic_airports(airports_file, 2)
+    >>> airports_file.getvalue().splitlines()[1].startswith('"AAB",')
+    True
+    """
+    rng = random.Random(seed)
+    for code in create_synthetic_codes(num_airports):
+        city = f'City {rng.randrange(num_airports)}'
+        country = f'Country {rng.randrange(200)}'
+        latitude = rng.uniform(-90, 90)
+        longitude = rng.uniform(-180, 180)
+        timezone = rng.choice(DEFAULT_TIMEZONES)
+        airports_file.write(f'"{code}","{city} Airport","{city}",'
+                            f'"{country}","{latitude}","{longitude}",'
+                            f'"{timezone}"\n')
+
+
+def write_routes(routes_file: TextIO, routes: RouteDict) -> None:
+    """Write routes to the open file routes_file, in the format read by
+    flight_reader.read_routes.
+
+    >>> from io import StringIO
+    >>> routes_file = StringIO()
+    >>> write_routes(routes_file, {'TRO': {'SYD': ['SF3', 'DH4']}})
+    >>> print(routes_file.getvalue(), end='')
+    SOURCE: TRO
+    DESTINATIONS BEGIN
+    SYD SF3 DH4
+    DESTINATIONS END
+    """
+    for source, destinations in routes.items():
+        routes_file.write(f'SOURCE: {source}\nDESTINATIONS BEGIN\n')
+        for destination, airplanes in destinations.items():
+            routes_file.write(f'{destination} {" ".join(airplanes)}\n')
+        routes_file.write('DESTINATIONS END\n')
+
+
+def write_synthetic_schedule(schedule_file: TextIO, routes: RouteDict,
+                             num_connections: int, seed: int = 0) -> None:
+    """Write num_connections lines of randomly generated departures of the
+    routes in routes to the open file schedule_file, in the format read by
+    flight_schedule.read_schedule.  Each departure is at a random local time
+    of the day and lasts between 45 minutes and 12 hours.
+
+    Preconditions:
+        - routes has at least one route
+
+    >>> from io import StringIO
+    >>> schedule_file = StringIO()
+    >>> write_synthetic_schedule(schedule_file, {'TRO': {'SYD': ['SF3']}}, 2)
+    >>> [line.split(',')[:3] for line in schedule_file.getvalue().splitlines()]
+    [['TRO', 'SYD', 'SF3'], ['TRO', 'SYD', 'SF3']]
+    """
+    rng = random.Random(seed)
+    pairs = [(source, destination) for source, destinations in routes.items()
+             for destination in destinations]
+    for source, destination in rng.choices(pairs, k=num_connections):
+        airplane = rng.choice(routes[source][destination])
+        departure = rng.randrange(24 * 60)
+        schedule_file.write(f'{source},{destination},{airplane},'
+                            f'{departure // 60:02}:{departure % 60:02},'
+                            f'{rng.randint(45, 720)}\n')
+
+
+def write_synthetic_data(directory: str,
+                         num_airports: int = OPENFLIGHTS_NUM_AIRPORTS,
+                         num_routes: int = OPENFLIGHTS_NUM_ROUTES,
+                         seed: int = 0,
+                         aircraft: list[str] | None = None,
+                         hub_exponent: float = 1.0) -> tuple[str, str]:
+    """Write an airports.csv and a routes.dat file of synthetic data to
+    directory, in the formats read by flight_reader.read_airports and
+    flight_reader.read_routes, and return their paths.  The routes are
+    create_synthetic_routes(num_airports, num_routes, seed, aircraft,
+    hub_exponent), between the airports written to airports.csv.
+
+    Preconditions:
+        - directory is an existing directory
+        - the preconditions of create_synthetic_routes hold
+    """
+    airports_path = os.path.join(directory, 'airports.csv')
+    routes_path = os.path.join(directory, 'routes.dat')
+    with open(airports_path, 'w', encoding='utf8') as airports_file:
+        write_synthetic_airports(airports_file, num_airports, seed)
+    with open(routes_path, 'w', encoding='utf8') as routes_file:
+        write_routes(routes_file, create_synthetic_routes(
+            num_airports, num_routes, seed, aircraft, hub_exponent))
+    return airports_path, routes_path
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    # Write synthetic data files named on the command line, for example:
+    # python flight_synthetic_data.py data 7000 67000 1.0 40
+    # writes 7000 airports and 67000 routes with hub exponent 1.0 and 40
+    # airplane types to data/airports.csv and data/routes.dat
+    if len(sys.argv) >= 2:
+        sizes = [int(argument) for argument in sys.argv[2:4]]
+        exponent = float(sys.argv[4]) if len(sys.argv) > 4 else 1.0
+        vocabulary = create_synthetic_aircraft(int(sys.argv[5])) \
+            if len(sys.argv) > 5 else None
+        written = write_synthetic_data(sys.argv[1], *sizes,
+                                       aircraft=vocabulary,
+                                       hub_exponent=exponent)
+        print('wrote', *written)
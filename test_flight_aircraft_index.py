@@ -0,0 +1,128 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import copy
+
+import pytest
+
+from flight_aircraft_index import AircraftIndex
+from flight_constants import ADD_PLANE, ADD_ROUTE, REMOVE_PLANE, \
+    REMOVE_ROUTE, RESET, RESET_PLANES, RouteChange, RouteDict
+from flight_example_data import create_example_routes
+from flight_functions import decomission_plane, mark_routes_changed
+from flight_synthetic_data import create_synthetic_aircraft, \
+    create_synthetic_routes
+
+
+def get_all_routes_using(index: AircraftIndex,
+                         planes: list[str]) -> dict[str, list]:
+    """Return the routes that use each plane in planes, according to
+    index.
+    """
+    return {plane: index.get_routes_using(plane) for plane in planes}
+
+
+@pytest.fixture
+def routes() -> RouteDict:
+    """Return synthetic routes where some routes list an airplane twice."""
+    routes = create_synthetic_routes(80, 300)
+    for i, destinations in enumerate(routes.values()):
+        for airplanes in destinations.values():
+            if i % 5 == 0 and airplanes:
+                airplanes.append(airplanes[0])
+    return routes
+
+
+"""Unit tests for the AircraftIndex class."""
+
+
+def test_decommission_all_matches_decomission_plane(routes: RouteDict) -> \
+        None:
+    """Test that decommissioning planes through the index, including planes
+    that appear twice on a route and planes used nowhere, gives the same
+    results and routes as calling decomission_plane for each in turn.
+    """
+    planes = create_synthetic_aircraft(8) + ['747', 'SF3', '747']
+    expected_routes = copy.deepcopy(routes)
+    expected = [decomission_plane(expected_routes, plane) for plane in planes]
+
+    index = AircraftIndex(routes)
+    assert index.decommission_all(planes) == expected
+    assert routes == expected_routes
+    assert get_all_routes_using(index, planes) == \
+        get_all_routes_using(AircraftIndex(expected_routes), planes)
+
+
+def test_routes_using_matches_scan(routes: RouteDict) -> None:
+    """Test that get_routes_using lists exactly the routes that use each
+    plane.
+    """
+    index = AircraftIndex(routes)
+    for plane in create_synthetic_aircraft(8):
+        assert index.get_routes_using(plane) == sorted(
+            (source, destination)
+            for source, destinations in routes.items()
+            for destination, airplanes in destinations.items()
+            if plane in airplanes)
+
+
+def test_apply_changes() -> None:
+    """Test that applying the changes made to routes brings the index into
+    the same state as a fresh index of the changed routes.
+    """
+    routes = create_example_routes()
+    index = AircraftIndex(routes)
+
+    routes['SYD'] = {'TRO': ['DH4', 'DH4']}
+    routes['TRO']['SYD'].remove('DH4')
+    planes = routes['JCK'].pop('RCM')
+    routes['GFN']['TRO'].append('737')
+    index.apply_changes([
+        RouteChange(1, ADD_ROUTE, 'SYD', 'TRO', ()),
+        RouteChange(2, ADD_PLANE, 'SYD', 'TRO', ('DH4', 'DH4')),
+        RouteChange(3, REMOVE_PLANE, 'TRO', 'SYD', ('DH4',)),
+        RouteChange(4, REMOVE_ROUTE, 'JCK', 'RCM', tuple(planes)),
+        RouteChange(5, ADD_PLANE, 'GFN', 'TRO', ('737',))])
+
+    planes = ['DH4', 'SF3', '737']
+    assert get_all_routes_using(index, planes) == \
+        get_all_routes_using(AircraftIndex(copy.deepcopy(routes)), planes)
+    assert index.get_routes_using('DH4') == [('SYD', 'TRO')]
+
+
+@pytest.mark.parametrize('kind', [RESET, RESET_PLANES])
+def test_apply_reset(kind: str) -> None:
+    """Test that a RESET or a RESET_PLANES change rebuilds the index."""
+    routes = create_example_routes()
+    index = AircraftIndex(routes)
+    routes['SYD'] = {'TRO': ['737']}
+    index.apply_changes([RouteChange(1, kind, '', '', ())])
+    assert index.get_routes_using('737') == [('SYD', 'TRO')]
+
+
+def test_outside_changes() -> None:
+    """Test that the index is rebuilt after routes are changed by
+    decomission_plane, or by hand and marked as changed.
+    """
+    routes = create_example_routes()
+    index = AircraftIndex(routes)
+    decomission_plane(routes, 'SF3')
+    assert index.get_routes_using('SF3') == []
+    routes['SYD'] = {'TRO': ['SF3']}
+    mark_routes_changed(routes)
+    assert index.get_routes_using('SF3') == [('SYD', 'TRO')]
+    assert index.decommission('SF3') == [('SYD', 'TRO')]
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_aircraft_index.py'])
@@ -0,0 +1,107 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from collections import Counter
+
+import pytest
+
+from flight_airport_table import AirportTable, CategoricalColumn, summarize_by
+from flight_constants import AirportDict, OPENFLIGHTS_NULL_VALUE
+from flight_example_data import create_example_airports, \
+    create_handout_airports
+from flight_functions import summarize_by_timezone
+from flight_synthetic_data import create_synthetic_network
+
+
+def create_airports_with_nulls() -> AirportDict:
+    """Return synthetic airports where some have a null Tz and some have no
+    Tz at all.
+    """
+    airports, _ = create_synthetic_network(200, 3, 20)
+    for i, details in enumerate(airports.values()):
+        if i % 7 == 0:
+            details['Tz'] = OPENFLIGHTS_NULL_VALUE
+        elif i % 11 == 0:
+            del details['Tz']
+    return airports
+
+
+"""Unit tests for the timezone summaries and the AirportTable class."""
+
+
+def test_summarize_by_timezone_skips_null_and_missing() -> None:
+    """Test that airports with a null Tz or no Tz are not counted."""
+    airports = create_example_airports()
+    airports['JCK']['Tz'] = OPENFLIGHTS_NULL_VALUE
+    del airports['TRO']['Tz']
+    assert summarize_by_timezone(airports) == {'Australia/Sydney': 2}
+
+    for details in airports.values():
+        details['Tz'] = OPENFLIGHTS_NULL_VALUE
+    assert summarize_by_timezone(airports) == {}
+    assert summarize_by_timezone({}) == {}
+
+
+@pytest.mark.parametrize('airports', [create_example_airports(),
+                                      create_handout_airports(),
+                                      create_airports_with_nulls(), {}])
+def test_group_count_matches_summarize_by_timezone(airports: AirportDict) \
+        -> None:
+    """Test that grouping an AirportTable by Tz counts the same airports as
+    summarize_by_timezone, and that skip_null=False also counts the null and
+    missing ones.
+    """
+    table = AirportTable(airports)
+    expected = summarize_by_timezone(airports)
+    assert table.group_count('Tz') == expected
+    assert summarize_by(airports, 'Tz') == expected
+    assert table.group_count(('Tz',)) == \
+        {(tz,): count for tz, count in expected.items()}
+
+    with_nulls = table.group_count('Tz', skip_null=False)
+    assert sum(with_nulls.values()) == len(table) == len(airports)
+    assert with_nulls.get(OPENFLIGHTS_NULL_VALUE, 0) == \
+        len(airports) - sum(expected.values())
+
+
+def test_group_count_by_several_columns() -> None:
+    """Test that grouping by a tuple of columns counts the same airports as
+    counting the tuples of their values directly.
+    """
+    airports = create_airports_with_nulls()
+    table = AirportTable(airports)
+    keys = ('Country', 'Tz')
+    counts = Counter(tuple(details.get(key, OPENFLIGHTS_NULL_VALUE)
+                           for key in keys)
+                     for details in airports.values())
+    assert table.group_count(keys, skip_null=False) == counts
+    assert table.group_count(keys) == \
+        {values: count for values, count in counts.items()
+         if OPENFLIGHTS_NULL_VALUE not in values}
+
+
+def test_categorical_column() -> None:
+    """Test that a column stores each distinct value once, in order of first
+    appearance, and records where the null value is.
+    """
+    column = CategoricalColumn(['b', 'a', 'b', 'c', 'a'])
+    assert column.categories == ['b', 'a', 'c']
+    assert list(column.codes) == [0, 1, 0, 2, 1]
+    assert column.null_code == -1
+    assert len(column) == 5
+    assert CategoricalColumn([OPENFLIGHTS_NULL_VALUE, 'a']).null_code == 0
+    assert len(CategoricalColumn([])) == 0
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_airport_table.py'])
@@ -0,0 +1,123 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import copy
+
+import pytest
+
+from flight_analytics import NetworkAnalytics
+from flight_constants import RouteDict
+from flight_functions import decomission_plane, find_reachable_destinations
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes
+
+
+@pytest.fixture(scope='module')
+def routes() -> RouteDict:
+    """Return small synthetic routes with several components."""
+    return create_synthetic_routes(150, 300, aircraft=['SF3', 'DH4', '320'])
+
+
+def count_groups(routes: RouteDict, closed: str | None = None) -> int:
+    """Return the number of groups of airports in routes that are connected
+    when the direction of routes is ignored, leaving out the airport closed.
+    """
+    neighbors = {}
+    for source, destinations in routes.items():
+        for destination in destinations:
+            neighbors.setdefault(source, set()).add(destination)
+            neighbors.setdefault(destination, set()).add(source)
+    seen = {closed}
+    groups = 0
+    for airport in neighbors:
+        if airport in seen:
+            continue
+        groups += 1
+        stack = [airport]
+        seen.add(airport)
+        while stack:
+            for neighbor in neighbors[stack.pop()]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+    return groups
+
+
+"""Unit tests for the connectivity analytics."""
+
+
+def test_components_match_reachability(routes: RouteDict) -> None:
+    """Test that two airports share a component exactly when each can be
+    reached from the other.
+    """
+    analytics = NetworkAnalytics(routes)
+    codes = analytics.graph.codes
+    reachable = {code: set(find_reachable_destinations(routes, code,
+                                                       len(codes)))
+                 for code in codes}
+    for i, a in enumerate(codes):
+        for j, b in enumerate(codes):
+            same = analytics.components[i] == analytics.components[j]
+            assert same == (b in reachable[a] and a in reachable[b])
+    assert sum(len(members) for members in analytics.get_components()) == \
+        len(codes)
+
+
+def test_long_cycle() -> None:
+    """Test that a cycle far longer than the recursion limit is one
+    component, and that no airport of it is an articulation airport.
+    """
+    codes = create_synthetic_codes(20000)
+    cycle = {code: {codes[(i + 1) % len(codes)]: ['SF3']}
+             for i, code in enumerate(codes)}
+    analytics = NetworkAnalytics(cycle)
+    assert analytics.num_components == 1
+    assert analytics.find_articulation_airports() == []
+
+
+def test_articulation_airports(routes: RouteDict) -> None:
+    """Test that exactly the articulation airports split their group when
+    they are closed.
+    """
+    analytics = NetworkAnalytics(routes)
+    articulation = set(analytics.find_articulation_airports())
+    before = count_groups(routes)
+    for code in analytics.graph.codes:
+        # Closing an airport with one neighbor removes a group of one
+        after = count_groups(routes, code)
+        assert (code in articulation) == (after > before)
+
+
+def test_decommission_impact(routes: RouteDict) -> None:
+    """Test that the impact of decommissioning each plane matches
+    decomission_plane, without changing routes.
+    """
+    original = copy.deepcopy(routes)
+    analytics = NetworkAnalytics(routes)
+    for plane in ['SF3', 'DH4', '320', '747']:
+        impact = analytics.decommission_impact(plane)
+        changed = copy.deepcopy(routes)
+        assert impact.routes_with_no_planes == \
+            decomission_plane(changed, plane)
+        for source, destination in impact.routes_with_no_planes:
+            del changed[source][destination]
+
+        # Airports left with no routes at all are components of their own
+        changed_analytics = NetworkAnalytics(changed)
+        assert impact.num_components == changed_analytics.num_components + \
+            len(analytics.graph.codes) - len(changed_analytics.graph.codes)
+    assert routes == original
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_analytics.py'])
@@ -0,0 +1,80 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+import flight_benchmark_suite
+from flight_benchmark_suite import find_regressions, main
+
+
+@pytest.fixture
+def tiny_scale(monkeypatch: pytest.MonkeyPatch) -> str:
+    """Add a scale small enough to run quickly, and return its name."""
+    monkeypatch.setitem(flight_benchmark_suite.SCALES, 'tiny', (60, 200))
+    return 'tiny'
+
+
+"""Unit tests for the benchmark regression suite."""
+
+
+def test_regression_exits_with_1(tiny_scale: str, tmp_path: Path,
+                                 capsys: pytest.CaptureFixture) -> None:
+    """Test that comparing with a baseline where every case took no time
+    reports every case as a regression and exits with status 1, and that
+    comparing with a much slower baseline exits with status 0.
+    """
+    baseline_path = tmp_path / 'baseline.json'
+    arguments = ['--scales', tiny_scale, '--baseline', str(baseline_path),
+                 '--repeat', '1']
+    assert main(arguments + ['--save']) == 0
+    saved = json.loads(baseline_path.read_text())['results']
+    assert 'tiny/read_routes' in saved
+
+    baseline_path.write_text(json.dumps({'results': dict.fromkeys(saved,
+                                                                   0.0)}))
+    capsys.readouterr()
+    assert main(arguments) == 1
+    output = capsys.readouterr().out
+    assert output.count('REGRESSION') == len(saved)
+
+    slower = {name: seconds * 1000 + 1 for name, seconds in saved.items()}
+    baseline_path.write_text(json.dumps({'results': slower}))
+    assert main(arguments) == 0
+    assert 'REGRESSION' not in capsys.readouterr().out
+
+
+def test_missing_baseline_exits_with_0(tiny_scale: str, tmp_path: Path,
+                                       capsys: pytest.CaptureFixture) -> None:
+    """Test that running without a saved baseline does not fail."""
+    baseline_path = tmp_path / 'baseline.json'
+    assert main(['--scales', tiny_scale, '--baseline', str(baseline_path),
+                 '--repeat', '1']) == 0
+    assert 'run with --save' in capsys.readouterr().out
+    assert not baseline_path.exists()
+
+
+def test_find_regressions_threshold() -> None:
+    """Test that a case regresses only when it is slower than the baseline
+    by more than the threshold.
+    """
+    baseline = {'a': 1.0, 'b': 1.0}
+    assert find_regressions({'a': 1.1, 'b': 0.5}, baseline, 0.1) == []
+    assert find_regressions({'a': 1.2, 'b': 0.5}, baseline, 0.1) == \
+        [('a', 1.0, 1.2)]
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_benchmark_suite.py'])
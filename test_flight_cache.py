@@ -0,0 +1,121 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from flight_cache import FlightDataCache, Snapshot
+from flight_example_data import create_airport_file, create_route_file
+from flight_reader import read_airports, read_routes
+
+
+"""Unit tests for the FlightDataCache class."""
+
+
+@pytest.fixture
+def source_paths(tmp_path: Path) -> tuple[str, str]:
+    """Return the paths of an airports file and a routes file containing the
+    example data.
+    """
+    airports_path = tmp_path / 'airports.csv'
+    routes_path = tmp_path / 'routes.dat'
+    airports_path.write_text(create_airport_file().getvalue())
+    routes_path.write_text(create_route_file().getvalue())
+    return str(airports_path), str(routes_path)
+
+
+def test_first_load_parses_sources(source_paths: tuple[str, str]) -> None:
+    """Test that the first load parses the source files, gives the same data
+    as the readers and writes the snapshot.
+    """
+    cache = FlightDataCache(*source_paths)
+    airports = read_airports(create_airport_file())
+    assert cache.airports == airports
+    assert cache.routes == read_routes(create_route_file(), airports)
+    assert not cache.loaded_from_snapshot
+    assert os.path.exists(cache.cache_path)
+
+
+def test_second_load_uses_snapshot(source_paths: tuple[str, str]) -> None:
+    """Test that a warm cache loads the same data from the snapshot."""
+    first = FlightDataCache(*source_paths)
+    routes = first.routes
+    second = FlightDataCache(*source_paths)
+    assert second.routes == routes
+    assert second.airports == first.airports
+    assert second.loaded_from_snapshot
+
+
+def test_touched_source_keeps_snapshot(source_paths: tuple[str, str]) -> None:
+    """Test that changing only the modification time of a source file does
+    not rebuild the snapshot, since its hash is unchanged.
+    """
+    FlightDataCache(*source_paths).routes
+    os.utime(source_paths[1], ns=(0, 0))
+    cache = FlightDataCache(*source_paths)
+    cache.routes
+    assert cache.loaded_from_snapshot
+
+
+def test_changed_source_rebuilds(source_paths: tuple[str, str]) -> None:
+    """Test that changing a source file rebuilds the snapshot and that
+    refresh notices the change.
+    """
+    cache = FlightDataCache(*source_paths)
+    assert 'SYD' in cache.routes['TRO']
+    with open(source_paths[1], 'a') as routes_file:
+        routes_file.write('\nSOURCE: SYD\nDESTINATIONS BEGIN\nTRO DH4\n'
+                          'DESTINATIONS END\n')
+    cache.refresh()
+    assert cache.routes['SYD'] == {'TRO': ['DH4']}
+    assert not cache.loaded_from_snapshot
+
+
+def test_unwritable_snapshot(source_paths: tuple[str, str],
+                             tmp_path: Path) -> None:
+    """Test that the parsed data is still returned when the snapshot cannot
+    be written.
+    """
+    cache_path = str(tmp_path / 'missing' / 'routes.dat.snapshot')
+    cache = FlightDataCache(*source_paths, cache_path)
+    airports = read_airports(create_airport_file())
+    assert cache.routes == read_routes(create_route_file(), airports)
+    assert not cache.loaded_from_snapshot
+    assert not os.path.exists(cache_path)
+
+
+def test_failed_rename_removes_temporary(source_paths: tuple[str, str],
+                                         tmp_path: Path) -> None:
+    """Test that the temporary file is removed when it cannot be renamed to
+    the snapshot.
+    """
+    cache_path = tmp_path / 'routes.dat.snapshot'
+    cache_path.mkdir()
+    cache = FlightDataCache(*source_paths, str(cache_path))
+    assert 'SYD' in cache.routes['TRO']
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        ['airports.csv', 'routes.dat', 'routes.dat.snapshot']
+
+
+def test_not_a_snapshot(tmp_path: Path) -> None:
+    """Test that opening a file that is not a snapshot raises ValueError."""
+    path = tmp_path / 'routes.dat.snapshot'
+    path.write_bytes(b'not a snapshot')
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_cache.py'])
@@ -0,0 +1,48 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import pytest
+
+from flight_closure import ReachabilityClosure
+from flight_functions import find_reachable_destinations
+from flight_graph import CompiledGraph
+from flight_synthetic_data import create_synthetic_routes
+
+
+"""Unit tests for the ReachabilityClosure class."""
+
+
+def test_closure_matches_bfs() -> None:
+    """Test that the closure finds the same destinations, and the same number
+    of them, as find_reachable_destinations for every airport and hop limit.
+    """
+    routes = create_synthetic_routes(200, 500)
+    graph = CompiledGraph(routes)
+    for n in range(7):
+        closure = ReachabilityClosure(graph, n)
+        assert closure.steps <= n
+        for source in graph.codes:
+            expected = find_reachable_destinations(routes, source, n)
+            assert closure.find_reachable_destinations(source) == expected
+            assert closure.count_reachable(source) == len(expected)
+
+
+def test_empty_graph() -> None:
+    """Test that a closure of no routes still answers queries."""
+    closure = ReachabilityClosure(CompiledGraph({}), 3)
+    assert closure.find_reachable_destinations('TRO') == ['TRO']
+    assert closure.count_reachable('TRO') == 1
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_closure.py'])
@@ -0,0 +1,77 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import pytest
+
+from flight_constants import AirportDict, RouteDict
+from flight_distances import RouteDistances, iter_distance_blocks
+from flight_graph import CompiledGraph
+from flight_spatial import haversine_km
+from flight_synthetic_data import create_synthetic_network
+
+
+@pytest.fixture(scope='module')
+def network() -> tuple[AirportDict, RouteDict]:
+    """Return a small geographic synthetic network."""
+    return create_synthetic_network(300, 3, 20)
+
+
+def airport_distance(airports: AirportDict, a: str, b: str) -> float:
+    """Return the great-circle distance between airports a and b, in
+    kilometres, computed one pair at a time.
+    """
+    return haversine_km(airports[a]['Latitude'], airports[a]['Longitude'],
+                        airports[b]['Latitude'], airports[b]['Longitude'])
+
+
+"""Unit tests for the bulk distance functions."""
+
+
+def test_route_distances(network: tuple[AirportDict, RouteDict]) -> None:
+    """Test that the length of every route matches haversine_km."""
+    airports, routes = network
+    route_distances = RouteDistances(CompiledGraph(routes), airports)
+    assert len(route_distances.distances) == \
+        sum(len(destinations) for destinations in routes.values())
+    for source, destinations in routes.items():
+        for destination in destinations:
+            assert route_distances.get_distance(source, destination) == \
+                pytest.approx(airport_distance(airports, source, destination),
+                              abs=1e-6)
+
+
+def test_distance_blocks(network: tuple[AirportDict, RouteDict]) -> None:
+    """Test that the blocks cover the whole matrix exactly once, each no
+    larger than the block size, with the distances of haversine_km.
+    """
+    airports, _ = network
+    rows = list(airports)[:45]
+    columns = list(airports)[100:130]
+    seen = set()
+    for row_start, column_start, block in iter_distance_blocks(
+            airports, rows, columns, block_size=16):
+        assert 0 < len(block) <= 16
+        for i, row in enumerate(block):
+            assert 0 < len(row) <= 16
+            for j, distance in enumerate(row):
+                a = rows[row_start + i]
+                b = columns[column_start + j]
+                assert (a, b) not in seen
+                seen.add((a, b))
+                assert distance == pytest.approx(
+                    airport_distance(airports, a, b), abs=1e-6)
+    assert len(seen) == len(rows) * len(columns)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_distances.py'])
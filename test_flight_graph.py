@@ -0,0 +1,77 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import pytest
+
+from flight_functions import is_direct_flight, find_reachable_destinations
+from flight_example_data import create_example_routes
+from flight_graph import CompiledGraph
+from flight_synthetic_data import create_synthetic_routes
+
+
+"""Unit tests for the CompiledGraph class."""
+
+
+def test_empty_routes() -> None:
+    """Test that a graph compiled from no routes has no airports, and that
+    the source is still reachable from itself.
+    """
+    graph = CompiledGraph({})
+    assert len(graph) == 0
+    assert graph.num_routes() == 0
+    assert not graph.is_direct_flight('GFN', 'TRO')
+    assert graph.find_reachable_destinations('GFN', 2) == ['GFN']
+
+
+def test_direct_flights_match_route_dict() -> None:
+    """Test that is_direct_flight agrees with the RouteDict version for every
+    pair of airports in the example routes.
+    """
+    routes = create_example_routes()
+    graph = CompiledGraph(routes)
+    for source in graph.codes:
+        for destination in graph.codes:
+            assert graph.is_direct_flight(source, destination) == \
+                is_direct_flight(routes, source, destination)
+
+
+def test_airplanes_match_route_dict() -> None:
+    """Test that every route keeps its airplanes in their original order."""
+    routes = create_example_routes()
+    graph = CompiledGraph(routes)
+    for source, destinations in routes.items():
+        for destination, airplanes in destinations.items():
+            assert graph.get_airplanes(source, destination) == airplanes
+
+
+def test_routes_not_mutated() -> None:
+    """Test that compiling the routes does not mutate them."""
+    routes = create_example_routes()
+    CompiledGraph(routes)
+    assert routes == create_example_routes()
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3])
+def test_reachable_matches_route_dict(n: int) -> None:
+    """Test that find_reachable_destinations agrees with the RouteDict
+    version on a synthetic graph.
+    """
+    routes = create_synthetic_routes(300, 1200)
+    graph = CompiledGraph(routes)
+    for source in graph.codes[::10]:
+        assert graph.find_reachable_destinations(source, n) == \
+            find_reachable_destinations(routes, source, n)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_graph.py'])
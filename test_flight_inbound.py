@@ -0,0 +1,106 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+
+import pytest
+
+from flight_constants import RESET_PLANES, RouteDict
+from flight_functions import decomission_plane, find_reachable_destinations, \
+    mark_routes_changed
+from flight_inbound import InboundIndex
+from flight_route_store import RouteStore
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes
+
+
+def scan_origins(routes: RouteDict, destination: str, n: int) -> list[str]:
+    """Return the airports that can reach destination in at most n flights
+    by searching forwards from every source.
+    """
+    origins = {destination}
+    for source in routes:
+        if destination in find_reachable_destinations(routes, source, n):
+            origins.add(source)
+    return sorted(origins)
+
+
+def assert_matches_scan(index: InboundIndex, n: int) -> None:
+    """Assert that index finds the same origins as scan_origins for every
+    airport in the routes of index.
+    """
+    routes = index.store.routes
+    airports = set(routes)
+    for destinations in routes.values():
+        airports.update(destinations)
+    for destination in airports:
+        assert index.find_origins(destination, n) == \
+            scan_origins(routes, destination, n)
+
+
+"""Unit tests for the InboundIndex class."""
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_find_origins_matches_scan(n: int) -> None:
+    """Test that find_origins matches searching from every source, before
+    and after random changes made through the store.
+    """
+    store = RouteStore(create_synthetic_routes(60, 150))
+    index = InboundIndex(store)
+    assert_matches_scan(index, n)
+
+    rng = random.Random(n)
+    codes = create_synthetic_codes(70)
+    for _ in range(200):
+        source, destination = rng.sample(codes, 2)
+        roll = rng.random()
+        if roll < 0.4:
+            store.add_route(source, destination)
+        elif roll < 0.7:
+            store.remove_route(source, rng.choice(
+                list(store.routes.get(source, {})) or [destination]))
+        elif roll < 0.9:
+            store.add_plane(source, destination, rng.choice(['320', 'SF3']))
+        else:
+            store.decommission(rng.choice(['320', 'SF3']))
+    assert_matches_scan(index, n)
+
+
+def test_outside_changes() -> None:
+    """Test that the index is rebuilt after routes are changed by hand
+    without going through the store, but not after decomission_plane, which
+    only changes airplanes.
+    """
+    store = RouteStore(create_synthetic_routes(40, 100))
+    index = InboundIndex(store)
+    sources = index._sources
+    version = store.version
+    decomission_plane(store.routes, 'SF3')
+    assert [change.kind for change in store.changes_since(version)] == \
+        [RESET_PLANES]
+    assert_matches_scan(index, 2)
+    assert index._sources is sources
+
+    source = next(iter(store.routes))
+    destination = next(iter(store.routes[source]))
+    del store.routes[source][destination]
+    store.routes.setdefault('ZZZ', {})[source] = ['320']
+    mark_routes_changed(store.routes)
+    assert source not in index.get_sources(destination)
+    assert index.get_sources(source)[-1] == 'ZZZ'
+    assert_matches_scan(index, 2)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_inbound.py'])
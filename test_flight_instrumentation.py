@@ -0,0 +1,86 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import flight_instrumentation
+from flight_example_data import create_example_airports, \
+    create_example_routes, create_route_file
+from flight_functions import find_reachable_destinations
+from flight_reader import read_routes
+
+
+"""Unit tests for the flight_instrumentation module."""
+
+
+@pytest.fixture
+def enabled() -> Iterator[None]:
+    """Enable instrumentation with no metrics for one test."""
+    flight_instrumentation.reset()
+    flight_instrumentation.enable()
+    yield
+    flight_instrumentation.disable()
+    flight_instrumentation.reset()
+
+
+def test_disabled_records_nothing() -> None:
+    """Test that nothing is recorded while instrumentation is disabled."""
+    flight_instrumentation.reset()
+    flight_instrumentation.disable()
+    find_reachable_destinations(create_example_routes(), 'GFN', 2)
+    assert flight_instrumentation.get_metrics() == \
+        {'counters': {}, 'histograms': {}}
+
+
+def test_functions_are_measured(enabled: None) -> None:
+    """Test that calls, times, lines parsed and edges expanded are recorded
+    while instrumentation is enabled.
+    """
+    read_routes(create_route_file(), create_example_airports())
+    find_reachable_destinations(create_example_routes(), 'GFN', 2)
+    metrics = flight_instrumentation.get_metrics()
+    counters = metrics['counters']
+    histograms = metrics['histograms']
+    assert counters['flight_reader.read_routes.calls'] == 1
+    assert counters['flight_reader.route_lines_parsed'] > 0
+    assert counters['flight_functions.find_reachable_destinations.calls'] == 1
+    assert counters[
+        'flight_functions.find_reachable_destinations.edges_expanded'] == 3
+    assert histograms['flight_functions.find_reachable_destinations.visited'][
+        'sum'] == 3
+    assert histograms['flight_reader.read_routes.seconds']['count'] == 1
+
+
+def test_exports(enabled: None, tmp_path: Path) -> None:
+    """Test that metrics are exported as JSON and Prometheus text."""
+    flight_instrumentation.count('example.lines', 5)
+    flight_instrumentation.observe('example.size', 3)
+    json_path = tmp_path / 'metrics.json'
+    prometheus_path = tmp_path / 'metrics.prom'
+    flight_instrumentation.export_json(str(json_path))
+    flight_instrumentation.export_prometheus(str(prometheus_path))
+
+    assert json.loads(json_path.read_text())['counters'] == \
+        {'example.lines': 5}
+    text = prometheus_path.read_text()
+    assert 'example_lines_total 5\n' in text
+    assert 'example_size_bucket{le="+Inf"} 1\n' in text
+    assert 'example_size_count 1\n' in text
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_instrumentation.py'])
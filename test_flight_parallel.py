@@ -0,0 +1,125 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from pathlib import Path
+
+import pytest
+
+from flight_functions import find_reachable_destinations
+from flight_graph import CompiledGraph
+from flight_parallel import find_all_reachable_destinations, \
+    find_shard_offsets, iter_reachable_destinations, read_routes_parallel
+from flight_reader import read_routes
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes, write_routes
+
+
+"""Unit tests for the parallel routes reader and reachability searches."""
+
+
+@pytest.fixture
+def routes_path(tmp_path: Path) -> str:
+    """Return the path of a routes file containing synthetic routes twice, so
+    that sources repeat and routes appear in two blocks.
+    """
+    path = tmp_path / 'routes.dat'
+    routes = create_synthetic_routes(200, 1500)
+    with open(path, 'w', encoding='utf8') as routes_file:
+        write_routes(routes_file, routes)
+        write_routes(routes_file, routes)
+    return str(path)
+
+
+def test_shards_start_at_blocks(routes_path: str) -> None:
+    """Test that every shard starts at a SOURCE: line."""
+    offsets = find_shard_offsets(routes_path, 7)
+    assert offsets[0] == 0
+    assert offsets == sorted(set(offsets))
+    with open(routes_path, 'rb') as routes_file:
+        data = routes_file.read()
+    assert offsets[-1] == len(data)
+    for offset in offsets[:-1]:
+        assert data.startswith(b'SOURCE: ', offset)
+
+
+def test_parallel_matches_serial(routes_path: str) -> None:
+    """Test that the parallel reader gives the same routes as read_routes,
+    with the airplanes of repeated routes in the same order.
+    """
+    airports = set(create_synthetic_codes(180))
+    with open(routes_path, encoding='utf8') as routes_file:
+        expected = read_routes(routes_file, airports)
+    for workers in (1, 2, 3):
+        assert read_routes_parallel(routes_path, airports, workers) == expected
+
+
+def test_more_workers_than_blocks(tmp_path: Path) -> None:
+    """Test that a file with fewer blocks than workers is still read."""
+    path = tmp_path / 'routes.dat'
+    path.write_text('SOURCE: TRO\nDESTINATIONS BEGIN\nSYD SF3\n'
+                    'DESTINATIONS END\n')
+    assert read_routes_parallel(str(path), {'TRO', 'SYD'}, 8) == \
+        {'TRO': {'SYD': ['SF3']}}
+
+
+@pytest.mark.parametrize('workers', [8, 16, 24, 32])
+def test_small_file_many_workers(tmp_path: Path, workers: int) -> None:
+    """Test that a small file with several blocks, cut into more shards than
+    it has lines, is read the same as by read_routes, and that every shard
+    starts at a SOURCE: line.
+    """
+    path = tmp_path / 'routes.dat'
+    path.write_text('SOURCE: AAA\nDESTINATIONS BEGIN\nBBB SF3\n'
+                    'DESTINATIONS END\nSOURCE: BBB\nDESTINATIONS BEGIN\n'
+                    'CCC 737\nDESTINATIONS END\nSOURCE: CCC\n'
+                    'DESTINATIONS BEGIN\nAAA 320 DH4\nDESTINATIONS END\n')
+    airports = {'AAA', 'BBB', 'CCC'}
+    data = path.read_bytes()
+    offsets = find_shard_offsets(str(path), workers)
+    assert offsets[-1] == len(data)
+    for offset in offsets[:-1]:
+        assert data.startswith(b'SOURCE: ', offset)
+    with open(path, encoding='utf8') as routes_file:
+        expected = read_routes(routes_file, airports)
+    assert read_routes_parallel(str(path), airports, workers) == expected
+
+
+def test_all_reachable_matches_serial() -> None:
+    """Test that searching every airport in worker processes gives the same
+    destinations as find_reachable_destinations.
+    """
+    routes = create_synthetic_routes(300, 900)
+    graph = CompiledGraph(routes)
+    for n in (0, 2):
+        actual = find_all_reachable_destinations(graph, n, workers=2)
+        assert set(actual) == set(graph.codes)
+        for source, destinations in actual.items():
+            assert destinations == \
+                find_reachable_destinations(routes, source, n)
+
+
+def test_reachable_unknown_sources() -> None:
+    """Test that sources not in the graph, and negative hop limits, are
+    answered like find_reachable_destinations.
+    """
+    routes = create_synthetic_routes(50, 100)
+    graph = CompiledGraph(routes)
+    sources = ['???', graph.codes[0]]
+    assert dict(iter_reachable_destinations(graph, 1, sources, 2))['???'] == \
+        ['???']
+    assert find_all_reachable_destinations(graph, -1, sources, 2) == \
+        {'???': [], graph.codes[0]: []}
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_parallel.py'])
@@ -0,0 +1,141 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+
+import pytest
+
+from flight_constants import RouteDict
+from flight_example_data import create_example_routes
+from flight_functions import decomission_plane, find_reachable_destinations, \
+    get_routes_version, mark_routes_changed
+from flight_reachability_index import ReachabilityIndex
+from flight_synthetic_data import create_synthetic_routes
+
+
+@pytest.fixture
+def routes() -> RouteDict:
+    """Return small synthetic routes with some long paths."""
+    return create_synthetic_routes(80, 160)
+
+
+"""Unit tests for the ReachabilityIndex class."""
+
+
+def test_matches_find_reachable_destinations(routes: RouteDict) -> None:
+    """Test that the index gives the same answers as
+    find_reachable_destinations, for queries in any order of n.
+    """
+    index = ReachabilityIndex(routes)
+    rng = random.Random(0)
+    sources = list(routes)
+    for _ in range(400):
+        source = rng.choice(sources)
+        n = rng.randrange(-1, 7)
+        assert index.find_reachable_destinations(source, n) == \
+            find_reachable_destinations(routes, source, n)
+    assert index.hits > 0
+
+
+def test_evicts_least_recently_used(routes: RouteDict) -> None:
+    """Test that the least recently used layers are evicted first once the
+    cached layers use more than max_bytes.
+    """
+    sources = list(routes)[:4]
+    unlimited = ReachabilityIndex(routes)
+    sizes = []
+    for source in sources:
+        before = unlimited.memory_used()
+        unlimited.find_reachable_destinations(source, 3)
+        sizes.append(unlimited.memory_used() - before)
+
+    # Room for the first three sources, but not for all four
+    index = ReachabilityIndex(routes, sum(sizes[:3]) + min(sizes) // 2)
+    for source in sources[:3]:
+        index.find_reachable_destinations(source, 3)
+    assert len(index) == 3
+    index.find_reachable_destinations(sources[0], 3)
+    index.find_reachable_destinations(sources[3], 3)
+    assert index.memory_used() <= index.max_bytes
+    assert len(index) < 4
+
+    # sources[1] was the least recently used, so it was evicted first
+    misses = index.misses
+    index.find_reachable_destinations(sources[1], 3)
+    assert index.misses == misses + 1
+
+    tiny = ReachabilityIndex(routes, 1)
+    tiny.find_reachable_destinations(sources[0], 3)
+    assert len(tiny) == 1
+
+
+def test_invalidated_by_changes() -> None:
+    """Test that cached layers are thrown away once routes is marked as
+    changed, and are kept otherwise.
+    """
+    routes = create_example_routes()
+    index = ReachabilityIndex(routes)
+    assert index.find_reachable_destinations('SYD', 1) == ['SYD']
+
+    routes['SYD'] = {'JCK': ['DH4']}
+    assert index.find_reachable_destinations('SYD', 1) == ['SYD']
+    mark_routes_changed(routes)
+    assert index.find_reachable_destinations('SYD', 2) == \
+        ['JCK', 'RCM', 'SYD']
+
+    decomission_plane(routes, 'DH4')
+    del routes['SYD']
+    mark_routes_changed(routes)
+    assert index.find_reachable_destinations('SYD', 2) == ['SYD']
+
+
+def test_planes_only_change_keeps_cache() -> None:
+    """Test that changing only airplanes, as decomission_plane does, keeps
+    the cached layers, since reachability does not depend on airplanes.
+    """
+    routes = create_example_routes()
+    index = ReachabilityIndex(routes)
+    assert index.find_reachable_destinations('GFN', 2) == \
+        ['GFN', 'SYD', 'TRO']
+    assert decomission_plane(routes, 'SF3') != []
+    assert len(index) == 1
+    assert index.find_reachable_destinations('GFN', 2) == \
+        find_reachable_destinations(routes, 'GFN', 2)
+    assert (index.hits, index.misses) == (1, 1)
+
+    routes['TRO']['SYD'].append('737')
+    mark_routes_changed(routes, planes_only=True)
+    assert index.find_reachable_destinations('GFN', 1) == ['GFN', 'TRO']
+    assert (index.hits, index.misses) == (2, 1)
+
+
+def test_version_freed_with_index() -> None:
+    """Test that the version of routes is only kept while a structure
+    derived from them is, so it is not inherited by later routes.
+    """
+    routes = create_example_routes()
+    index = ReachabilityIndex(routes)
+    mark_routes_changed(routes)
+    assert get_routes_version(routes) == 1
+    del index
+    assert get_routes_version(routes) == 0
+
+    for _ in range(100):
+        fresh = create_example_routes()
+        assert get_routes_version(fresh) == 0
+        ReachabilityIndex(fresh)
+        mark_routes_changed(fresh)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_reachability_index.py'])
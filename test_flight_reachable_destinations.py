@@ -0,0 +1,98 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import pytest
+
+from flight_constants import RouteDict
+from flight_example_data import create_example_routes, \
+    create_handout_routes
+from flight_functions import find_reachable_destinations
+from flight_synthetic_data import create_synthetic_routes
+
+
+def list_bfs(routes: RouteDict, source: str, n: int) -> list[str]:
+    """Return the airports reachable from source by taking at most n direct
+    flights, found by the original list-based search, which marks airports
+    as visited when they are dequeued.
+    """
+    visited = []
+    queue = [(source, 0)]
+    while queue:
+        airport, hops = queue.pop(0)
+        if airport in visited or hops > n:
+            continue
+        visited.append(airport)
+        if airport in routes:
+            for neighbor in routes[airport]:
+                queue.append((neighbor, hops + 1))
+    visited.sort()
+    return visited
+
+
+"""Unit tests for the find_reachable_destinations function."""
+
+
+@pytest.mark.parametrize('routes', [create_example_routes(),
+                                    create_handout_routes(),
+                                    create_synthetic_routes(80, 200)])
+def test_matches_list_bfs(routes: RouteDict) -> None:
+    """Test that the search finds the same airports as the original search
+    from every source, for hop limits from negative to past the longest
+    shortest path.
+    """
+    for source in routes:
+        for n in range(-2, 8):
+            assert find_reachable_destinations(routes, source, n) == \
+                list_bfs(routes, source, n)
+
+
+def test_no_flights() -> None:
+    """Test that only the source is reachable with n=0, and nothing is with
+    a negative n.
+    """
+    routes = create_example_routes()
+    assert find_reachable_destinations(routes, 'TRO', 0) == ['TRO']
+    assert find_reachable_destinations(routes, 'TRO', -1) == []
+    assert list_bfs(routes, 'TRO', -1) == []
+
+
+def test_source_not_in_routes() -> None:
+    """Test that a source with no routes out of it, including one that is
+    not in routes at all, only reaches itself.
+    """
+    routes = create_example_routes()
+    for source in ['SYD', 'YYZ']:
+        for n in range(3):
+            assert find_reachable_destinations(routes, source, n) == \
+                [source] == list_bfs(routes, source, n)
+
+
+def test_cycles() -> None:
+    """Test that airports on a cycle are listed once, however many times the
+    hop limit lets the search go around it.
+    """
+    routes = {'AAA': {'BBB': []}, 'BBB': {'CCC': []}, 'CCC': {'AAA': []},
+              'DDD': {'DDD': [], 'AAA': []}}
+    assert find_reachable_destinations(routes, 'AAA', 1) == ['AAA', 'BBB']
+    assert find_reachable_destinations(routes, 'AAA', 10) == \
+        ['AAA', 'BBB', 'CCC']
+    assert find_reachable_destinations(routes, 'DDD', 10) == \
+        ['AAA', 'BBB', 'CCC', 'DDD']
+    for source in routes:
+        for n in range(6):
+            assert find_reachable_destinations(routes, source, n) == \
+                list_bfs(routes, source, n)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_reachable_destinations.py'])
@@ -0,0 +1,164 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from io import StringIO
+import random
+
+import pytest
+
+from flight_constants import AirportDict, RouteDict
+from flight_example_data import create_airport_file, \
+    create_example_airports, create_route_file
+from flight_reader import LazyAirportDict, RouteParser, iter_airports, \
+    read_airports, read_routes
+from flight_synthetic_data import create_synthetic_network, \
+    write_routes, write_synthetic_airports
+
+
+def parse_chunks(chunks: list[str], airports: AirportDict) -> RouteDict:
+    """Return the routes parsed by feeding chunks to a RouteParser in
+    order.
+    """
+    parser = RouteParser(airports)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def split_at(data: str, positions: list[int]) -> list[str]:
+    """Return data split into chunks at each of the sorted positions."""
+    bounds = [0, *positions, len(data)]
+    return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+"""Unit tests for the flight_reader functions."""
+
+
+def test_airports_ignore_extra_columns() -> None:
+    """Test that columns after the airport fields are ignored, as the
+    original parser did.
+    """
+    lines = create_airport_file().getvalue().splitlines()
+    extended = StringIO(''.join(f'{line},"extra","columns"\n'
+                                for line in lines))
+    airports = read_airports(extended)
+    assert airports == read_airports(create_airport_file())
+    assert list(airports) == list(create_example_airports())
+
+
+def test_airports_quoted_commas() -> None:
+    """Test that a quoted field may contain commas."""
+    airports = read_airports(StringIO(
+        '"YYZ","Lester B. Pearson, Toronto","Toronto","Canada",'
+        '"43.6772","-79.6306","America/Toronto"\n'))
+    assert airports['YYZ']['Name'] == 'Lester B. Pearson, Toronto'
+    assert airports['YYZ']['Longitude'] == -79.6306
+
+
+def test_airports_short_row() -> None:
+    """Test that a row with too few columns raises a ValueError rather
+    than being read wrongly.
+    """
+    airports_data = StringIO('"YYZ","Toronto","Toronto","Canada",'
+                             '"43.6772","-79.6306"\n')
+    with pytest.raises(ValueError):
+        list(iter_airports(airports_data))
+
+
+def test_route_chunks_match_single_feed() -> None:
+    """Test that feeding route data in chunks of random sizes, split in the
+    middle of lines and of SOURCE: headers, gives the same routes as feeding
+    it all at once.
+    """
+    airports, routes = create_synthetic_network(100, 3, 20)
+    routes_file = StringIO()
+    write_routes(routes_file, routes)
+    data = routes_file.getvalue()
+    expected = parse_chunks([data], airports)
+    assert expected == read_routes(StringIO(data), airports)
+
+    rng = random.Random(0)
+    headers = [i for i in range(len(data)) if data.startswith('SOURCE:', i)]
+    for _ in range(20):
+        positions = rng.sample(range(1, len(data)), rng.randrange(1, 200))
+        positions.extend(header + rng.randrange(1, 7)
+                         for header in rng.sample(headers, 5))
+        chunks = split_at(data, sorted(set(positions)))
+        assert parse_chunks(chunks, airports) == expected
+    assert parse_chunks(list(data), airports) == expected
+
+
+def test_routes_with_crlf() -> None:
+    """Test that route data with CRLF line endings, even with chunks split
+    between the CR and the LF, gives the same routes as with LF endings.
+    """
+    airports = create_example_airports()
+    data = create_route_file().getvalue()
+    expected = parse_chunks([data], airports)
+    crlf_data = data.replace('\n', '\r\n')
+    assert parse_chunks([crlf_data], airports) == expected
+    positions = [i + 1 for i, char in enumerate(crlf_data) if char == '\r']
+    assert parse_chunks(split_at(crlf_data, positions), airports) == expected
+    assert parse_chunks(list(crlf_data), airports) == expected
+
+
+def test_lazy_airports_match_read_airports() -> None:
+    """Test that a LazyAirportDict has the same length, codes in the same
+    order and airports as read_airports, and only parses what is looked up.
+    """
+    airports_file = StringIO()
+    write_synthetic_airports(airports_file, 300)
+    airports_file.write('"YYZ","Pearson, Toronto","Toronto","Canada",'
+                        '"43.6772","-79.6306","America/Toronto","extra"\n'
+                        '\n  \n')
+    data = airports_file.getvalue()
+    expected = read_airports(StringIO(data))
+    airports = LazyAirportDict(StringIO(data))
+
+    assert len(airports) == len(expected) == 301
+    assert list(airports) == list(expected)
+    assert airports.num_parsed() == 0
+    assert airports['YYZ'] == expected['YYZ']
+    assert airports.num_parsed() == 1
+    assert airports == expected
+    assert dict(airports.items()) == expected
+    assert airports.num_parsed() == 301
+
+
+def test_lazy_airports_missing_key() -> None:
+    """Test that looking up a missing code raises KeyError, like a dict."""
+    airports = LazyAirportDict(create_airport_file())
+    assert 'YYZ' not in airports
+    assert airports.get('YYZ') is None
+    with pytest.raises(KeyError):
+        airports['YYZ']
+
+
+def test_lazy_airports_malformed_row() -> None:
+    """Test that a row with too few columns raises a ValueError when its
+    airport is looked up, as read_airports does when reading it, without
+    stopping the other airports from being looked up.
+    """
+    data = create_airport_file().getvalue() + '\n"YYZ","Toronto"\n'
+    with pytest.raises(ValueError):
+        read_airports(StringIO(data))
+    airports = LazyAirportDict(StringIO(data))
+    assert len(airports) == 6
+    assert 'YYZ' in airports
+    with pytest.raises(ValueError):
+        airports['YYZ']
+    assert airports['TRO'] == read_airports(create_airport_file())['TRO']
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_reader.py'])
@@ -0,0 +1,210 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import copy
+import random
+from io import StringIO
+
+import pytest
+
+from flight_aircraft_index import AircraftIndex
+from flight_constants import ADD_PLANE, ADD_ROUTE, REMOVE_PLANE, \
+    REMOVE_ROUTE, RESET, RouteChange, RouteDict
+from flight_example_data import create_example_routes
+from flight_functions import decomission_plane, mark_routes_changed
+from flight_reader import read_routes
+from flight_route_store import RouteStore
+from flight_shared_aircraft import SharedAircraft, add_plane_to_route, \
+    count_shared, remove_plane_from_route
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes, write_routes
+
+
+"""Unit tests for the RouteStore class."""
+
+
+def replay(routes: RouteDict, changes: list[RouteChange]) -> None:
+    """Make changes to routes, as a consumer of the journal would."""
+    for change in changes:
+        destinations = routes.setdefault(change.source, {})
+        if change.kind == ADD_ROUTE:
+            destinations[change.destination] = []
+        elif change.kind == REMOVE_ROUTE:
+            del destinations[change.destination]
+        elif change.kind == ADD_PLANE:
+            for plane in change.planes:
+                add_plane_to_route(destinations, change.destination, plane)
+        elif change.kind == REMOVE_PLANE:
+            for plane in change.planes:
+                remove_plane_from_route(destinations, change.destination,
+                                        plane)
+
+
+def make_random_changes(store: RouteStore, num_changes: int,
+                        seed: int) -> None:
+    """Make num_changes random changes to the routes in store."""
+    rng = random.Random(seed)
+    codes = create_synthetic_codes(60)
+    planes = ['320', '737', '738', 'SF3']
+    for _ in range(num_changes):
+        source, destination = rng.sample(codes, 2)
+        action = rng.randrange(5)
+        if action == 0:
+            store.add_route(source, destination)
+        elif action == 1:
+            store.remove_route(source, destination)
+        elif action == 2:
+            store.add_plane(source, destination, rng.choice(planes))
+        elif action == 3:
+            store.remove_plane(source, destination, rng.choice(planes))
+        else:
+            store.decommission(rng.choice(planes))
+
+
+def test_journal_replays_changes() -> None:
+    """Test that replaying the journal on a copy of the original routes gives
+    the same routes as the store, from any version.
+    """
+    routes = create_synthetic_routes(60, 300)
+    original = copy.deepcopy(routes)
+    store = RouteStore(routes)
+    make_random_changes(store, 200, 1)
+    middle = copy.deepcopy(store.routes)
+    version = store.version
+    make_random_changes(store, 200, 2)
+
+    replay(original, store.changes_since(0))
+    assert original == store.routes
+    replay(middle, store.changes_since(version))
+    assert middle == store.routes
+    assert [change.version for change in store.journal] == \
+        list(range(1, store.version + 1))
+
+
+def test_journal_keeps_latest_changes() -> None:
+    """Test that the journal only keeps the latest max_journal changes, that
+    recent versions can still be replayed, and that older ones get a RESET.
+    """
+    store = RouteStore(create_synthetic_routes(60, 300), max_journal=50)
+    make_random_changes(store, 150, 3)
+    middle = copy.deepcopy(store.routes)
+    version = store.version
+    store.add_route('AAA', 'BBB')
+    store.add_plane('AAA', 'BBB', '320')
+    source = next(source for source in store.routes if store.routes[source])
+    store.remove_route(source, next(iter(store.routes[source])))
+
+    assert len(store.journal) <= 50
+    assert [change.version for change in store.journal] == \
+        list(range(store.version - len(store.journal) + 1,
+                   store.version + 1))
+    assert [change.kind for change in store.changes_since(0)] == [RESET]
+    replay(middle, store.changes_since(version))
+    assert middle == store.routes
+    assert store.changes_since(store.version) == []
+
+
+def test_aircraft_index_stays_in_sync() -> None:
+    """Test that the store's aircraft index agrees with a fresh index after
+    many changes.
+    """
+    store = RouteStore(create_synthetic_routes(60, 300))
+    make_random_changes(store, 500, 3)
+    fresh = AircraftIndex(copy.deepcopy(store.routes))
+    for plane in ['320', '737', '738', 'SF3']:
+        assert store.aircraft_index.get_routes_using(plane) == \
+            fresh.get_routes_using(plane)
+
+
+def test_decommission_matches_decomission_plane() -> None:
+    """Test that decommissioning through a store, with and without an
+    aircraft index, gives the same result as decomission_plane.
+    """
+    for plane in ['SF3', 'DH4', '747']:
+        expected_routes = create_example_routes()
+        expected = decomission_plane(expected_routes, plane)
+        for index_aircraft in (True, False):
+            store = RouteStore(create_example_routes(), index_aircraft)
+            assert store.decommission(plane) == expected
+            assert store.routes == expected_routes
+
+
+def test_outside_change_records_reset() -> None:
+    """Test that a change made without the store is recorded as a reset."""
+    routes = create_example_routes()
+    store = RouteStore(routes)
+    routes['SYD'] = {'TRO': ['DH4']}
+    mark_routes_changed(routes)
+    assert store.changes_since(0)[-1].kind == RESET
+    assert store.aircraft_index.get_routes_using('DH4') == \
+        [('SYD', 'TRO'), ('TRO', 'SYD')]
+
+
+
+def test_shared_aircraft_copy_on_write() -> None:
+    """Test that routes read with shared airplane lists are decommissioned
+    like plain lists, without changing the routes they shared a list with.
+    """
+    plain = create_synthetic_routes(60, 300, aircraft=['SF3', 'DH4'])
+    routes_file = StringIO()
+    write_routes(routes_file, plain)
+    routes_file.seek(0)
+    routes = read_routes(routes_file, set(create_synthetic_codes(60)),
+                         share_aircraft=True)
+    assert routes == plain
+    airplanes = [airplanes for destinations in routes.values()
+                 for airplanes in destinations.values()]
+    assert all(isinstance(shared, SharedAircraft) for shared in airplanes)
+    assert len({id(shared) for shared in airplanes}) <= 4
+
+    for index_aircraft in (True, False):
+        store = RouteStore(copy.deepcopy(routes), index_aircraft)
+        expected_routes = copy.deepcopy(plain)
+        assert store.decommission('SF3') == \
+            decomission_plane(expected_routes, 'SF3')
+        assert store.routes == expected_routes
+        store.add_plane('AAA', 'AAB', 'SF3')
+        assert store.routes['AAA']['AAB'][-1] == 'SF3'
+    assert routes == plain
+
+
+def test_aircraft_not_shared_by_default() -> None:
+    """Test that read_routes gives every route its own list unless sharing
+    is asked for, and that shared lists are freed once no route uses them.
+    """
+    plain = create_synthetic_routes(60, 300, aircraft=['SF3', 'DH4', '737'])
+    routes_file = StringIO()
+    write_routes(routes_file, plain)
+    airports = set(create_synthetic_codes(60))
+
+    routes_file.seek(0)
+    routes = read_routes(routes_file, airports)
+    assert routes == plain
+    airplanes = [airplanes for destinations in routes.values()
+                 for airplanes in destinations.values()]
+    assert not any(isinstance(listed, SharedAircraft)
+                   for listed in airplanes)
+    assert len({id(listed) for listed in airplanes}) == len(airplanes)
+    airplanes[0].append('320')
+    assert airplanes[0][-1] == '320'
+
+    before = count_shared()
+    routes_file.seek(0)
+    shared = read_routes(routes_file, airports, share_aircraft=True)
+    assert count_shared() > before
+    del shared
+    assert count_shared() == before
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_route_store.py'])
@@ -0,0 +1,204 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+
+import pytest
+
+from flight_constants import AirportDict, RouteDict
+from flight_example_data import create_example_airports, \
+    create_example_routes
+from flight_functions import find_reachable_destinations, \
+    is_valid_flight_sequence
+from flight_route_store import RouteStore
+from flight_routing import MinHopPath, MinHopRouter, build_reverse_routes, \
+    find_shortest_route, find_shortest_route_dijkstra, search_min_hops, \
+    search_route
+from flight_spatial import haversine_km
+from flight_synthetic_data import create_synthetic_network, \
+    create_synthetic_routes
+
+
+@pytest.fixture(scope='module')
+def network() -> tuple[AirportDict, RouteDict]:
+    """Return a small geographic synthetic network."""
+    return create_synthetic_network(300, 3, 20)
+
+
+def path_length(airports: AirportDict, path: list[str]) -> float:
+    """Return the great-circle length of path, in kilometres."""
+    return sum(haversine_km(airports[a]['Latitude'], airports[a]['Longitude'],
+                            airports[b]['Latitude'], airports[b]['Longitude'])
+               for a, b in zip(path, path[1:]))
+
+
+"""Unit tests for the shortest route functions."""
+
+
+def test_route_to_itself() -> None:
+    """Test that the route from an airport to itself takes no flights."""
+    routes = create_example_routes()
+    airports = create_example_airports()
+    route = find_shortest_route(routes, airports, 'TRO', 'TRO')
+    assert route.path == ['TRO']
+    assert route.distance == 0.0
+
+
+def test_no_route() -> None:
+    """Test that None is returned when the destination cannot be reached."""
+    routes = create_example_routes()
+    airports = create_example_airports()
+    assert find_shortest_route(routes, airports, 'SYD', 'TRO') is None
+    assert find_shortest_route_dijkstra(routes, airports, 'RCM', 'TRO') is None
+
+
+def test_unknown_destination() -> None:
+    """Test that there is no route to or from an airport that is not in
+    airports, rather than a KeyError.
+    """
+    routes = create_example_routes()
+    airports = create_example_airports()
+    routes['TRO']['YYZ'] = ['SF3']
+    routes['YYZ'] = {'SYD': ['SF3']}
+    for use_heuristic in (True, False):
+        assert search_route(routes, airports, 'GFN', 'YYZ',
+                            use_heuristic) == (None, 0)
+        assert search_route(routes, airports, 'YYZ', 'SYD',
+                            use_heuristic) == (None, 0)
+    assert find_shortest_route(routes, airports, 'GFN', 'YYZ') is None
+
+
+def test_skips_neighbours_without_coordinates() -> None:
+    """Test that flights to airports that are not in airports are not taken,
+    and the search carries on past them.
+    """
+    routes = create_example_routes()
+    airports = create_example_airports()
+    routes['GFN']['YYZ'] = ['SF3']
+    routes['YYZ'] = {'SYD': ['SF3']}
+    expected = find_shortest_route(create_example_routes(), airports, 'GFN',
+                                   'SYD')
+    assert find_shortest_route(routes, airports, 'GFN', 'SYD') == expected
+    assert find_shortest_route_dijkstra(routes, airports, 'GFN', 'SYD') == \
+        expected
+    assert expected.path == ['GFN', 'TRO', 'SYD']
+
+
+def test_astar_matches_dijkstra(network: tuple[AirportDict, RouteDict]) -> \
+        None:
+    """Test that A* finds routes as short as Dijkstra's, while expanding no
+    more labels, and that the routes are valid flight sequences.
+    """
+    airports, routes = network
+    rng = random.Random(1)
+    for _ in range(30):
+        source, destination = rng.sample(list(airports), 2)
+        dijkstra, dijkstra_expanded = search_route(
+            routes, airports, source, destination, use_heuristic=False)
+        astar, astar_expanded = search_route(routes, airports, source,
+                                             destination)
+        assert astar.distance == pytest.approx(dijkstra.distance)
+        assert astar.distance == pytest.approx(path_length(airports,
+                                                           astar.path))
+        assert astar_expanded <= dijkstra_expanded
+        assert is_valid_flight_sequence(routes, astar.path)
+
+
+def test_hop_limit(network: tuple[AirportDict, RouteDict]) -> None:
+    """Test that a hop limit never gives a route with too many flights, and
+    never gives a shorter route than with no limit.
+    """
+    airports, routes = network
+    rng = random.Random(2)
+    for _ in range(30):
+        source, destination = rng.sample(list(airports), 2)
+        unlimited = find_shortest_route(routes, airports, source, destination)
+        if unlimited is None:
+            continue
+        for max_hops in (1, 3, 6):
+            limited = find_shortest_route(routes, airports, source,
+                                          destination, max_hops)
+            if limited is not None:
+                assert len(limited.path) - 1 <= max_hops
+                assert limited.distance >= unlimited.distance - 1e-6
+            elif len(unlimited.path) - 1 <= max_hops:
+                pytest.fail('a route within the hop limit was missed')
+
+
+def test_allowed_aircraft(network: tuple[AirportDict, RouteDict]) -> None:
+    """Test that every flight on a route uses an allowed airplane."""
+    airports, routes = network
+    rng = random.Random(3)
+    allowed = {'320', '737', '738'}
+    for _ in range(30):
+        source, destination = rng.sample(list(airports), 2)
+        route = find_shortest_route(routes, airports, source, destination,
+                                    allowed_aircraft=allowed)
+        if route is not None:
+            for a, b in zip(route.path, route.path[1:]):
+                assert not allowed.isdisjoint(routes[a][b])
+
+
+
+def test_min_hops_match_reachability() -> None:
+    """Test that the fewest-hop routes on a hub-heavy network take as few
+    flights as find_reachable_destinations needs to reach the destination,
+    and are valid flight sequences.
+    """
+    routes = create_synthetic_routes(500, 1500, hub_exponent=1.2)
+    router = MinHopRouter(routes)
+    sources = list(routes)
+    rng = random.Random(4)
+    for _ in range(50):
+        source, destination = rng.sample(sources, 2)
+        path = router.find_min_hop_path(source, destination)
+        n = 1
+        reachable = find_reachable_destinations(routes, source, n)
+        while destination not in reachable and n < len(reachable):
+            n += 1
+            reachable = find_reachable_destinations(routes, source, n)
+        if destination in reachable:
+            assert path.hops == n == len(path.path) - 1
+            assert path.path[0] == source and path.path[-1] == destination
+            assert is_valid_flight_sequence(routes, path.path)
+        else:
+            assert path is None
+
+
+def test_min_hops_to_itself() -> None:
+    """Test that the route from an airport in routes to itself takes no
+    flights and is just that airport, which is_valid_flight_sequence
+    rejects, while an airport not in routes has no route to itself.
+    """
+    routes = create_example_routes()
+    reverse_routes = build_reverse_routes(routes)
+    assert search_min_hops(routes, reverse_routes, 'TRO', 'TRO') == \
+        (MinHopPath(0, ['TRO']), 0)
+    assert MinHopRouter(routes).find_min_hop_path('TRO', 'TRO') == \
+        MinHopPath(0, ['TRO'])
+    assert not is_valid_flight_sequence(routes, ['TRO'])
+    assert search_min_hops(routes, reverse_routes, 'SYD', 'SYD') == \
+        (None, 0)
+
+
+def test_min_hops_after_change() -> None:
+    """Test that the router sees a route removed after it was built."""
+    routes = create_example_routes()
+    router = MinHopRouter(routes)
+    assert router.find_min_hop_path('GFN', 'TRO').hops == 1
+    RouteStore(routes, index_aircraft=False).remove_route('GFN', 'TRO')
+    assert router.find_min_hop_path('GFN', 'TRO') is None
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_routing.py'])
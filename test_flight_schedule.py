@@ -0,0 +1,149 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+from datetime import date
+from io import StringIO
+
+import pytest
+
+from flight_constants import AirportDict
+from flight_example_data import create_example_airports
+from flight_reader import read_airports
+from flight_schedule import MIN_TRANSFER_MINUTES, Schedule, read_schedule
+from flight_synthetic_data import (create_synthetic_routes,
+                                   write_synthetic_airports,
+                                   write_synthetic_schedule)
+
+NUM_AIRPORTS = 40
+
+
+@pytest.fixture(scope='module')
+def schedule() -> Schedule:
+    """Return a busy synthetic day of departures between airports in many
+    time zones.
+    """
+    airports_file = StringIO()
+    write_synthetic_airports(airports_file, NUM_AIRPORTS)
+    airports_file.seek(0)
+    airports = read_airports(airports_file)
+    routes = create_synthetic_routes(NUM_AIRPORTS, 200)
+    schedule_file = StringIO()
+    write_synthetic_schedule(schedule_file, routes, 1500)
+    schedule_file.seek(0)
+    return read_schedule(schedule_file, airports, date(2024, 3, 31), routes)
+
+
+def relax_earliest_arrivals(schedule: Schedule, source: str,
+                            departure: int) -> dict[str, int]:
+    """Return the earliest arrival at every airport reachable from source
+    when leaving no earlier than departure, by relaxing every connection
+    until nothing changes.
+    """
+    arrivals = {source: departure}
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(schedule)):
+            connection = schedule.get_connection(i)
+            if connection.source not in arrivals:
+                continue
+            ready = arrivals[connection.source]
+            if connection.source != source:
+                ready += MIN_TRANSFER_MINUTES
+            best = arrivals.get(connection.destination)
+            if connection.departure >= ready and \
+                    (best is None or connection.arrival < best):
+                arrivals[connection.destination] = connection.arrival
+                changed = True
+    return arrivals
+
+
+"""Unit tests for the connection scan queries on a Schedule."""
+
+
+def test_earliest_arrival_matches_relaxation(schedule: Schedule) -> None:
+    """Test that the earliest arrivals and journeys match those found by
+    relaxing every connection, and that each journey can be flown.
+    """
+    rng = random.Random(1)
+    for _ in range(15):
+        source = rng.choice(schedule.codes)
+        departure = rng.randrange(-12 * 60, 24 * 60)
+        expected = relax_earliest_arrivals(schedule, source, departure)
+        for destination in schedule.codes:
+            if destination == source:
+                continue
+            arrival = schedule.find_earliest_arrival(source, destination,
+                                                     departure)
+            assert arrival == expected.get(destination)
+
+            journey = schedule.find_journey(source, destination, departure)
+            if arrival is None:
+                assert journey is None
+                continue
+            assert journey[0].source == source
+            assert journey[0].departure >= departure
+            assert journey[-1].destination == destination
+            assert journey[-1].arrival == arrival
+            for previous, leg in zip(journey, journey[1:]):
+                assert leg.source == previous.destination
+                assert leg.departure >= \
+                    previous.arrival + MIN_TRANSFER_MINUTES
+
+
+def test_profile_matches_earliest_arrival(schedule: Schedule) -> None:
+    """Test that the profile gives the earliest arrival after every
+    departure from the source, and has no departure that a later one
+    arrives as early as.
+    """
+    rng = random.Random(2)
+    for _ in range(15):
+        source, destination = rng.sample(schedule.codes, 2)
+        profile = schedule.find_profile(source, destination)
+        assert profile == sorted(profile)
+        for (_, arrival), (_, later_arrival) in zip(profile, profile[1:]):
+            assert arrival < later_arrival
+
+        source_id = schedule.ids[source]
+        for departure, origin in zip(schedule.departures, schedule.sources):
+            if origin != source_id:
+                continue
+            best = [arrival for leaves, arrival in profile
+                    if leaves >= departure]
+            assert schedule.find_earliest_arrival(
+                source, destination, departure) == \
+                (min(best) if best else None)
+
+
+def test_local_times() -> None:
+    """Test that departures are read in the time zone of their source
+    airport, including daylight saving time and unknown time zones.
+    """
+    airports: AirportDict = create_example_airports()
+    schedule_file = StringIO('TRO,SYD,SF3,08:30,55\n'
+                             'RCM,JCK,SF3,08:30,60\n')
+    summer = read_schedule(schedule_file, airports, date(2024, 3, 1))
+    assert [summer.get_connection(i)[:4] for i in range(len(summer))] == \
+        [('TRO', 'SYD', 'SF3', -150), ('RCM', 'JCK', 'SF3', 510)]
+    assert summer.get_local_time('SYD', -95).strftime('%Y-%m-%d %H:%M') == \
+        '2024-03-01 09:25'
+
+    schedule_file.seek(0)
+    winter = read_schedule(schedule_file, airports, date(2024, 6, 3))
+    assert winter.get_connection(0)[:4] == ('TRO', 'SYD', 'SF3', -90)
+    assert winter.to_minutes('JCK', '08:30') == -90
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_schedule.py'])
@@ -0,0 +1,190 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+import pytest
+
+import flight_service
+from flight_example_data import create_example_routes
+from flight_service import BUSY_ERROR, CANCELLED_ERROR, TOO_LONG_ERROR, \
+    FlightService
+
+
+"""Unit tests for the FlightService class."""
+
+
+class BlockingExecutor:
+    """An executor whose calls wait until released, so that tests can hold
+    queries in flight.
+    """
+    def __init__(self) -> None:
+        """Initialize a new executor with its calls held."""
+        self.release = threading.Event()
+        self.calls = 0
+
+    def submit(self, function: Callable, *args: object) -> Future:
+        """Return a future for function(*args), called once released."""
+        future = Future()
+
+        def run() -> None:
+            self.release.wait()
+            if future.set_running_or_notify_cancel():
+                future.set_result(function(*args))
+
+        self.calls += 1
+        threading.Thread(target=run).start()
+        return future
+
+
+def test_identical_queries_are_coalesced() -> None:
+    """Test that identical queries in flight at once are computed once."""
+    executor = BlockingExecutor()
+    service = FlightService(create_example_routes(), executor)
+
+    async def run() -> list:
+        tasks = [asyncio.create_task(service.answer(
+            'find_reachable_destinations', ('GFN', 2))) for _ in range(5)]
+        tasks.append(asyncio.create_task(service.answer(
+            'find_reachable_destinations', ('TRO', 1))))
+        await asyncio.sleep(0.05)
+        executor.release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    assert results[:5] == [['GFN', 'SYD', 'TRO']] * 5
+    assert results[5] == ['GFN', 'SYD', 'TRO']
+    assert executor.calls == 2
+    assert service.computed == 2
+    assert service.coalesced == 4
+
+
+def test_busy_when_too_many_waiting(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that queries beyond the waiting limit are rejected."""
+    monkeypatch.setattr(flight_service, 'MAX_RUNNING', 1)
+    monkeypatch.setattr(flight_service, 'MAX_WAITING', 2)
+    executor = BlockingExecutor()
+    service = FlightService(create_example_routes(), executor)
+
+    async def run() -> list:
+        tasks = [asyncio.create_task(service.respond(json.dumps(
+            {'id': i, 'query': 'find_reachable_destinations',
+             'args': ['GFN', i]}).encode())) for i in range(5)]
+        await asyncio.sleep(0.05)
+        executor.release.set()
+        return await asyncio.gather(*tasks)
+
+    responses = asyncio.run(run())
+    assert [response.get('error') for response in responses] == \
+        [None, None, None, BUSY_ERROR, BUSY_ERROR]
+    assert service.rejected == 2
+
+
+def test_server_answers_over_tcp() -> None:
+    """Test that the server answers pipelined requests on a connection,
+    including invalid ones, with the ids of the requests.
+    """
+    async def run() -> dict:
+        service = FlightService(create_example_routes())
+        server = await service.serve('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        requests = [{'id': 1, 'query': 'is_direct_flight',
+                     'args': ['TRO', 'SYD']},
+                    {'id': 2, 'query': 'find_reachable_destinations',
+                     'args': ['GFN', 1]},
+                    {'id': 3, 'query': 'no_such_query'}]
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        responses = {}
+        for _ in requests:
+            response = json.loads(await reader.readline())
+            responses[response['id']] = response
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = asyncio.run(run())
+    assert responses[1]['result'] is True
+    assert responses[2]['result'] == ['GFN', 'TRO']
+    assert 'error' in responses[3]
+
+
+
+def test_unexpected_errors_are_answered(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a query failing with an unexpected exception, or sharing a
+    query that is cancelled, still gets an error response.
+    """
+    def fail(routes: dict, code: str) -> None:
+        raise KeyError(code)
+
+    monkeypatch.setitem(flight_service.QUERIES, 'fail', (fail, False))
+    service = FlightService(create_example_routes())
+    response = asyncio.run(service.respond(
+        b'{"id": 1, "query": "fail", "args": ["YYZ"]}'))
+    assert response == {'id': 1, 'error': "internal error: KeyError: 'YYZ'"}
+
+    executor = BlockingExecutor()
+    service = FlightService(create_example_routes(), executor)
+
+    async def run() -> dict:
+        computing = asyncio.create_task(service.answer(
+            'find_reachable_destinations', ('GFN', 2)))
+        await asyncio.sleep(0.05)
+        sharing = asyncio.create_task(service.respond(
+            b'{"id": 2, "query": "find_reachable_destinations", '
+            b'"args": ["GFN", 2]}'))
+        await asyncio.sleep(0.05)
+        computing.cancel()
+        response = await sharing
+        executor.release.set()
+        return response
+
+    assert asyncio.run(run()) == {'id': 2, 'error': CANCELLED_ERROR}
+    assert service.coalesced == 1
+
+
+def test_server_answers_too_long_lines() -> None:
+    """Test that a request line longer than the stream limit is answered
+    with an error, and the requests after it are still answered.
+    """
+    async def run() -> list[dict]:
+        service = FlightService(create_example_routes())
+        server = await service.serve('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"id": 1, "args": ["' + b'x' * 200000 + b'"]}\n')
+        writer.write(json.dumps({'id': 2, 'query': 'is_direct_flight',
+                                 'args': ['TRO', 'SYD']}).encode() + b'\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        await writer.wait_closed()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = asyncio.run(run())
+    assert {'id': None, 'error': TOO_LONG_ERROR} in responses
+    assert {'id': 2, 'result': True} in responses
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_service.py'])
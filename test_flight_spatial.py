@@ -0,0 +1,83 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+
+import pytest
+
+from flight_constants import AirportDict
+from flight_spatial import AirportSpatialIndex, find_nearest_brute_force, \
+    haversine_km
+
+
+"""Unit tests for the AirportSpatialIndex class."""
+
+
+@pytest.fixture
+def airports() -> AirportDict:
+    """Return 2000 airports spread randomly over the globe."""
+    rng = random.Random(108)
+    return {f'A{i:04}': {'Latitude': rng.uniform(-90, 90),
+                         'Longitude': rng.uniform(-180, 180)}
+            for i in range(2000)}
+
+
+def test_empty_index() -> None:
+    """Test that an index with no airports finds nothing."""
+    index = AirportSpatialIndex({})
+    assert index.find_nearest(0.0, 0.0, 3) == []
+    assert index.find_within_radius(0.0, 0.0, 1000.0) == []
+
+
+def test_nearest_matches_brute_force(airports: AirportDict) -> None:
+    """Test that find_nearest finds the same airports as a scan of every
+    airport, including near the poles and the antimeridian.
+    """
+    index = AirportSpatialIndex(airports)
+    points = [(0.0, 0.0), (89.9, 10.0), (-89.9, -170.0), (10.0, 179.9),
+              (10.0, -179.9), (45.0, -75.0)]
+    for latitude, longitude in points:
+        for k in (1, 5, 25):
+            expected = find_nearest_brute_force(airports, latitude, longitude,
+                                                k)
+            actual = index.find_nearest(latitude, longitude, k)
+            assert [code for code, _ in actual] == \
+                [code for code, _ in expected]
+
+
+def test_radius_matches_brute_force(airports: AirportDict) -> None:
+    """Test that find_within_radius finds exactly the airports within the
+    radius, nearest first.
+    """
+    index = AirportSpatialIndex(airports)
+    for latitude, longitude, radius in [(0.0, 0.0, 800.0),
+                                        (60.0, 179.0, 1500.0),
+                                        (-30.0, 20.0, 0.0)]:
+        distances = sorted(
+            (haversine_km(latitude, longitude, details['Latitude'],
+                          details['Longitude']), code)
+            for code, details in airports.items())
+        expected = [code for distance, code in distances if distance <= radius]
+        actual = index.find_within_radius(latitude, longitude, radius)
+        assert [code for code, _ in actual] == expected
+
+
+def test_more_neighbours_than_airports(airports: AirportDict) -> None:
+    """Test that asking for more airports than there are returns them all."""
+    small = dict(list(airports.items())[:10])
+    index = AirportSpatialIndex(small)
+    assert len(index.find_nearest(0.0, 0.0, 50)) == 10
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_spatial.py'])
@@ -0,0 +1,47 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+from pathlib import Path
+
+import pytest
+
+from flight_reader import read_airports, read_routes
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes, write_synthetic_data
+
+
+"""Unit tests for the synthetic data files."""
+
+
+@pytest.mark.parametrize('arguments', [(100, 400),
+                                       (60, 300, 3, ['SF3', 'DH4'], 0.0)])
+def test_synthetic_data_round_trip(tmp_path: Path, arguments: tuple) -> None:
+    """Test that reading the files written by write_synthetic_data gives the
+    synthetic airports, and the same routes as create_synthetic_routes with
+    the same arguments.
+    """
+    airports_path, routes_path = write_synthetic_data(str(tmp_path),
+                                                      *arguments)
+    with open(airports_path, encoding='utf8') as airports_file:
+        airports = read_airports(airports_file)
+    with open(routes_path, encoding='utf8') as routes_file:
+        routes = read_routes(routes_file, airports)
+
+    assert list(airports) == create_synthetic_codes(arguments[0])
+    assert all(isinstance(details['Latitude'], float)
+               for details in airports.values())
+    assert routes == create_synthetic_routes(*arguments)
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_synthetic_data.py'])
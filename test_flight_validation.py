@@ -0,0 +1,110 @@
+"""CSC108H1S: Functions for Assignment 3 - Airports and Routes.
+
+Copyright and Usage Information
+===============================
+
+This code is provided solely for the personal and private use of students
+taking the CSC108 course at the University of Toronto. Copying for purposes
+other than this use is expressly prohibited. All forms of distribution of
+this code, whether as given or with any changes, are expressly prohibited.
+
+All of the files in this directory and all subdirectories are:
+Copyright (c) 2024 The CSC108 Team
+"""
+import random
+
+import pytest
+
+from flight_constants import RouteDict
+from flight_example_data import create_example_routes
+from flight_functions import are_valid_flight_sequences, \
+    find_first_invalid_legs, is_valid_flight_sequence
+from flight_synthetic_data import create_synthetic_codes, \
+    create_synthetic_routes
+
+
+def create_sequences(routes: RouteDict, num_sequences: int,
+                     seed: int) -> list[list[str]]:
+    """Return num_sequences flight sequences of up to 6 airports, mostly
+    following routes, with some legs replaced by random airports that may
+    not be in routes.
+    """
+    rng = random.Random(seed)
+    sources = list(routes)
+    codes = create_synthetic_codes(len(sources) + 10)
+    sequences = []
+    for _ in range(num_sequences):
+        sequence = [rng.choice(sources)]
+        for _ in range(rng.randrange(6)):
+            destinations = list(routes.get(sequence[-1], ()))
+            if destinations and rng.random() < 0.9:
+                sequence.append(rng.choice(destinations))
+            else:
+                sequence.append(rng.choice(codes))
+        sequences.append(sequence)
+    return sequences
+
+
+"""Unit tests for the batch flight sequence validation functions."""
+
+
+def test_matches_is_valid_flight_sequence() -> None:
+    """Test that the batch functions agree with is_valid_flight_sequence on
+    random sequences, and that the first invalid leg really is invalid while
+    every leg before it is valid.
+    """
+    routes = create_synthetic_routes(60, 150)
+    sequences = create_sequences(routes, 500, 0)
+    first_invalid_legs = find_first_invalid_legs(routes, sequences)
+    assert are_valid_flight_sequences(routes, sequences) == \
+        [is_valid_flight_sequence(routes, sequence)
+         for sequence in sequences]
+    assert -1 in first_invalid_legs
+    for sequence, first_invalid_leg in zip(sequences, first_invalid_legs):
+        if first_invalid_leg == -1:
+            assert is_valid_flight_sequence(routes, sequence)
+            continue
+        if first_invalid_leg >= 1:
+            assert is_valid_flight_sequence(
+                routes, sequence[:first_invalid_leg + 1])
+        assert not is_valid_flight_sequence(
+            routes, sequence[first_invalid_leg:first_invalid_leg + 2])
+
+
+def test_short_sequences() -> None:
+    """Test that empty and one-airport sequences are invalid at leg 0."""
+    routes = create_example_routes()
+    sequences = [[], ['TRO'], ['YYZ']]
+    assert find_first_invalid_legs(routes, sequences) == [0, 0, 0]
+    assert are_valid_flight_sequences(routes, sequences) == \
+        [is_valid_flight_sequence(routes, sequence)
+         for sequence in sequences] == [False, False, False]
+
+
+def test_unknown_first_airport() -> None:
+    """Test that a sequence starting at an airport that is not in routes is
+    invalid at leg 0.
+    """
+    routes = create_example_routes()
+    sequences = [['YYZ', 'TRO'], ['YYZ', 'TRO', 'GFN']]
+    assert find_first_invalid_legs(routes, sequences) == [0, 0]
+    assert are_valid_flight_sequences(routes, sequences) == [False, False]
+    assert not is_valid_flight_sequence(routes, sequences[0])
+
+
+def test_final_airport_not_a_source() -> None:
+    """Test that a sequence ending at an airport that is not a source in
+    routes is invalid at its last leg, even though there is a direct flight
+    for it, as is_valid_flight_sequence requires.
+    """
+    routes = create_example_routes()
+    sequences = [['TRO', 'SYD'], ['GFN', 'TRO', 'SYD']]
+    assert 'SYD' in routes['TRO'] and 'SYD' not in routes
+    assert find_first_invalid_legs(routes, sequences) == [0, 1]
+    assert are_valid_flight_sequences(routes, sequences) == \
+        [is_valid_flight_sequence(routes, sequence)
+         for sequence in sequences] == [False, False]
+
+
+if __name__ == '__main__':
+    pytest.main(['test_flight_validation.py'])